@@ -0,0 +1,102 @@
+import asyncio
+from typing import List, Tuple
+from product import Product
+from store import Store
+
+
+class AsyncStore:
+    """
+    asyncio front end for a Store.
+    
+    Orders are not run as they arrive. They are queued, and everything queued
+    during one pass of the event loop is handed to Store.order_many() in a
+    single batch. Each product is then looked up once per batch, and no
+    locks are needed because only the event loop thread touches the store.
+    """
+    def __init__(self, store: Store, max_batch: int = 1024):
+        """
+        Wrap a store for use from coroutines.
+        
+        Args:
+            store: The store to serve.
+            max_batch: The most orders processed in one go before yielding
+                back to the event loop.
+        """
+        self._store = store
+        self._max_batch = max_batch
+        self._pending: List[Tuple[List[Tuple[Product, int]], 'asyncio.Future[float]']] = []
+        self._scheduled = False
+
+    @property
+    def store(self) -> Store:
+        """Get the wrapped store."""
+        return self._store
+
+    async def order(self, shopping_list: List[Tuple[Product, int]]) -> float:
+        """
+        Queue an order and wait for it to be processed.
+        
+        Args:
+            shopping_list: List of tuples containing (product, quantity).
+            
+        Returns:
+            The total price of the order.
+            
+        Raises:
+            Exception: If there's an issue with purchasing any product.
+        """
+        loop = asyncio.get_running_loop()
+        future: 'asyncio.Future[float]' = loop.create_future()
+        self._pending.append((shopping_list, future))
+        
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._flush)
+        
+        return await future
+
+    async def get_all_products(self) -> List[Product]:
+        """
+        Get all active products in the store.
+        
+        Returns:
+            List of active products.
+        """
+        return self._store.get_all_products()
+
+    async def get_total_quantity(self) -> int:
+        """
+        Get the total quantity of all products in the store.
+        
+        Returns:
+            The sum of all product quantities.
+        """
+        return self._store.get_total_quantity()
+
+    def _flush(self) -> None:
+        """Process the queued orders as one batch and wake up their callers."""
+        batch = self._pending[:self._max_batch]
+        del self._pending[:self._max_batch]
+        
+        if self._pending:
+            # Let other callbacks run before taking on the rest of the queue
+            asyncio.get_running_loop().call_soon(self._flush)
+        else:
+            self._scheduled = False
+        
+        try:
+            totals, errors = self._store.order_many([shopping_list for shopping_list, _ in batch])
+        except Exception as error:
+            # Never leave a caller waiting, even if the whole batch failed
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        
+        for (_, future), total, error in zip(batch, totals, errors):
+            if future.cancelled():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(total)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Load generator measuring AsyncStore order latency under many concurrent clients.
+
+Usage:
+    python -m benchmarks.bench_async [--clients N] [--orders N] [--skus N]
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+from async_store import AsyncStore
+from benchmarks.catalog import make_catalog
+from store import Store
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Get a percentile of a list of samples.
+    
+    Args:
+        samples: The measured values, sorted in ascending order.
+        fraction: The percentile as a fraction between 0 and 1.
+        
+    Returns:
+        The sample at that percentile.
+    """
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+async def client(async_store: AsyncStore, products, orders: int, seed: int, latencies: List[float]) -> None:
+    """Place orders one after another, recording the latency of each."""
+    rng = random.Random(seed)
+    for _ in range(orders):
+        shopping_list = [(product, 1) for product in rng.sample(products, 3)]
+        start = time.perf_counter()
+        try:
+            await async_store.order(shopping_list)
+        except Exception:
+            pass
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(clients: int, orders: int, skus: int) -> None:
+    """Run all clients against one store and print the latency distribution."""
+    products = make_catalog(skus)
+    async_store = AsyncStore(Store(products))
+    latencies: List[float] = []
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(async_store, products, orders, seed, latencies) for seed in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    print(f"{clients} clients x {orders} orders of 3 lines, {skus} SKUs")
+    print(f"throughput: {len(latencies) / elapsed:12,.0f} orders/s")
+    print(f"p50:        {percentile(latencies, 0.50) * 1000:12.3f} ms")
+    print(f"p99:        {percentile(latencies, 0.99) * 1000:12.3f} ms")
+
+
+def main() -> None:
+    """Parse arguments and run the load generator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--orders", type=int, default=10)
+    parser.add_argument("--skus", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.orders, args.skus))
+
+
+if __name__ == "__main__":
+    main()
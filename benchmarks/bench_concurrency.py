@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Measure order throughput of a thread-safe store against the number of threads.
+
+Usage:
+    python -m benchmarks.bench_concurrency [--skus N] [--orders N]
+"""
+import argparse
+import os
+import random
+import threading
+import time
+
+from benchmarks.catalog import make_catalog
+from store import Store
+
+
+def run(threads: int, skus: int, orders: int) -> float:
+    """
+    Place orders on a fresh thread-safe store from several threads.
+    
+    Args:
+        threads: Number of ordering threads.
+        skus: Number of products in the catalog.
+        orders: Total number of orders, split evenly between the threads.
+        
+    Returns:
+        Orders processed per second.
+    """
+    products = make_catalog(skus)
+    for product in products:
+        product.quantity = max(product.quantity, 0) + orders  # Never sell out
+    store = Store(products, thread_safe=True)
+    
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(orders // threads):
+            store.order([(product, 1) for product in rng.sample(products, 3)])
+    
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    return (orders // threads) * threads / elapsed
+
+
+def main() -> None:
+    """Run the benchmark for 1 thread up to twice the core count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--skus", type=int, default=10_000)
+    parser.add_argument("--orders", type=int, default=50_000)
+    args = parser.parse_args()
+    
+    cores = os.cpu_count() or 1
+    print(f"{cores} cores, {args.skus} SKUs, {args.orders} orders of 3 lines")
+    counts = sorted({1, 2, 4, cores, cores * 2})
+    for threads in counts:
+        print(f"{threads:3d} threads: {run(threads, args.skus, args.orders):12,.0f} orders/s")
+
+
+if __name__ == "__main__":
+    main()
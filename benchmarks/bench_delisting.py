@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Time delisting discontinued SKUs from a large catalog.
+
+Usage:
+    python -m benchmarks.bench_delisting [--size N] [--delist N]
+"""
+import argparse
+import time
+
+from benchmarks.catalog import make_catalog
+from store import Store
+
+
+def main() -> None:
+    """Print the time to delist one by one and in bulk."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--delist", type=int, default=50_000)
+    args = parser.parse_args()
+    
+    products = make_catalog(args.size)
+    names = [product.name for product in products[::args.size // args.delist]][:args.delist]
+    
+    store = Store(products)
+    start = time.perf_counter()
+    for name in names:
+        store.remove_product(name)
+    print(f"remove_product x{len(names)}: {time.perf_counter() - start:8.3f} s")
+    
+    store = Store(products)
+    start = time.perf_counter()
+    store.remove_products(names)
+    print(f"remove_products:          {time.perf_counter() - start:8.3f} s")
+    
+    start = time.perf_counter()
+    remaining = sum(1 for _ in store)
+    print(f"iterate {remaining} products: {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
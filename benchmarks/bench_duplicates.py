@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Compare ordering carts full of repeated lines with the same carts merged.
+
+Usage:
+    python -m benchmarks.bench_duplicates [--lines N] [--distinct N]
+"""
+import argparse
+import timeit
+from collections import Counter
+
+from benchmarks.catalog import make_promotions
+from product import Product
+from store import Store
+
+
+def main() -> None:
+    """Print the time per order for a split cart and its merged equivalent."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=100)
+    parser.add_argument("--distinct", type=int, default=5)
+    parser.add_argument("--orders", type=int, default=2_000)
+    args = parser.parse_args()
+    
+    promotions = make_promotions()
+    products = []
+    for i in range(args.distinct):
+        product = Product(f"SKU-{i:08d}", price=10 + i, quantity=args.lines * args.orders * 10)  # Never sells out
+        product.promotion = promotions[i % len(promotions)]
+        products.append(product)
+    store = Store(products)
+    
+    split = [(products[i % args.distinct], 1) for i in range(args.lines)]
+    merged = [(product, quantity) for product, quantity in Counter(product for product, _ in split).items()]
+    
+    for label, cart in (("split", split), ("merged", merged)):
+        seconds = min(timeit.repeat(lambda: store.order(cart), number=args.orders, repeat=3))
+        print(f"{label:7s} {len(cart):5d} lines: {seconds / args.orders * 1e6:10.1f} us/order")
+
+
+if __name__ == "__main__":
+    main()
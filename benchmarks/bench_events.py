@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Measure order latency with 0, 1 and 10 event subscribers.
+
+Usage:
+    python -m benchmarks.bench_events [--orders N] [--subscribers N ...]
+"""
+import argparse
+import time
+
+from benchmarks.catalog import make_catalog
+from store import Store
+
+
+def main() -> None:
+    """Print the time per order and the events dropped for each subscriber count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--products", type=int, default=1_000)
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[0, 1, 10])
+    args = parser.parse_args()
+    
+    for subscribers in args.subscribers:
+        products = make_catalog(args.products)
+        for product in products:
+            product.quantity = args.orders * 10  # Never sells out
+        store = Store(products)
+        
+        seen = []
+        for _ in range(subscribers):
+            store.subscribe(lambda batch: seen.append(len(batch)))
+        
+        carts = [[(products[(i + j) % len(products)], 1) for j in range(3)] for i in range(args.orders)]
+        start = time.perf_counter()
+        for cart in carts:
+            store.order(cart)
+        seconds = time.perf_counter() - start
+        
+        dropped = 0
+        if store.events is not None:
+            store.events.flush()
+            dropped = store.events.dropped
+            store.events.close()
+        print(f"{subscribers:3d} subscribers: {seconds / args.orders * 1e6:8.2f} us/order, {dropped} events dropped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Measure streaming catalog import speed and the importer's own memory use.
+
+Usage:
+    python -m benchmarks.bench_import [--rows N ...] [--workers N ...]
+"""
+import argparse
+import csv
+import os
+import tempfile
+import tracemalloc
+
+from benchmarks.catalog import make_catalog, make_promotions
+from catalog_import import import_catalog
+from columnar_store import ColumnarStore
+from product import NonStockedProduct, LimitedProduct
+
+
+def write_feed(path: str, rows: int) -> None:
+    """
+    Write a CSV feed of a synthetic catalog.
+    
+    Args:
+        path: The file to write.
+        rows: Number of products in the feed.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["type", "name", "price", "quantity", "maximum", "promotion"])
+        for product in make_catalog(rows):
+            if isinstance(product, NonStockedProduct):
+                product_type, maximum = "non_stocked", ""
+            elif isinstance(product, LimitedProduct):
+                product_type, maximum = "limited", product.maximum
+            else:
+                product_type, maximum = "product", ""
+            promotion = product.promotion.name if product.promotion else ""
+            writer.writerow([product_type, product.name, product.price, product.quantity, maximum, promotion])
+
+
+def main() -> None:
+    """Import feeds of growing size and print rows/s, transient memory and worker scaling."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 400_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    
+    promotions = {promotion.name: promotion for promotion in make_promotions()}
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            path = os.path.join(directory, f"catalog-{rows}.csv")
+            write_feed(path, rows)
+            
+            # The columnar store keeps the store's own growth small and steady
+            store = ColumnarStore()
+            tracemalloc.start()
+            report = import_catalog(store, path, promotions)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            print(f"{rows:10d} rows: {report.rows_per_second:10,.0f} rows/s, "
+                  f"importer overhead {(peak - current) / 2 ** 20:6.1f} MiB, "
+                  f"file {os.path.getsize(path) / 2 ** 20:6.1f} MiB")
+            
+            for workers in args.workers:
+                report = import_catalog(ColumnarStore(), path, promotions, workers=workers)
+                print(f"{'':16s}{workers:2d} workers: {report.rows_per_second:10,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
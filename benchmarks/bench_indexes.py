@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Compare price and stock queries through the sorted indexes with full scans.
+
+Usage:
+    python -m benchmarks.bench_indexes [--size N] [--queries N]
+"""
+import argparse
+import time
+
+from benchmarks.catalog import make_catalog
+from product import NonStockedProduct
+from store import Store
+
+
+def main() -> None:
+    """Print the time per query for scans and for the indexes."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+    
+    store = Store(make_catalog(args.size))
+    
+    def timed(label: str, query) -> None:
+        start = time.perf_counter()
+        for _ in range(args.queries):
+            query()
+        print(f"{label:36s} {(time.perf_counter() - start) / args.queries * 1e3:10.3f} ms/query")
+    
+    timed("scan: price in [200, 201]", lambda: sorted(
+        (p for p in store.get_all_products() if 200 <= p.price <= 201), key=lambda p: p.price))
+    timed("scan: quantity < 2", lambda: sorted(
+        (p for p in store.get_all_products() if not isinstance(p, NonStockedProduct) and p.quantity < 2),
+        key=lambda p: p.quantity))
+    
+    # Products that cannot sell out however many orders are timed
+    stocked = [p for p in store.get_all_products() if not isinstance(p, NonStockedProduct) and p.quantity > 2]
+    orders = iter([[(stocked[i % len(stocked)], 1)] for i in range(2 * args.queries)])
+    timed("order(), no indexes", lambda: store.order(next(orders)))
+    
+    start = time.perf_counter()
+    store.cheapest(1)
+    store.low_stock(1)
+    print(f"{'building both indexes':36s} {(time.perf_counter() - start) * 1e3:10.3f} ms")
+    
+    timed("index: products_in_price_range", lambda: store.products_in_price_range(200, 201))
+    timed("index: low_stock(2)", lambda: store.low_stock(2))
+    timed("index: cheapest(10)", lambda: store.cheapest(10))
+    timed("order(), both indexes", lambda: store.order(next(orders)))
+    
+    products = store.get_all_products()[:args.queries]
+    timed(f"{len(products)} price updates, indexed", lambda: [setattr(p, "price", p.price + 1) for p in products])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Measure journaled order throughput at several group-commit sizes and windows.
+
+Usage:
+    python -m benchmarks.bench_journal [--orders N] [--skus N] [--sync-window SECONDS ...]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Optional
+
+from benchmarks.catalog import make_catalog
+from journal import OrderJournal
+from store import Store
+
+
+def run(group_size: Optional[int], sync_window: float, orders: int, skus: int, directory: str) -> float:
+    """
+    Place orders one by one on a store journaling with the given group size.
+    
+    Args:
+        group_size: Orders per sync, or None to run without a journal.
+        sync_window: The most seconds an order waits to be synced.
+        orders: Number of orders to place.
+        skus: Number of products in the catalog.
+        directory: Where to put the journal file.
+        
+    Returns:
+        Orders processed per second.
+    """
+    products = make_catalog(skus)
+    for product in products:
+        product.quantity = max(product.quantity, 0) + orders  # Never sell out
+    store = Store(products)
+    
+    journal = None
+    if group_size is not None:
+        path = os.path.join(directory, f"group-{group_size}.journal")
+        journal = OrderJournal(path, group_size=group_size, sync_window=sync_window)
+        store.set_journal(journal)
+    
+    rng = random.Random(1)
+    shopping_lists = [[(product, 1) for product in rng.sample(products, 3)] for _ in range(orders)]
+    
+    start = time.perf_counter()
+    for shopping_list in shopping_lists:
+        store.order(shopping_list)
+    if journal is not None:
+        journal.close()
+    return orders / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Print orders/s without a journal and for each group size and sync window."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--skus", type=int, default=10_000)
+    parser.add_argument("--sync-window", type=float, nargs="+", default=[0.001, 0.01, 0.1])
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{args.orders} orders of 3 lines, {args.skus} SKUs")
+        print(f"no journal:                         {run(None, 0, args.orders, args.skus, directory):12,.0f} orders/s")
+        print(f"group size     1:                    {run(1, 0, min(args.orders, 2_000), args.skus, directory):12,.0f} orders/s")
+        for group_size in (8, 64, 512):
+            for sync_window in args.sync_window:
+                rate = run(group_size, sync_window, args.orders, args.skus, directory)
+                print(f"group size {group_size:5d}, window {sync_window * 1e3:7.1f} ms: {rate:12,.0f} orders/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Report the memory used per SKU by the object-based and columnar store backends.
+
+Usage:
+    python -m benchmarks.bench_memory [--skus N]
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Callable
+
+from benchmarks.catalog import make_catalog
+from columnar_store import ColumnarStore
+from store import Store
+
+
+def bytes_per_sku(store_type: Callable[..., Store], skus: int) -> float:
+    """
+    Measure the memory held by a store built from a synthetic catalog.
+    
+    Args:
+        store_type: The store class to build.
+        skus: Number of products in the catalog.
+        
+    Returns:
+        Bytes still allocated per SKU once only the store is left.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    
+    store = store_type(make_catalog(skus))
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    
+    tracemalloc.stop()
+    del store
+    return (after - before) / skus
+
+
+def main() -> None:
+    """Print bytes per SKU for each backend."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--skus", type=int, default=100_000)
+    args = parser.parse_args()
+    
+    print(f"{args.skus} SKUs")
+    for store_type in (Store, ColumnarStore):
+        print(f"{store_type.__name__:15s} {bytes_per_sku(store_type, args.skus):8.1f} bytes/SKU")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Time +, in-place merge and merge_all on two overlapping regional catalogs.
+
+Usage:
+    python -m benchmarks.bench_merge [--size N] [--stores N]
+"""
+import argparse
+import time
+
+from benchmarks.catalog import make_catalog
+from store import Store
+
+
+def main() -> None:
+    """Print the time taken by each way of merging."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=500_000, help="products per regional catalog")
+    parser.add_argument("--stores", type=int, default=4, help="stores for merge_all")
+    args = parser.parse_args()
+    
+    def regional(seed: int) -> Store:
+        # Half the SKUs are shared between regions, half are regional
+        products = make_catalog(args.size, seed=seed)
+        for product in products[args.size // 2:]:
+            product.name = f"R{seed}-{product.name}"
+        return Store(products)
+    
+    def timed(label: str, operation) -> None:
+        start = time.perf_counter()
+        operation()
+        print(f"{label:28s} {time.perf_counter() - start:8.2f} s")
+    
+    left, right = regional(1), regional(2)
+    timed("left + right", lambda: left + right)
+    for policy in ("keep_right", "sum_quantities", "min_price"):
+        timed(f"merge({policy})", lambda: regional(1).merge(right, policy=policy))
+    timed("  (building a region)", lambda: regional(1))
+    
+    stores = [regional(seed) for seed in range(args.stores)]
+    timed(f"merge_all({args.stores} stores)", lambda: Store.merge_all(stores, policy="sum_quantities"))
+
+
+if __name__ == "__main__":
+    main()
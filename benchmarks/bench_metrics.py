@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Compare order throughput with instrumentation off, on, and off again.
+
+Usage:
+    python -m benchmarks.bench_metrics [--orders N]
+"""
+import argparse
+import timeit
+
+from benchmarks.catalog import make_catalog
+from metrics import instrument, uninstrument
+from store import Store
+
+
+def main() -> None:
+    """Print orders per second in each instrumentation state."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--products", type=int, default=1_000)
+    args = parser.parse_args()
+    
+    products = make_catalog(args.products)
+    for product in products:
+        product.quantity = args.orders * 100  # Never sells out
+    store = Store(products)
+    cart = [(products[i], 1) for i in range(0, len(products), len(products) // 5)]
+    
+    def measure(label: str) -> None:
+        seconds = min(timeit.repeat(lambda: store.order(cart), number=args.orders, repeat=3))
+        print(f"{label:14s} {args.orders / seconds:12,.0f} orders/s")
+    
+    store.order(cart)  # Warm up
+    measure("never enabled")
+    metrics = instrument()
+    measure("instrumented")
+    uninstrument()
+    measure("disabled again")
+    print()
+    print(metrics.to_prometheus(), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Compare placing a burst of orders one by one with placing it as one batch.
+
+Usage:
+    python -m benchmarks.bench_order_many [--orders N] [--skus N] [--lines N] [--thread-safe]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.catalog import make_catalog
+from store import Store
+
+NEVER_SELLS_OUT = 10 ** 12
+
+
+def main() -> None:
+    """Print the order throughput of order() in a loop and of order_many()."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--skus", type=int, default=10_000)
+    parser.add_argument("--lines", type=int, default=3)
+    parser.add_argument("--thread-safe", action="store_true")
+    args = parser.parse_args()
+    
+    rates = {}
+    for label in ("order", "order_many"):
+        products = make_catalog(args.skus)
+        for product in products:
+            if product.quantity:
+                product.quantity = NEVER_SELLS_OUT
+        store = Store(products, thread_safe=args.thread_safe)
+        in_stock = store.get_all_products()
+        
+        generator = random.Random(0)
+        orders = [[(generator.choice(in_stock), 1) for _ in range(args.lines)]
+                  for _ in range(args.orders)]
+        
+        start = time.perf_counter()
+        if label == "order":
+            for shopping_list in orders:
+                store.order(shopping_list)
+        else:
+            store.order_many(orders)
+        seconds = time.perf_counter() - start
+        
+        rates[label] = args.orders / seconds
+        print(f"{label:10s} {args.orders} orders: {seconds:8.3f} s, {rates[label]:10.0f} orders/s")
+    
+    print(f"order_many is {rates['order_many'] / rates['order']:.2f}x the throughput of order()")
+
+
+if __name__ == "__main__":
+    main()
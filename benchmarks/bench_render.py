@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Time dumping a large catalog as text, cold and with the rendering cache warm.
+
+Usage:
+    python -m benchmarks.bench_render [--size N] [--output FILE]
+"""
+import argparse
+import os
+import time
+
+from benchmarks.catalog import make_catalog
+from store import Store
+
+
+def main() -> None:
+    """Print the time for each way of dumping the catalog."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--output", default=os.devnull)
+    args = parser.parse_args()
+    
+    store = Store(make_catalog(args.size))
+    
+    def timed(label: str, dump) -> None:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            start = time.perf_counter()
+            dump(stream)
+            print(f"{label:34s} {time.perf_counter() - start:8.2f} s")
+    
+    def print_each(stream) -> None:
+        for product in store.get_all_products():
+            print(product.show(), file=stream)
+    
+    timed("print() per product, cold cache", print_each)
+    timed("print() per product, warm cache", print_each)
+    timed("render_catalog, warm cache", store.render_catalog)
+    
+    for product in store.get_all_products()[::10]:
+        product.price = product.price + 1
+    timed("render_catalog, 10% repriced", store.render_catalog)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Measure prefix and fuzzy name search latency on a large catalog.
+
+Usage:
+    python -m benchmarks.bench_search [--size N] [--queries N]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.catalog import make_catalog
+from store import Store
+
+
+def main() -> None:
+    """Print the index build time and the time per query."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+    
+    store = Store(make_catalog(args.size))
+    rng = random.Random(42)
+    names = [f"SKU-{rng.randrange(args.size):08d}" for _ in range(args.queries)]
+    
+    start = time.perf_counter()
+    store.search_prefix("")
+    print(f"{'building the index':28s} {time.perf_counter() - start:10.2f} s")
+    
+    def timed(label: str, queries, search) -> None:
+        start = time.perf_counter()
+        for query in queries:
+            search(query)
+        print(f"{label:28s} {(time.perf_counter() - start) / len(queries) * 1e3:10.3f} ms/query")
+    
+    timed("search_prefix (10 results)", [name[:-2] for name in names], store.search_prefix)
+    timed("search_prefix (exact name)", names, store.search_prefix)
+    # Swap two digits to make a typo
+    typos = [name[:-2] + name[-1] + name[-2] for name in names]
+    # Synthetic SKU names share most of their trigrams, so a loose threshold matches a large share of them
+    timed("fuzzy_search (one typo)", typos, store.fuzzy_search)
+    timed("fuzzy_search (similarity 0.7)", typos, lambda query: store.fuzzy_search(query, min_similarity=0.7))
+    
+    def relist(name: str) -> None:
+        product = store.get_product(name)
+        store.remove_product(name)
+        store.add_product(product)
+    timed("remove + add_product", names, relist)
+
+
+if __name__ == "__main__":
+    main()
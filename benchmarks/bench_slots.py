@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of product and promotion object size and attribute access.
+
+Usage:
+    python -m benchmarks.bench_slots [--objects N]
+"""
+import argparse
+import gc
+import timeit
+import tracemalloc
+from typing import Callable
+
+from product import Product, NonStockedProduct, LimitedProduct
+from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
+
+
+def bytes_per_object(factory: Callable[[int], object], count: int) -> float:
+    """
+    Measure the memory held by freshly created objects.
+    
+    Args:
+        factory: Function creating the i-th object.
+        count: Number of objects to create.
+        
+    Returns:
+        Bytes allocated per object.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    del objects
+    return (after - before) / count
+
+
+def main() -> None:
+    """Print bytes per object and nanoseconds per hot-path operation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--objects", type=int, default=100_000)
+    args = parser.parse_args()
+    
+    factories = {
+        "Product": lambda i: Product(f"P{i}", price=10, quantity=5),
+        "NonStockedProduct": lambda i: NonStockedProduct(f"P{i}", price=10),
+        "LimitedProduct": lambda i: LimitedProduct(f"P{i}", price=10, quantity=5, maximum=1),
+        "PercentDiscount": lambda i: PercentDiscount(f"P{i}", percent=30),
+        "SecondHalfPrice": lambda i: SecondHalfPrice(f"P{i}"),
+        "ThirdOneFree": lambda i: ThirdOneFree(f"P{i}")
+    }
+    print(f"{'bytes/object':>40s}  (name strings and list slot included)")
+    for label, factory in factories.items():
+        print(f"{label:25s} {bytes_per_object(factory, args.objects):14.1f}")
+    
+    product = Product("MacBook", price=1450, quantity=10 ** 9)
+    promoted = LimitedProduct("Shipping", price=10, quantity=10 ** 9, maximum=5)
+    promoted.promotion = SecondHalfPrice("Second Half price!")
+    operations = {
+        "product.price": lambda: product.price,
+        "product.quantity = n": lambda: setattr(product, "quantity", 10 ** 9),
+        "Product.buy(1)": lambda: product.buy(1),
+        "promotion.apply_promotion": lambda: promoted.promotion.apply_promotion(promoted, 3)
+    }
+    print(f"\n{'ns/operation':>40s}")
+    for label, operation in operations.items():
+        runs = 200_000
+        seconds = min(timeit.repeat(operation, number=runs, repeat=5))
+        print(f"{label:25s} {seconds / runs * 1e9:14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Compare store startup from Python product lists with loading a snapshot.
+
+Usage:
+    python -m benchmarks.bench_snapshot [--skus N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.catalog import make_catalog
+from snapshot import save_snapshot, load_snapshot
+from store import Store
+
+
+def main() -> None:
+    """Print startup and first-lookup times for both ways of starting a store."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--skus", type=int, default=1_000_000)
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    store = Store(make_catalog(args.skus))
+    build_seconds = time.perf_counter() - start
+    
+    handle, path = tempfile.mkstemp(suffix=".snapshot")
+    os.close(handle)
+    try:
+        save_snapshot(store, path)
+        size = os.path.getsize(path)
+        del store
+        
+        start = time.perf_counter()
+        loaded = load_snapshot(path)
+        load_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        loaded.get_product(f"SKU-{args.skus - 1:08d}")
+        lookup_seconds = time.perf_counter() - start
+    finally:
+        os.remove(path)
+    
+    print(f"{args.skus} SKUs, snapshot of {size / 2 ** 20:.1f} MiB")
+    print(f"build from Python lists: {build_seconds * 1000:10.2f} ms")
+    print(f"load snapshot:           {load_seconds * 1000:10.2f} ms")
+    print(f"first lookup by name:    {lookup_seconds * 1000:10.2f} ms  (builds the name index)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Reproducible synthetic catalogs for the Best Buy Store benchmarks.
+"""
+import random
+import sys
+import os
+from typing import List
+
+# Add the parent directory to sys.path so imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from product import Product, NonStockedProduct, LimitedProduct
+from promotions import Promotion, PercentDiscount, SecondHalfPrice, ThirdOneFree
+
+
+def make_promotions() -> List[Promotion]:
+    """
+    Create one promotion of every type.
+    
+    Returns:
+        List of promotions to attach to synthetic products.
+    """
+    return [
+        SecondHalfPrice("Second Half price!"),
+        ThirdOneFree("Third One Free!"),
+        PercentDiscount("30% off!", percent=30)
+    ]
+
+
+def make_catalog(size: int, seed: int = 42) -> List[Product]:
+    """
+    Create a synthetic catalog with a realistic mix of product types.
+    
+    The same size and seed always produce the same catalog: mostly regular
+    products, some non-stocked and limited ones, and a promotion on about
+    one product in four.
+    
+    Args:
+        size: Number of products to create.
+        seed: Seed for the random number generator.
+        
+    Returns:
+        List of freshly created products.
+    """
+    rng = random.Random(seed)
+    promotions = make_promotions()
+    products: List[Product] = []
+    
+    for i in range(size):
+        name = f"SKU-{i:08d}"
+        price = round(rng.uniform(1, 2000), 2)
+        kind = rng.random()
+        if kind < 0.05:
+            product: Product = NonStockedProduct(name, price=price)
+        elif kind < 0.10:
+            product = LimitedProduct(name, price=price, quantity=rng.randint(1, 1000), maximum=rng.randint(1, 5))
+        else:
+            product = Product(name, price=price, quantity=rng.randint(0, 1000))
+        
+        if rng.random() < 0.25:
+            product.promotion = rng.choice(promotions)
+        products.append(product)
+    
+    return products
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Run the store, product and promotion benchmark suite.
+
+Every case is timed on synthetic catalogs of each requested size and
+reported in seconds per operation. Results can be written as JSON and
+compared against an earlier run; any case slower than the baseline by more
+than the threshold is a regression and makes the run exit with status 1.
+
+Usage:
+    python -m benchmarks.run_benchmarks [--sizes N ...] [--output FILE] [--baseline FILE] [--threshold F]
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from benchmarks.catalog import make_catalog, make_promotions
+from product import Product
+from store import Store
+
+CART_SIZES = (1, 10, 100)
+REMOVALS = 100  # Products removed per remove_product sample
+NEVER_SELLS_OUT = 10 ** 12
+
+# (case name, statement, setup or None); the setup runs before every sample
+Case = Tuple[str, Callable[[], object], Callable[[], None]]
+
+
+def cases(size: int) -> Iterator[Case]:
+    """
+    Build the benchmark cases for one catalog size.
+    
+    Args:
+        size: Number of products in the catalog.
+        
+    Yields:
+        The cases, named "<operation>@<size>".
+    """
+    products = make_catalog(size)
+    for product in products:
+        if product.quantity:
+            product.quantity = NEVER_SELLS_OUT
+    store = Store(products)
+    in_stock = store.get_all_products()
+    
+    for cart_size in CART_SIZES:
+        if cart_size <= len(in_stock):
+            step = len(in_stock) // cart_size
+            cart = [(in_stock[i * step], 1) for i in range(cart_size)]
+            yield f"order[cart={cart_size}]@{size}", lambda cart=cart: store.order(cart), None
+    
+    yield f"get_all_products@{size}", store.get_all_products, None
+    yield f"get_total_quantity@{size}", store.get_total_quantity, None
+    
+    present, missing = products[size // 2], Product("SKU-missing", price=1, quantity=1)
+    yield f"contains[hit]@{size}", lambda: present in store, None
+    yield f"contains[miss]@{size}", lambda: missing in store, None
+    
+    new_products = make_catalog(max(1, size // 10), seed=7)
+    for product in new_products:
+        product.name = "NEW-" + product.name  # Nothing in common with the store
+    other = Store(new_products)
+    yield f"add@{size}", lambda: store + other, None
+    
+    # Every sample removes the same products from a fresh copy of the store
+    names = [product.name for product in products[::max(1, size // REMOVALS)]][:REMOVALS]
+    scratch: List[Store] = []
+    
+    def fresh_store() -> None:
+        scratch[:] = [Store(make_catalog(size))]
+    
+    def remove_all() -> None:
+        for name in names:
+            scratch[0].remove_product(name)
+    yield f"remove_product[x{len(names)}]@{size}", remove_all, fresh_store
+
+
+def promotion_cases() -> Iterator[Case]:
+    """
+    Build one apply_promotion case per promotion type.
+    
+    Yields:
+        The cases, named "apply_promotion[<type>]".
+    """
+    product = Product("SKU-promoted", price=999.99, quantity=NEVER_SELLS_OUT)
+    for promotion in make_promotions():
+        name = f"apply_promotion[{type(promotion).__name__}]"
+        yield name, lambda promotion=promotion: promotion.apply_promotion(product, 7), None
+
+
+def measure(statement: Callable[[], object], setup: Callable[[], None], repeat: int) -> float:
+    """
+    Time a statement, taking the best of several samples.
+    
+    Args:
+        statement: The operation to time.
+        setup: Run untimed before each sample, or None. Cases with a setup run once per sample.
+        repeat: Number of samples.
+        
+    Returns:
+        The best time per operation, in seconds.
+    """
+    if setup is not None:
+        timer = timeit.Timer(statement, setup=setup)
+        return min(timer.repeat(repeat=repeat, number=1))
+    
+    timer = timeit.Timer(statement)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """
+    Find the cases that got slower than the baseline by more than the threshold.
+    
+    Args:
+        results: Seconds per operation for this run.
+        baseline: Seconds per operation for the earlier run.
+        threshold: Allowed slowdown, e.g. 0.2 for 20%.
+        
+    Returns:
+        A description of every regression.
+    """
+    regressions = []
+    for name, seconds in results.items():
+        before = baseline.get(name)
+        if before and seconds > before * (1 + threshold):
+            regressions.append(f"{name}: {before * 1e6:.3f} us -> {seconds * 1e6:.3f} us (+{seconds / before - 1:.0%})")
+    return regressions
+
+
+def main() -> int:
+    """
+    Run the suite, print the results and check them against a baseline.
+    
+    Returns:
+        The exit status: 1 if there were regressions, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 100_000],
+                        help="catalog sizes, up to 10_000_000")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per case; the best is kept")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before failing")
+    args = parser.parse_args()
+    
+    results: Dict[str, float] = {}
+    for case in promotion_cases():
+        name, statement, setup = case
+        results[name] = measure(statement, setup, args.repeat)
+        print(f"{name:40s} {results[name] * 1e6:14.3f} us")
+    for size in args.sizes:
+        for name, statement, setup in cases(size):
+            results[name] = measure(statement, setup, args.repeat)
+            print(f"{name:40s} {results[name] * 1e6:14.3f} us")
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "results": results}, file, indent=2, sort_keys=True)
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions above {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+import csv
+import json
+import math
+import os
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import BinaryIO, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+from product import Product, NonStockedProduct, LimitedProduct
+from promotions import Promotion
+from store import Store
+
+# Values of the type column
+PRODUCT_TYPES = ("product", "non_stocked", "limited")
+
+SHARDS_PER_WORKER = 4  # More shards than workers keeps them all busy to the end
+MAX_SHARD_BYTES = 16 * 1024 * 1024  # Larger feeds get more shards, so memory stays flat
+SHARDS_IN_FLIGHT_PER_WORKER = 2  # Parsed shards waiting for the parent, per worker
+
+
+class ImportReport(NamedTuple):
+    """
+    Outcome of a catalog import.
+    """
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Get the import rate."""
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+
+class ShardBuffer(NamedTuple):
+    """
+    Validated rows of one shard of a feed, packed into columns for the trip
+    back from a worker process.
+    """
+    names: List[str]
+    kinds: bytes  # Index into PRODUCT_TYPES
+    prices: array
+    quantities: array
+    maxima: array
+    promotion_ids: array  # Index into promotion_names, -1 for none
+    promotion_names: List[str]
+
+
+def read_rows(path: str) -> Iterator[Dict[str, str]]:
+    """
+    Stream the rows of a catalog feed one at a time.
+    
+    Files ending in .csv are read as CSV with a header row. Anything else is
+    read as JSON Lines, one object per line; blank lines are skipped.
+    
+    Args:
+        path: The feed file.
+        
+    Returns:
+        An iterator over the rows as dictionaries.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.lower().endswith(".csv"):
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def product_from_row(row: Mapping[str, object], promotions: Mapping[str, Promotion]) -> Product:
+    """
+    Create the product described by one catalog row.
+    
+    Rows have name, price and, depending on type, quantity and maximum
+    columns, plus optional type and promotion columns. The type defaults to
+    "product". Names and prices are checked by the product classes
+    themselves.
+    
+    Args:
+        row: The catalog row.
+        promotions: Map from promotion name to promotion.
+        
+    Returns:
+        The new product.
+        
+    Raises:
+        Exception: If the row is invalid or names an unknown type or promotion.
+    """
+    product_type = row.get("type") or "product"
+    name = str(row.get("name") or "")
+    price = float(row["price"])
+    
+    if product_type == "product":
+        product: Product = Product(name, price, int(row["quantity"]))
+    elif product_type == "non_stocked":
+        product = NonStockedProduct(name, price)
+    elif product_type == "limited":
+        product = LimitedProduct(name, price, int(row["quantity"]), int(row["maximum"]))
+    else:
+        raise Exception(f"Unknown product type '{product_type}' for '{name}'")
+    
+    promotion_name = row.get("promotion")
+    if promotion_name:
+        if promotion_name not in promotions:
+            raise Exception(f"Unknown promotion '{promotion_name}' for '{name}'")
+        product.promotion = promotions[promotion_name]
+    
+    return product
+
+
+def import_catalog(store: Store, path: str, promotions: Optional[Mapping[str, Promotion]] = None,
+                   chunk_size: int = 10_000, workers: int = 1) -> ImportReport:
+    """
+    Stream a catalog feed into a store.
+    
+    Rows are read and turned into products one chunk at a time, and each
+    chunk is added with one Store.add_products() call, so the importer only
+    ever holds chunk_size rows no matter how big the file is.
+    
+    With more than one worker, the file is split into shards at line
+    boundaries. Worker processes parse and validate the shards, and the
+    products are added in file order as the shards come back. In this mode
+    no CSV field may contain a line break.
+    
+    Args:
+        store: The store to add the products to.
+        path: The feed file, CSV or JSON Lines.
+        promotions: Map from promotion name to promotion, for the promotion column.
+        chunk_size: Number of rows per chunk.
+        workers: Number of worker processes.
+        
+    Returns:
+        The number of rows imported and the time taken.
+        
+    Raises:
+        Exception: If a row is invalid or a product is already in the store.
+            Chunks (or shards) before the failing one stay imported.
+    """
+    promotions = promotions or {}
+    if workers > 1:
+        return _import_in_parallel(store, path, promotions, workers)
+    
+    rows = read_rows(path)
+    count = 0
+    start = time.perf_counter()
+    
+    while True:
+        chunk: List[Product] = []
+        for row in islice(rows, chunk_size):
+            count += 1
+            try:
+                chunk.append(product_from_row(row, promotions))
+            except Exception as error:
+                raise Exception(f"Invalid catalog row {count}: {error!r}") from error
+        if not chunk:
+            break
+        store.add_products(chunk)
+    
+    return ImportReport(count, time.perf_counter() - start)
+
+
+def _import_in_parallel(store: Store, path: str, promotions: Mapping[str, Promotion],
+                        workers: int) -> ImportReport:
+    """
+    Import a feed with a pool of worker processes; see import_catalog().
+    
+    Args:
+        store: The store to add the products to.
+        path: The feed file, CSV or JSON Lines.
+        promotions: Map from promotion name to promotion.
+        workers: Number of worker processes.
+        
+    Returns:
+        The number of rows imported and the time taken.
+    """
+    start = time.perf_counter()
+    header, shards = _split(path, workers * SHARDS_PER_WORKER, MAX_SHARD_BYTES)
+    promotion_names = set(promotions)
+    count = 0
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Only a few shards are parsed ahead of the parent, and they are added in file order
+        remaining = iter(shards)
+        pending = deque(
+            executor.submit(_parse_shard, path, begin, end, header, promotion_names)
+            for begin, end in islice(remaining, workers * SHARDS_IN_FLIGHT_PER_WORKER)
+        )
+        while pending:
+            buffer = pending.popleft().result()
+            for begin, end in islice(remaining, 1):
+                pending.append(executor.submit(_parse_shard, path, begin, end, header, promotion_names))
+            
+            store.add_products(_products_from_buffer(buffer, promotions))
+            count += len(buffer.names)
+    
+    return ImportReport(count, time.perf_counter() - start)
+
+
+def _split(path: str, shards: int,
+           max_shard_bytes: int = MAX_SHARD_BYTES) -> Tuple[Optional[List[str]], List[Tuple[int, int]]]:
+    """
+    Cut a feed into byte ranges that each start at the beginning of a line.
+    
+    Args:
+        path: The feed file.
+        shards: The least number of ranges to aim for.
+        max_shard_bytes: The size ranges should not exceed; big feeds get more ranges.
+        
+    Returns:
+        The CSV column names (None for JSON Lines) and the (start, end) ranges.
+    """
+    header = None
+    with open(path, "rb") as file:
+        if path.lower().endswith(".csv"):
+            header = next(csv.reader([file.readline().decode("utf-8")]))
+        first = file.tell()
+        size = os.fstat(file.fileno()).st_size
+        shards = max(shards, math.ceil((size - first) / max_shard_bytes))
+        
+        boundaries = [first]
+        for shard in range(1, shards):
+            file.seek(max(first + (size - first) * shard // shards, boundaries[-1]))
+            file.readline()  # Move on to the start of the next line
+            boundaries.append(min(file.tell(), size))
+        boundaries.append(size)
+    
+    return header, [(begin, end) for begin, end in zip(boundaries, boundaries[1:]) if begin < end]
+
+
+def _parse_shard(path: str, begin: int, end: int, header: Optional[List[str]],
+                 promotion_names: set) -> ShardBuffer:
+    """
+    Parse and validate one shard of a feed; runs in a worker process.
+    
+    Args:
+        path: The feed file.
+        begin: Offset of the first line of the shard.
+        end: Offset just past the last line of the shard.
+        header: The CSV column names, or None for JSON Lines.
+        promotion_names: Names of the promotions rows may refer to.
+        
+    Returns:
+        The shard's rows, packed into columns.
+        
+    Raises:
+        Exception: If a row is invalid.
+    """
+    with open(path, "rb") as file:
+        return _parse_lines(_shard_lines(file, begin, end), begin, header, promotion_names)
+
+
+def _shard_lines(file: BinaryIO, begin: int, end: int) -> Iterator[str]:
+    """
+    Read the lines of one shard of a feed one at a time.
+    
+    Args:
+        file: The feed, opened in binary mode.
+        begin: Offset of the first line of the shard.
+        end: Offset just past the last line of the shard.
+        
+    Returns:
+        An iterator over the decoded lines, line endings included.
+    """
+    file.seek(begin)
+    position = begin
+    for line in file:
+        if position >= end:
+            return
+        position += len(line)
+        yield line.decode("utf-8")
+
+
+def _parse_lines(lines: Iterator[str], begin: int, header: Optional[List[str]],
+                 promotion_names: set) -> ShardBuffer:
+    """
+    Parse and validate the lines of one shard of a feed.
+    
+    Args:
+        lines: The shard's lines.
+        begin: Offset of the shard, for error messages.
+        header: The CSV column names, or None for JSON Lines.
+        promotion_names: Names of the promotions rows may refer to.
+        
+    Returns:
+        The shard's rows, packed into columns.
+        
+    Raises:
+        Exception: If a row is invalid.
+    """
+    if header is not None:
+        rows: Iterator[Mapping[str, object]] = csv.DictReader(lines, fieldnames=header)
+    else:
+        rows = (json.loads(line) for line in lines if line.strip())
+    
+    # Stand-ins are enough to check promotion names; the parent attaches the real ones
+    stand_ins = dict.fromkeys(promotion_names)
+    buffer = ShardBuffer([], b"", array('d'), array('q'), array('q'), array('i'), [])
+    kinds = bytearray()
+    promotion_ids: Dict[str, int] = {}
+    
+    for number, row in enumerate(rows, start=1):
+        try:
+            product = product_from_row(row, stand_ins)
+        except Exception as error:
+            raise Exception(f"Invalid catalog row {number} of the shard at byte {begin}: {error!r}") from error
+        
+        buffer.names.append(product.name)
+        buffer.prices.append(product.price)
+        buffer.quantities.append(product.quantity)
+        if isinstance(product, NonStockedProduct):
+            kinds.append(PRODUCT_TYPES.index("non_stocked"))
+            buffer.maxima.append(0)
+        elif isinstance(product, LimitedProduct):
+            kinds.append(PRODUCT_TYPES.index("limited"))
+            buffer.maxima.append(product.maximum)
+        else:
+            kinds.append(PRODUCT_TYPES.index("product"))
+            buffer.maxima.append(0)
+        
+        promotion_name = row.get("promotion")
+        if promotion_name:
+            if promotion_name not in promotion_ids:
+                promotion_ids[promotion_name] = len(buffer.promotion_names)
+                buffer.promotion_names.append(promotion_name)
+            buffer.promotion_ids.append(promotion_ids[promotion_name])
+        else:
+            buffer.promotion_ids.append(-1)
+    
+    return buffer._replace(kinds=bytes(kinds))
+
+
+def _products_from_buffer(buffer: ShardBuffer, promotions: Mapping[str, Promotion]) -> List[Product]:
+    """
+    Turn a shard buffer back into products.
+    
+    Args:
+        buffer: The parsed shard.
+        promotions: Map from promotion name to promotion.
+        
+    Returns:
+        The products of the shard, in file order.
+    """
+    shard_promotions = [promotions[name] for name in buffer.promotion_names]
+    products: List[Product] = []
+    
+    for row, name in enumerate(buffer.names):
+        product_type = PRODUCT_TYPES[buffer.kinds[row]]
+        if product_type == "non_stocked":
+            product: Product = NonStockedProduct(name, buffer.prices[row])
+        elif product_type == "limited":
+            product = LimitedProduct(name, buffer.prices[row], buffer.quantities[row], buffer.maxima[row])
+        else:
+            product = Product(name, buffer.prices[row], buffer.quantities[row])
+        
+        if buffer.promotion_ids[row] >= 0:
+            product.promotion = shard_promotions[buffer.promotion_ids[row]]
+        products.append(product)
+    
+    return products
@@ -0,0 +1,526 @@
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, MutableSequence, Optional, Tuple
+from product import Product, NonStockedProduct, LimitedProduct
+from promotions import Promotion
+from store import Store
+
+# Values of the product type column
+KIND_PRODUCT = 0
+KIND_NON_STOCKED = 1
+KIND_LIMITED = 2
+
+NO_PROMOTION = -1  # Promotion id of products without a promotion
+
+
+class ColumnarStore(Store):
+    """
+    Store backend keeping the inventory in compact columns instead of objects.
+    
+    Prices, quantities, active flags, maxima, product types and promotion ids
+    each live in one array indexed by row. Products handed out by the store
+    are thin views over a row: reading or setting their properties reads or
+    writes the columns, so they behave like the Product, NonStockedProduct
+    and LimitedProduct they stand for.
+    
+    Adding a product copies its current state into a new row. Later changes
+    must be made through the store's views, not the original object. Prices
+    are stored as floats.
+    """
+    def __init__(self, products: Optional[List[Product]] = None, thread_safe: bool = False):
+        """
+        Initialize the store with a list of products.
+        
+        Args:
+            products: List of products to copy into the store.
+            thread_safe: Whether orders may be placed from several threads at once.
+        """
+        self._names: MutableSequence[Optional[str]] = []  # None marks a removed row
+        self._row_index: Optional[Dict[str, int]] = {}  # None until first needed
+        self._prices: MutableSequence[float] = array('d')
+        self._quantities: MutableSequence[int] = array('q')
+        self._active_flags: MutableSequence[int] = array('b')
+        self._maxima: MutableSequence[int] = array('q')
+        self._kinds: MutableSequence[int] = array('b')
+        self._promotion_ids: MutableSequence[int] = array('i')
+        self._promotions: List[Promotion] = []  # Promotion table, indexed by promotion id
+        self._promotion_lookup: Dict[int, int] = {}  # Map from id() of a promotion to its id
+        
+        super().__init__(products, thread_safe)
+        self._active_products = None  # Active products are read straight from the columns
+
+    @classmethod
+    def from_columns(cls, names: MutableSequence[Optional[str]], prices: MutableSequence[float],
+                     quantities: MutableSequence[int], active_flags: MutableSequence[int],
+                     maxima: MutableSequence[int], kinds: MutableSequence[int],
+                     promotion_ids: MutableSequence[int], promotions: List[Promotion],
+                     total_quantity: int) -> 'ColumnarStore':
+        """
+        Create a store directly over existing columns, without copying them.
+        
+        Columns may be arrays or writable memoryviews. Memoryview columns are
+        copied into arrays the first time a product is added. The name index
+        is only built on the first lookup by name.
+        
+        Args:
+            names: Product name of each row, None for removed rows.
+            prices: Price column.
+            quantities: Quantity column.
+            active_flags: Active flag column.
+            maxima: Per-order maximum column (0 where there is none).
+            kinds: Product type column.
+            promotion_ids: Promotion id column.
+            promotions: Promotion table, indexed by promotion id.
+            total_quantity: The sum of the quantity column.
+            
+        Returns:
+            A store viewing the columns.
+        """
+        store = cls()
+        store._names = names
+        store._row_index = None
+        store._prices = prices
+        store._quantities = quantities
+        store._active_flags = active_flags
+        store._maxima = maxima
+        store._kinds = kinds
+        store._promotion_ids = promotion_ids
+        store._promotions = promotions
+        store._promotion_lookup = {id(promotion): i for i, promotion in enumerate(promotions)}
+        store._total_quantity = total_quantity
+        return store
+
+    @property
+    def _rows(self) -> Dict[str, int]:
+        """Get the map from product name to row, building it on first use."""
+        if self._row_index is None:
+            self._row_index = {name: row for row, name in enumerate(self._names) if name is not None}
+        return self._row_index
+
+    def _insert(self, product: Product) -> None:
+        """
+        Copy a product into a new row; the caller holds the state lock.
+        
+        Args:
+            product: The product to add.
+        """
+        self._make_growable()
+        kind, maximum = _kind_of(product)
+        
+        self._rows[product.name] = len(self._names)
+        self._names.append(product.name)
+        self._prices.append(product.price)
+        self._quantities.append(product.quantity)
+        self._active_flags.append(bool(product.active))
+        self._maxima.append(maximum)
+        self._kinds.append(kind)
+        self._promotion_ids.append(self._promotion_id(product.promotion))
+        if self._thread_safe:
+            self._locks[product.name] = threading.Lock()
+        
+        self._total_quantity += product.quantity
+        self._index_product(product)
+        if self._name_index is not None:
+            self._name_index.add(product.name)
+
+    def _holdable(self, product: Product) -> Product:
+        """
+        Take any product as it is, views included: adding one copies its state into a row.
+        
+        Args:
+            product: The product about to be added.
+            
+        Returns:
+            The product itself.
+        """
+        return product
+
+    def _replace_products(self, replacements: List[Tuple[Product, Product]]) -> None:
+        """
+        Overwrite the rows of our products with the state of their replacements.
+        
+        Args:
+            replacements: (our product, its replacement) pairs.
+        """
+        with self._state_lock:
+            for _, new in replacements:
+                row = self._rows[new.name]
+                kind, maximum = _kind_of(new)
+                self._total_quantity += new.quantity - self._quantities[row]
+                self._prices[row] = new.price
+                self._quantities[row] = new.quantity
+                self._active_flags[row] = bool(new.active)
+                self._maxima[row] = maximum
+                self._kinds[row] = kind
+                self._promotion_ids[row] = self._promotion_id(new.promotion)
+                self._quote_cache.pop(new.name, None)
+                self._unindex_product(new.name)
+                self._index_product(new)
+
+    def remove_products(self, product_names: Iterable[str]) -> None:
+        """
+        Remove many products from the store at once.
+        
+        Removed rows are only marked as such; their space is reclaimed when
+        the store is next saved as a snapshot.
+        
+        Args:
+            product_names: The names of the products to remove.
+        """
+        with self._state_lock:
+            for product_name in product_names:
+                row = self._rows.pop(product_name, None)
+                if row is None:
+                    continue
+                
+                self._names[row] = None
+                self._locks.pop(product_name, None)
+                self._total_quantity -= self._quantities[row]
+                self._quote_cache.pop(product_name, None)
+                self._unindex_product(product_name)
+                if self._name_index is not None:
+                    self._name_index.discard(product_name)
+
+    def get_product(self, product_name: str) -> Optional[Product]:
+        """
+        Look up a product in the store by name.
+        
+        Args:
+            product_name: The name of the product to look up.
+            
+        Returns:
+            A view of the product with that name, or None if there is none.
+        """
+        row = self._rows.get(product_name)
+        return None if row is None else self._view(row)
+
+    def get_all_products(self) -> List[Product]:
+        """
+        Get all active products in the store.
+        
+        Returns:
+            List of views of the active products.
+        """
+        names, active_flags = self._names, self._active_flags
+        return [
+            self._view(row) for row in range(len(names))
+            if active_flags[row] and names[row] is not None
+        ]
+
+    def iter_products(self, active_only: bool = True, page_size: int = 20,
+                      cursor: Optional[int] = None) -> Iterator[Tuple[List[Product], Optional[int]]]:
+        """
+        Page lazily through views of the products in catalog order.
+        
+        Rows are never reused, so the cursor is simply the next row.
+        
+        Args:
+            active_only: Whether to leave out inactive products.
+            page_size: The most products per page.
+            cursor: A cursor from an earlier page, or None to start at the beginning.
+            
+        Yields:
+            (page, cursor) pairs; the cursor is None once the end of the catalog is reached.
+            
+        Raises:
+            Exception: If the page size is not positive.
+        """
+        if page_size <= 0:
+            raise Exception("Page size must be positive!")
+        
+        names, active_flags = self._names, self._active_flags
+        row = cursor or 0
+        while row < len(names):
+            page = []
+            while row < len(names) and len(page) < page_size:
+                if names[row] is not None and (active_flags[row] or not active_only):
+                    page.append(self._view(row))
+                row += 1
+            
+            if page:
+                yield page, row if row < len(names) else None
+
+    def __contains__(self, product: Product) -> bool:
+        """
+        Check if a product exists in the store.
+        
+        Args:
+            product: The product to check.
+            
+        Returns:
+            True if product exists in store, False otherwise.
+        """
+        return product.name in self._rows
+
+    def __iter__(self) -> Iterator[Product]:
+        """
+        Create an iterator for the store's products.
+        
+        Returns:
+            An iterator over views of the products in the store.
+        """
+        names = self._names
+        return (self._view(row) for row in range(len(names)) if names[row] is not None)
+
+    def __len__(self) -> int:
+        """
+        Get the number of products in the store.
+        
+        Returns:
+            The number of products.
+        """
+        return len(self._rows)
+
+    def _make_growable(self) -> None:
+        """Copy any memoryview columns into arrays so rows can be appended."""
+        for attribute, typecode in (("_prices", 'd'), ("_quantities", 'q'), ("_active_flags", 'b'),
+                                    ("_maxima", 'q'), ("_kinds", 'b'), ("_promotion_ids", 'i')):
+            column = getattr(self, attribute)
+            if isinstance(column, memoryview):
+                grown = array(typecode)
+                grown.frombytes(column.cast('B'))
+                setattr(self, attribute, grown)
+
+    def _view(self, row: int) -> Product:
+        """
+        Create a view of one row.
+        
+        Args:
+            row: The row of the product.
+            
+        Returns:
+            A product view of the right type.
+        """
+        return _VIEW_TYPES[self._kinds[row]](self, row)
+
+    def _promotion_id(self, promotion: Optional[Promotion]) -> int:
+        """
+        Get the id of a promotion, adding it to the promotion table if it is new.
+        
+        Args:
+            promotion: The promotion, or None.
+            
+        Returns:
+            The promotion id, or NO_PROMOTION.
+        """
+        if promotion is None:
+            return NO_PROMOTION
+        
+        promotion_id = self._promotion_lookup.get(id(promotion))
+        if promotion_id is None:
+            promotion_id = self._promotion_lookup[id(promotion)] = len(self._promotions)
+            self._promotions.append(promotion)
+        return promotion_id
+
+
+def _kind_of(product: Product) -> Tuple[int, int]:
+    """
+    Get the product type column value and maximum column value for a product.
+    
+    Args:
+        product: The product to classify.
+        
+    Returns:
+        The product type and the per-order maximum (0 where there is none).
+    """
+    if isinstance(product, NonStockedProduct):
+        return KIND_NON_STOCKED, 0
+    if isinstance(product, LimitedProduct):
+        return KIND_LIMITED, product.maximum
+    return KIND_PRODUCT, 0
+
+
+class _RowView:
+    """
+    Properties shared by all product views over a ColumnarStore row.
+    """
+    __slots__ = ()
+    _is_view = True
+
+    def __init__(self, store: ColumnarStore, row: int):
+        """
+        Create a view of one row of a columnar store.
+        
+        Args:
+            store: The store holding the row.
+            row: The row of the product.
+        """
+        self._store = store
+        self._row = row
+
+    def _attach(self, store: Store) -> None:
+        """
+        Refuse to be held by another store.
+        
+        Views report changes to their own columnar store only, so any other
+        store would miss them.
+        
+        Raises:
+            Exception: Always.
+        """
+        raise Exception(f"'{self.name}' is a view of a columnar store; add a copy of it instead")
+
+    def __str__(self) -> str:
+        """
+        Get a string representation of the product, built afresh every time.
+        
+        Views skip the product rendering cache: another view of the same row
+        may have changed it.
+        
+        Returns:
+            A formatted string with product details.
+        """
+        return self._render()
+
+    def __copy__(self) -> Product:
+        """
+        Copy the row into a standalone product of the type the view stands for.
+        
+        Returns:
+            A new product, held by no store.
+        """
+        kind = self._store._kinds[self._row]
+        if kind == KIND_NON_STOCKED:
+            product: Product = NonStockedProduct(self.name, price=self.price)
+        elif kind == KIND_LIMITED:
+            product = LimitedProduct(self.name, price=self.price, quantity=self.quantity, maximum=self.maximum)
+        else:
+            product = Product(self.name, price=self.price, quantity=self.quantity)
+        product.active = self.active
+        product.promotion = self.promotion
+        return product
+
+    @property
+    def name(self) -> str:
+        """Get the product name."""
+        return self._store._names[self._row]
+
+    @property
+    def price(self) -> float:
+        """Get the product price."""
+        return self._store._prices[self._row]
+
+    @price.setter
+    def price(self, value: float) -> None:
+        """
+        Set the product price.
+        
+        Args:
+            value: The new price.
+            
+        Raises:
+            Exception: If price is negative.
+        """
+        if value < 0:
+            raise Exception("Product price cannot be negative!")
+        store = self._store
+        old_price = store._prices[self._row]
+        store._prices[self._row] = value
+        store._product_changed(self, "price", old_price, value)
+
+    @property
+    def quantity(self) -> int:
+        """Get the current quantity of the product."""
+        return self._store._quantities[self._row]
+
+    @quantity.setter
+    def quantity(self, value: int) -> None:
+        """
+        Set the product quantity and update active status.
+        
+        Args:
+            value: The new quantity.
+        """
+        store, row = self._store, self._row
+        old_quantity, was_active = store._quantities[row], bool(store._active_flags[row])
+        store._quantities[row] = value
+        store._active_flags[row] = value > 0
+        
+        store._product_changed(self, "quantity", old_quantity, value)
+        if was_active != (value > 0):
+            store._product_changed(self, "active", was_active, value > 0)
+
+    @property
+    def active(self) -> bool:
+        """Check if the product is active."""
+        return bool(self._store._active_flags[self._row])
+
+    @active.setter
+    def active(self, value: bool) -> None:
+        """Set the product active status."""
+        store = self._store
+        was_active = bool(store._active_flags[self._row])
+        store._active_flags[self._row] = bool(value)
+        if was_active != bool(value):
+            store._product_changed(self, "active", was_active, bool(value))
+
+    @property
+    def promotion(self) -> Optional[Promotion]:
+        """Get the current promotion applied to the product."""
+        promotion_id = self._store._promotion_ids[self._row]
+        return None if promotion_id == NO_PROMOTION else self._store._promotions[promotion_id]
+
+    @promotion.setter
+    def promotion(self, value: Optional[Promotion]) -> None:
+        """
+        Set a promotion for the product.
+        
+        Args:
+            value: The promotion to apply or None to remove.
+        """
+        store = self._store
+        old_promotion = self.promotion
+        store._promotion_ids[self._row] = store._promotion_id(value)
+        store._product_changed(self, "promotion", old_promotion, value)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Check if another view is of the same row of the same store.
+        
+        Args:
+            other: The object to compare with.
+            
+        Returns:
+            True if both view the same row, False otherwise.
+        """
+        if isinstance(other, _RowView):
+            return self._store is other._store and self._row == other._row
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """Hash views of the same row alike."""
+        return hash((id(self._store), self._row))
+
+
+class ProductView(_RowView, Product):
+    """
+    View of a regular product stored in a ColumnarStore.
+    """
+    __slots__ = ('_store', '_row')
+
+
+class NonStockedProductView(_RowView, NonStockedProduct):
+    """
+    View of a non-stocked product stored in a ColumnarStore.
+    """
+    __slots__ = ('_store', '_row')
+
+
+class LimitedProductView(_RowView, LimitedProduct):
+    """
+    View of a limited product stored in a ColumnarStore.
+    """
+    __slots__ = ('_store', '_row')
+
+    @property
+    def maximum(self) -> int:
+        """Get the maximum purchase quantity per order."""
+        return self._store._maxima[self._row]
+
+
+# View class for each value of the product type column
+_VIEW_TYPES = {
+    KIND_PRODUCT: ProductView,
+    KIND_NON_STOCKED: NonStockedProductView,
+    KIND_LIMITED: LimitedProductView
+}
@@ -0,0 +1,174 @@
+import threading
+from collections import deque
+from typing import Callable, Deque, List, NamedTuple, Optional, Tuple, Union
+
+
+class OrderPlaced(NamedTuple):
+    """
+    An order was committed.
+    """
+    lines: Tuple[Tuple[str, int], ...]  # (product name, quantity) pairs
+    total: float
+
+
+class StockChanged(NamedTuple):
+    """
+    The quantity of a product changed.
+    """
+    name: str
+    old_quantity: int
+    new_quantity: int
+
+
+class ProductDeactivated(NamedTuple):
+    """
+    A product stopped being active, e.g. because it sold out.
+    """
+    name: str
+
+
+class PriceChanged(NamedTuple):
+    """
+    The price of a product changed.
+    """
+    name: str
+    old_price: float
+    new_price: float
+
+
+Event = Union[OrderPlaced, StockChanged, ProductDeactivated, PriceChanged]
+
+
+class EventBus:
+    """
+    Bounded, non-blocking event bus with batched delivery.
+    
+    Publishing only appends to a ring buffer, so it costs the same however
+    many subscribers there are and however slow they are. A background
+    thread takes events off the buffer in batches and hands each batch to
+    every subscriber. When subscribers fall so far behind that the buffer is
+    full, the oldest events are dropped and counted.
+    """
+    def __init__(self, capacity: int = 65536, batch_size: int = 1024):
+        """
+        Create an event bus; its thread starts with the first subscriber.
+        
+        Args:
+            capacity: The most events held waiting for delivery.
+            batch_size: The most events handed to subscribers at once.
+        """
+        self._buffer: Deque[Event] = deque(maxlen=capacity)
+        self._batch_size = batch_size
+        self._subscribers: List[Callable[[List[Event]], None]] = []
+        self._published = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._condition = threading.Condition()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def dropped(self) -> int:
+        """Get the number of events dropped because the buffer was full."""
+        return self._dropped
+
+    def subscribe(self, callback: Callable[[List[Event]], None]) -> None:
+        """
+        Receive every published event from now on, in batches.
+        
+        Exceptions raised by the callback are ignored.
+        
+        Args:
+            callback: Function called with each batch of events.
+            
+        Raises:
+            Exception: If the bus is closed.
+        """
+        if self._closed:
+            raise Exception("The event bus is closed")
+        self._subscribers = self._subscribers + [callback]
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="store-events", daemon=True)
+            self._thread.start()
+
+    def unsubscribe(self, callback: Callable[[List[Event]], None]) -> None:
+        """
+        Stop delivering events to a subscriber.
+        
+        Args:
+            callback: A function passed to subscribe().
+        """
+        self._subscribers = [subscriber for subscriber in self._subscribers if subscriber != callback]
+
+    def publish(self, event: Event) -> None:
+        """
+        Queue an event for delivery without waiting for subscribers.
+        
+        Events published after close() are discarded.
+        
+        Args:
+            event: The event to publish.
+        """
+        if self._closed:
+            return
+        buffer = self._buffer
+        if len(buffer) == buffer.maxlen:
+            self._dropped += 1
+        buffer.append(event)
+        self._published += 1
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every event published so far has been delivered.
+        
+        Args:
+            timeout: The most seconds to wait, or None to wait for as long as it takes.
+            
+        Returns:
+            True if everything was delivered, False on timeout.
+        """
+        if self._thread is None or self._closed:
+            # close() already delivered everything published before it
+            return not self._buffer
+        
+        target = self._published
+        with self._condition:
+            return self._condition.wait_for(lambda: self._delivered + self._dropped >= target, timeout)
+
+    def close(self) -> None:
+        """Deliver the remaining events and stop the delivery thread; later events are discarded."""
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        """Deliver events in batches until the bus is closed."""
+        buffer, popleft = self._buffer, self._buffer.popleft
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            
+            while buffer:
+                batch = []
+                try:
+                    for _ in range(self._batch_size):
+                        batch.append(popleft())
+                except IndexError:
+                    pass
+                
+                for subscriber in self._subscribers:
+                    try:
+                        subscriber(batch)
+                    except Exception:
+                        pass
+                
+                with self._condition:
+                    self._delivered += len(batch)
+                    self._condition.notify_all()
+            
+            if self._closed:
+                return
@@ -0,0 +1,329 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+from columnar_store import ColumnarStore
+from product import NonStockedProduct
+from snapshot import load_snapshot, save_snapshot, snapshot_generation
+from store import Store
+
+# magic, generation of the snapshot the journal follows
+JOURNAL_HEADER = struct.Struct("<8sQ")
+MAGIC = b"BBJRNL01"
+
+# checksum of the body, body size
+RECORD_HEADER = struct.Struct("<II")
+LINE_COUNT = struct.Struct("<H")
+NAME_SIZE = struct.Struct("<H")
+QUANTITY = struct.Struct("<q")
+
+
+class OrderJournal:
+    """
+    Append-only journal of committed orders, written ahead of stock changes.
+    
+    Each order is one checksummed record of (product name, quantity) lines.
+    Records are made durable with group commit: the file is synced once
+    every group_size orders rather than after each one, or once the oldest
+    unsynced order has waited sync_window seconds, whichever comes first.
+    A background thread keeps that time limit when no more orders arrive.
+    Until then, up to group_size - 1 of the most recent orders, placed
+    within the last sync_window seconds, can be lost in a crash.
+    
+    The journal starts with the generation of the snapshot it follows, so
+    recovery never replays orders a newer snapshot already contains.
+    """
+    def __init__(self, path: str, group_size: int = 1, generation: int = 0, sync_window: float = 0.01):
+        """
+        Open a journal for appending.
+        
+        Args:
+            path: The journal file, created if it does not exist.
+            group_size: Number of orders to collect before each sync.
+            generation: Generation of the snapshot a new journal follows.
+                An existing journal keeps the generation it was created with.
+            sync_window: The most seconds an order waits to be synced when
+                fewer than group_size orders arrive.
+        """
+        self._path = path
+        self._group_size = group_size
+        self._sync_window = sync_window
+        self._file: BinaryIO = open(path, "ab")
+        self._unsynced = 0
+        self._first_unsynced_at = 0.0  # When the oldest unsynced order was written
+        self._lock = threading.Lock()
+        self._unsynced_written = threading.Condition(self._lock)
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+        
+        if self._file.tell() == 0:
+            self._generation = generation
+            self._reset(generation)
+        else:
+            self._generation = _read_header(path)
+            # Cut off a record torn by a crash, or orders appended after it would never be read
+            valid_size = _valid_size(path)
+            if valid_size < self._file.tell():
+                self._file.truncate(valid_size)
+                self._sync()
+        
+        if group_size > 1:
+            self._flusher = threading.Thread(target=self._flush_late_orders, name="journal-sync", daemon=True)
+            self._flusher.start()
+
+    @property
+    def generation(self) -> int:
+        """Get the generation of the snapshot this journal follows."""
+        return self._generation
+
+    @property
+    def sync_window(self) -> float:
+        """Get the most seconds an order waits to be synced."""
+        return self._sync_window
+
+    @property
+    def path(self) -> str:
+        """Get the path of the journal file."""
+        return self._path
+
+    def append(self, lines: List[Tuple[str, int]]) -> None:
+        """
+        Write one order to the journal.
+        
+        Args:
+            lines: The (product name, quantity) pairs taken out of stock.
+        """
+        body = bytearray(LINE_COUNT.pack(len(lines)))
+        for name, quantity in lines:
+            encoded = name.encode("utf-8")
+            body += NAME_SIZE.pack(len(encoded))
+            body += encoded
+            body += QUANTITY.pack(quantity)
+        
+        with self._lock:
+            self._file.write(RECORD_HEADER.pack(zlib.crc32(body), len(body)))
+            self._file.write(body)
+            self._unsynced += 1
+            if self._unsynced == 1:
+                self._first_unsynced_at = time.monotonic()
+                self._unsynced_written.notify()
+            
+            if (self._unsynced >= self._group_size
+                    or time.monotonic() - self._first_unsynced_at >= self._sync_window):
+                self._sync()
+
+    def sync(self) -> None:
+        """Make every order written so far durable."""
+        with self._lock:
+            if self._unsynced:
+                self._sync()
+
+    def reset(self, generation: int) -> None:
+        """
+        Drop every order from the journal after a new snapshot was saved.
+        
+        Args:
+            generation: Generation of the new snapshot.
+        """
+        with self._lock:
+            self._reset(generation)
+
+    def _reset(self, generation: int) -> None:
+        """Empty the file and write a fresh header; the caller holds the lock."""
+        self._file.truncate(0)
+        self._file.write(JOURNAL_HEADER.pack(MAGIC, generation))
+        self._generation = generation
+        self._sync()
+
+    def close(self) -> None:
+        """Sync and close the journal."""
+        with self._lock:
+            self._closed = True
+            self._unsynced_written.notify()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.sync()
+        self._file.close()
+
+    def _flush_late_orders(self) -> None:
+        """Sync orders that have waited sync_window seconds, until the journal is closed."""
+        with self._lock:
+            while not self._closed:
+                if not self._unsynced:
+                    self._unsynced_written.wait()
+                    continue
+                
+                remaining = self._first_unsynced_at + self._sync_window - time.monotonic()
+                if remaining > 0:
+                    self._unsynced_written.wait(remaining)
+                else:
+                    self._sync()
+
+    def _sync(self) -> None:
+        """Flush and fsync the file; the caller holds the lock."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def __enter__(self) -> 'OrderJournal':
+        """Use the journal as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the journal when leaving the with block."""
+        self.close()
+
+
+def read_journal(path: str) -> Iterator[List[Tuple[str, int]]]:
+    """
+    Read the orders recorded in a journal.
+    
+    Reading stops at the first incomplete or corrupt record, which is what
+    a crash in the middle of a write leaves behind.
+    
+    Args:
+        path: The journal file.
+        
+    Returns:
+        An iterator over the (product name, quantity) lines of each order.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    
+    for body, _ in _records(data):
+        lines = []
+        (count,), offset = LINE_COUNT.unpack_from(body), LINE_COUNT.size
+        for _ in range(count):
+            (name_size,) = NAME_SIZE.unpack_from(body, offset)
+            offset += NAME_SIZE.size
+            name = body[offset:offset + name_size].decode("utf-8")
+            offset += name_size
+            (quantity,) = QUANTITY.unpack_from(body, offset)
+            offset += QUANTITY.size
+            lines.append((name, quantity))
+        yield lines
+
+
+def _records(data: bytes) -> Iterator[Tuple[bytes, int]]:
+    """
+    Split journal contents into record bodies, up to the first incomplete or corrupt record.
+    
+    Args:
+        data: The whole journal file.
+        
+    Returns:
+        An iterator over (body, offset just past the record) pairs.
+    """
+    position = JOURNAL_HEADER.size
+    while position + RECORD_HEADER.size <= len(data):
+        checksum, size = RECORD_HEADER.unpack_from(data, position)
+        body = data[position + RECORD_HEADER.size:position + RECORD_HEADER.size + size]
+        if len(body) < size or zlib.crc32(body) != checksum:
+            return
+        position += RECORD_HEADER.size + size
+        yield body, position
+
+
+def _valid_size(path: str) -> int:
+    """
+    Get the size of a journal without any torn or corrupt records at its end.
+    
+    Args:
+        path: The journal file.
+        
+    Returns:
+        The offset just past the last valid record.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    end = JOURNAL_HEADER.size
+    for _, end in _records(data):
+        pass
+    return end
+
+
+def _read_header(path: str) -> int:
+    """
+    Read the generation recorded at the start of a journal.
+    
+    Args:
+        path: The journal file.
+        
+    Returns:
+        The generation of the snapshot the journal follows.
+        
+    Raises:
+        Exception: If the file is not a journal.
+    """
+    with open(path, "rb") as file:
+        header = file.read(JOURNAL_HEADER.size)
+    if len(header) < JOURNAL_HEADER.size or header[:len(MAGIC)] != MAGIC:
+        raise Exception(f"'{path}' is not an order journal")
+    return JOURNAL_HEADER.unpack(header)[1]
+
+
+def replay(store: Store, path: str) -> int:
+    """
+    Apply the orders recorded in a journal to a store's stock.
+    
+    Orders are applied as recorded, without validation or pricing: they
+    were already checked when they were first placed.
+    
+    Args:
+        store: The store to bring up to date; it must not journal to path.
+        path: The journal file.
+        
+    Returns:
+        The number of orders applied.
+    """
+    applied = 0
+    for lines in read_journal(path):
+        for name, quantity in lines:
+            product = store.get_product(name)
+            if product is not None and not isinstance(product, NonStockedProduct):
+                product.quantity = product.quantity - quantity
+        applied += 1
+    return applied
+
+
+def recover(snapshot_path: str, journal_path: str) -> ColumnarStore:
+    """
+    Rebuild a store from its last snapshot and the journal written since.
+    
+    A journal left over from before the snapshot is ignored: its orders are
+    already part of the snapshot.
+    
+    Args:
+        snapshot_path: The snapshot file.
+        journal_path: The journal file; a missing journal means no orders.
+        
+    Returns:
+        The recovered store.
+    """
+    store = load_snapshot(snapshot_path)
+    if os.path.exists(journal_path) and _read_header(journal_path) == snapshot_generation(snapshot_path):
+        replay(store, journal_path)
+    return store
+
+
+def checkpoint(store: Store, snapshot_path: str, journal: OrderJournal) -> None:
+    """
+    Save a snapshot of a store and empty its journal.
+    
+    The snapshot is written to a temporary file and renamed into place
+    under the next generation, so after a crash at any point recover()
+    sees either the old snapshot and its journal or the new snapshot.
+    No orders may be placed while the checkpoint runs.
+    
+    Args:
+        store: The store to save.
+        snapshot_path: The snapshot file to replace.
+        journal: The store's journal.
+    """
+    generation = journal.generation + 1
+    temporary_path = snapshot_path + ".tmp"
+    save_snapshot(store, temporary_path, generation)
+    os.replace(temporary_path, snapshot_path)
+    journal.reset(generation)
@@ -13,6 +13,8 @@ from product import Product, NonStockedProduct, LimitedProduct
 from store import Store
 import promotions
 
+PAGE_SIZE = 20  # Products listed before asking whether to show more
+
 
 def setup_store() -> Store:
     """
@@ -110,22 +112,32 @@ def print_menu(menu: Dict[int, Tuple[Callable[[], Any], str]]) -> None:
         print(f"{key}. {label}")
 
 
-def list_products(store: Store) -> None:
+def list_products(store: Store) -> List[Product]:
     """
-    List all available products in the given store.
+    List the available products in the given store, a page at a time.
     
     Args:
         store: The store instance to list products from.
+        
+    Returns:
+        The products listed, numbered from 1 in this order.
     """
-    products = store.get_all_products()
-    if not products:
-        print("No active products in store!")
-        return
+    shown: List[Product] = []
+    for page, cursor in store.iter_products(page_size=PAGE_SIZE):
+        if not shown:
+            print("------")
+        for product in page:
+            shown.append(product)
+            print(f"{len(shown)}. {product.show()}")
         
+        if cursor is None or input("Press Enter to see more products, or any other key to stop: "):
+            break
+    
+    if not shown:
+        print("No active products in store!")
+        return shown
     print("------")
-    for i, product in enumerate(products, start=1):
-        print(f"{i}. {product.show()}")
-    print("------")
+    return shown
 
 
 def print_store_amount(store: Store) -> None:
@@ -148,8 +160,8 @@ def make_order(store: Store) -> None:
     """
     shopping_list: List[Tuple[Product, int]] = []
     
-    # Display available products
-    list_products(store)
+    # Display available products; shoppers pick from those listed
+    products = list_products(store)
     print("When you want to finish order, enter empty text.")
 
     while True:
@@ -167,7 +179,6 @@ def make_order(store: Store) -> None:
                 break
                 
             # Get the product and add to shopping list
-            products = store.get_all_products()
             index = int(product_key) - 1
             
             if not 0 <= index < len(products):
@@ -0,0 +1,290 @@
+import functools
+import json
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional, Tuple
+from product import Product
+from promotions import Promotion
+from store import Store
+
+SUB_BUCKETS = 16  # Buckets per power of two, so each bucket is at most 1/16 wide
+BUCKET_COUNT = (64 - 3) * SUB_BUCKETS  # Enough for any 64-bit value
+QUANTILES = (0.5, 0.9, 0.99)
+
+# (class, method, metric name prefix) for everything instrument() wraps
+TARGETS = (
+    (Store, "order", "store_order"),
+    (Store, "_resolve", "store_lookup"),
+    (Store, "_validate", "store_validation"),
+    (Store, "_line_total", "store_pricing"),
+    (Store, "_commit", "store_commit"),
+    (Product, "buy", "product_buy"),
+    (Promotion, "apply_promotion", "promotion_apply"),
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """
+    Latency histogram with fixed memory and bounded relative error.
+    
+    Values are counted in log-linear buckets in the style of HdrHistogram:
+    each power of two is split into SUB_BUCKETS equal buckets, so any
+    recorded value is known to within about 6% however large it is.
+    """
+    __slots__ = ('_counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        """Create an empty histogram."""
+        self._counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """
+        Count one value.
+        
+        Args:
+            value: A non-negative integer, e.g. a duration in nanoseconds.
+        """
+        if value < SUB_BUCKETS * 2:
+            index = value
+        else:
+            shift = value.bit_length() - 5
+            index = (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+        self._counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, quantile: float) -> int:
+        """
+        Estimate the value below which a share of the recorded values fall.
+        
+        Args:
+            quantile: The share, between 0 and 1.
+            
+        Returns:
+            The upper bound of the bucket holding that value, or 0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0
+        
+        rank = max(1, quantile * self.count)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(_bucket_upper_bound(index), self.max)
+        return self.max
+
+    def reset(self) -> None:
+        """Forget every recorded value."""
+        self._counts = [0] * BUCKET_COUNT
+        self.count = self.total = self.max = 0
+
+
+class Metrics:
+    """
+    Registry of named counters and latency histograms.
+    """
+    def __init__(self):
+        """Create an empty registry."""
+        self.counters: Dict[Tuple[str, Labels], int] = {}
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+
+    def increment(self, name: str, amount: int = 1, **labels: str) -> None:
+        """
+        Add to a counter, creating it at zero first if needed.
+        
+        Args:
+            name: The counter name.
+            amount: How much to add.
+            **labels: Label values that tell counters of the same name apart.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        """
+        Get a histogram, creating it if needed.
+        
+        Args:
+            name: The histogram name.
+            **labels: Label values that tell histograms of the same name apart.
+            
+        Returns:
+            The histogram.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        return histogram
+
+    def reset(self) -> None:
+        """Zero every counter and histogram."""
+        for key in self.counters:
+            self.counters[key] = 0
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def to_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        
+        Histograms are exported as summaries with durations in seconds.
+        
+        Returns:
+            The metrics as text.
+        """
+        lines = []
+        for name in sorted({name for name, _ in self.counters}):
+            lines.append(f"# TYPE {name} counter")
+            for (key_name, labels), value in sorted(self.counters.items()):
+                if key_name == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+        
+        for name in sorted({name for name, _ in self.histograms}):
+            lines.append(f"# TYPE {name} summary")
+            for (key_name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                if key_name != name:
+                    continue
+                for quantile in QUANTILES:
+                    value = histogram.percentile(quantile) / 1e9
+                    lines.append(f"{name}{_format_labels(labels + (('quantile', str(quantile)),))} {value:.9f}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total / 1e9:.9f}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> str:
+        """
+        Render the metrics as JSON, with durations in seconds.
+        
+        Returns:
+            A JSON object with a "counters" list and a "histograms" list.
+        """
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(self.counters.items())
+        ]
+        histograms = [
+            {
+                "name": name,
+                "labels": dict(labels),
+                "count": histogram.count,
+                "sum": histogram.total / 1e9,
+                "max": histogram.max / 1e9,
+                **{f"p{round(quantile * 100)}": histogram.percentile(quantile) / 1e9 for quantile in QUANTILES},
+            }
+            for (name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0])
+        ]
+        return json.dumps({"counters": counters, "histograms": histograms})
+
+
+# Methods replaced by instrument(): (class, method name, original class attribute)
+_originals: List[Tuple[type, str, object]] = []
+
+
+def instrument(metrics: Optional[Metrics] = None) -> Metrics:
+    """
+    Start timing the order phases, Product.buy and every promotion.
+    
+    The methods listed in TARGETS are replaced on their classes, and on
+    every subclass that overrides them, by wrappers that record a latency
+    histogram "<prefix>_seconds" and an error counter
+    "<prefix>_errors_total", labelled with the class name. Until this is
+    called nothing is wrapped, so metrics cost nothing at all.
+    
+    Times are inclusive: the commit phase includes pricing, and a
+    subclass's buy() includes the base class buy() it calls.
+    
+    Args:
+        metrics: The registry to record into, or None for a new one.
+        
+    Returns:
+        The registry being recorded into.
+        
+    Raises:
+        Exception: If instrumentation is already enabled.
+    """
+    if _originals:
+        raise Exception("Instrumentation is already enabled")
+    
+    metrics = metrics if metrics is not None else Metrics()
+    for base, attribute, prefix in TARGETS:
+        for cls in [base] + _subclasses(base):
+            original = cls.__dict__.get(attribute)
+            if original is None or getattr(original, "__isabstractmethod__", False):
+                continue
+            
+            if isinstance(original, staticmethod):
+                wrapped = staticmethod(_timed(original.__func__, metrics, prefix, cls.__name__))
+            else:
+                wrapped = _timed(original, metrics, prefix, cls.__name__)
+            setattr(cls, attribute, wrapped)
+            _originals.append((cls, attribute, original))
+    return metrics
+
+
+def uninstrument() -> None:
+    """Put back every method replaced by instrument()."""
+    while _originals:
+        cls, attribute, original = _originals.pop()
+        setattr(cls, attribute, original)
+
+
+def _timed(function: Callable, metrics: Metrics, prefix: str, class_name: str) -> Callable:
+    """
+    Wrap a function so every call is timed and every exception counted.
+    
+    Args:
+        function: The function to wrap.
+        metrics: The registry to record into.
+        prefix: The metric name prefix.
+        class_name: The value of the "class" label.
+        
+    Returns:
+        The wrapper.
+    """
+    record = metrics.histogram(f"{prefix}_seconds", **{"class": class_name}).record
+    error_name = f"{prefix}_errors_total"
+    labels = {"class": class_name}
+    
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        except Exception:
+            metrics.increment(error_name, **labels)
+            raise
+        finally:
+            record(perf_counter_ns() - start)
+    return wrapper
+
+
+def _subclasses(cls: type) -> List[type]:
+    """Get every subclass of a class, however indirect."""
+    found = []
+    for subclass in cls.__subclasses__():
+        found.append(subclass)
+        found.extend(_subclasses(subclass))
+    return found
+
+
+def _bucket_upper_bound(index: int) -> int:
+    """Get the largest value counted in a histogram bucket."""
+    if index < SUB_BUCKETS * 2:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return ((index % SUB_BUCKETS + SUB_BUCKETS + 1) << shift) - 1
+
+
+def _format_labels(labels: Labels) -> str:
+    """Render labels as a Prometheus label set."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
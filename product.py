@@ -1,11 +1,19 @@
-from typing import Optional, Union
+import weakref
+from typing import TYPE_CHECKING, Optional, Tuple, Union
 from promotions import Promotion
 
+# Avoid circular imports
+if TYPE_CHECKING:
+    from store import Store
+
 
 class Product:
     """
     Base Product class for store inventory items.
     """
+    __slots__ = ('name', '_price', '_quantity', '_active', '_promotion', '_stores', '_rendered')
+    _is_view = False  # True for views over another store's data, which only that store can hold
+
     def __init__(self, name: str, price: float, quantity: int):
         """
         Initialize a product with name, price, and quantity.
@@ -29,6 +37,69 @@ class Product:
         self._quantity = quantity
         self._active = self._quantity > 0
         self._promotion: Optional[Promotion] = None
+        self._stores: Tuple['weakref.ref[Store]', ...] = ()  # Stores to tell about changes
+        self._rendered: Optional[str] = None  # Cached __str__, cleared by the property setters
+
+    def __getstate__(self) -> dict:
+        """
+        Get the product's state for pickling, leaving out the stores holding it.
+        
+        Returns:
+            Map from attribute name to value.
+        """
+        state = dict(getattr(self, '__dict__', {}))  # Subclasses may add attributes without slots
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                if slot != '_stores' and hasattr(self, slot):
+                    state[slot] = getattr(self, slot)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore a pickled product, held by no store.
+        
+        Args:
+            state: The state returned by __getstate__().
+        """
+        self._stores = ()
+        self._rendered = None
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def _attach(self, store: 'Store') -> None:
+        """
+        Register a store to be told when this product changes.
+        
+        References to stores that no longer exist are dropped on the way,
+        so short-lived stores (such as the results of +) do not pile up.
+        
+        Args:
+            store: The store holding this product.
+        """
+        self._stores = tuple(ref for ref in self._stores if ref() is not None) + (weakref.ref(store),)
+
+    def _detach(self, store: 'Store') -> None:
+        """
+        Stop telling a store about changes to this product.
+        
+        Args:
+            store: The store that no longer holds this product.
+        """
+        self._stores = tuple(ref for ref in self._stores if ref() not in (store, None))
+
+    def _notify(self, attribute: str, old_value, new_value) -> None:
+        """
+        Tell every store holding this product that an attribute changed.
+        
+        Args:
+            attribute: The name of the property that changed.
+            old_value: The value before the change.
+            new_value: The value after the change.
+        """
+        for ref in self._stores:
+            store = ref()
+            if store is not None:
+                store._product_changed(self, attribute, old_value, new_value)
 
     @property
     def price(self) -> float:
@@ -48,7 +119,12 @@ class Product:
         """
         if value < 0:
             raise Exception("Product price cannot be negative!")
+        old_price = self._price
         self._price = value
+        self._rendered = None
+        
+        if self._stores:
+            self._notify("price", old_price, value)
 
     @property
     def quantity(self) -> int:
@@ -63,8 +139,15 @@ class Product:
         Args:
             value: The new quantity.
         """
+        old_quantity, was_active = self._quantity, self._active
         self._quantity = value
         self._active = value > 0
+        self._rendered = None
+        
+        if self._stores:
+            self._notify("quantity", old_quantity, value)
+            if was_active != self._active:
+                self._notify("active", was_active, self._active)
 
     @property
     def active(self) -> bool:
@@ -74,7 +157,12 @@ class Product:
     @active.setter
     def active(self, value: bool) -> None:
         """Set the product active status."""
+        was_active = self._active
         self._active = value
+        self._rendered = None
+        
+        if self._stores and was_active != value:
+            self._notify("active", was_active, value)
 
     @property
     def promotion(self) -> Optional[Promotion]:
@@ -89,7 +177,12 @@ class Product:
         Args:
             value: The promotion to apply or None to remove.
         """
+        old_promotion = self._promotion
         self._promotion = value
+        self._rendered = None
+        
+        if self._stores:
+            self._notify("promotion", old_promotion, value)
         
     # Keep is_active method for backward compatibility
     def is_active(self) -> bool:
@@ -133,6 +226,21 @@ class Product:
         """
         Get a string representation of the product.
         
+        The string is built once and reused until the price, quantity,
+        active status or promotion is set again.
+        
+        Returns:
+            A formatted string with product details.
+        """
+        rendered = self._rendered
+        if rendered is None:
+            rendered = self._rendered = self._render()
+        return rendered
+
+    def _render(self) -> str:
+        """
+        Build the string representation of the product.
+        
         Returns:
             A formatted string with product details.
         """
@@ -178,6 +286,8 @@ class NonStockedProduct(Product):
     """
     Product type for non-physical items that don't have stock quantities.
     """
+    __slots__ = ()
+
     def __init__(self, name: str, price: float):
         """
         Initialize a non-stocked product.
@@ -208,9 +318,9 @@ class NonStockedProduct(Product):
         
         return self.price * quantity
 
-    def __str__(self) -> str:
+    def _render(self) -> str:
         """
-        Get a string representation of the non-stocked product.
+        Build the string representation of the non-stocked product.
         
         Returns:
             A formatted string with product details.
@@ -233,6 +343,8 @@ class LimitedProduct(Product):
     """
     Product type with a maximum purchase limit per order.
     """
+    __slots__ = ('_maximum',)
+
     def __init__(self, name: str, price: float, quantity: int, maximum: int):
         """
         Initialize a limited product with a maximum purchase quantity.
@@ -276,9 +388,9 @@ class LimitedProduct(Product):
         
         return super().buy(quantity)
 
-    def __str__(self) -> str:
+    def _render(self) -> str:
         """
-        Get a string representation of the limited product.
+        Build the string representation of the limited product.
         
         Returns:
             A formatted string with product details.
@@ -1,5 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Sequence
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; batch pricing falls back to plain Python
+    numpy = None
 
 # Avoid circular imports
 if TYPE_CHECKING:
@@ -11,6 +16,8 @@ class Promotion(ABC):
     Abstract base class for all promotions.
     Defines the interface for applying promotions to products.
     """
+    __slots__ = ('name',)
+
     def __init__(self, name: str):
         """
         Initialize a promotion with a name.
@@ -34,12 +41,30 @@ class Promotion(ABC):
         """
         pass
 
+    def apply_promotion_batch(self, products: Sequence['Product'], quantities: Sequence[int]) -> List[float]:
+        """
+        Apply the promotion to many product purchases at once.
+        
+        Subclasses override this with array arithmetic. The results must be
+        exactly what apply_promotion() returns for each pair.
+        
+        Args:
+            products: The products being purchased.
+            quantities: The quantity being purchased of each product.
+            
+        Returns:
+            The total price of each purchase after applying the promotion.
+        """
+        return [self.apply_promotion(product, quantity) for product, quantity in zip(products, quantities)]
+
 
 class PercentDiscount(Promotion):
     """
     A promotion that applies a percentage discount to the product price.
     Example: 20% off the regular price.
     """
+    __slots__ = ('percent',)
+
     def __init__(self, name: str, percent: float):
         """
         Initialize a percentage discount promotion.
@@ -73,12 +98,35 @@ class PercentDiscount(Promotion):
         discount_multiplier = 1 - (self.percent / 100)
         return product.price * quantity * discount_multiplier
 
+    def apply_promotion_batch(self, products: Sequence['Product'], quantities: Sequence[int]) -> List[float]:
+        """
+        Apply a percentage discount to many product purchases at once.
+        
+        Args:
+            products: The products being purchased.
+            quantities: The quantity being purchased of each product.
+            
+        Returns:
+            The discounted total price of each purchase.
+        """
+        discount_multiplier = 1 - (self.percent / 100)
+        if numpy is None:
+            return [
+                product.price * quantity * discount_multiplier if quantity > 0 else 0.0
+                for product, quantity in zip(products, quantities)
+            ]
+        
+        prices, counts = _as_arrays(products, quantities)
+        return numpy.where(counts > 0, prices * counts * discount_multiplier, 0.0).tolist()
+
 
 class SecondHalfPrice(Promotion):
     """
     A promotion where every second item is half price.
     Example: Buy one at full price, get the second at half price.
     """
+    __slots__ = ()
+
     def apply_promotion(self, product: 'Product', quantity: int) -> float:
         """
         Apply a "second item half price" promotion to the product purchase.
@@ -100,12 +148,36 @@ class SecondHalfPrice(Promotion):
         total_price = (full_price_count * product.price) + (half_price_count * product.price * 0.5)
         return total_price
 
+    def apply_promotion_batch(self, products: Sequence['Product'], quantities: Sequence[int]) -> List[float]:
+        """
+        Apply a "second item half price" promotion to many product purchases at once.
+        
+        Args:
+            products: The products being purchased.
+            quantities: The quantity being purchased of each product.
+            
+        Returns:
+            The discounted total price of each purchase.
+        """
+        if numpy is None:
+            return [
+                ((quantity + 1) // 2 * product.price) + (quantity // 2 * product.price * 0.5)
+                if quantity > 0 else 0.0
+                for product, quantity in zip(products, quantities)
+            ]
+        
+        prices, counts = _as_arrays(products, quantities)
+        totals = ((counts + 1) // 2 * prices) + (counts // 2 * prices * 0.5)
+        return numpy.where(counts > 0, totals, 0.0).tolist()
+
 
 class ThirdOneFree(Promotion):
     """
     A promotion where every third item is free (Buy 2, Get 1 Free).
     Example: Buy two items, get the third one free.
     """
+    __slots__ = ()
+
     def apply_promotion(self, product: 'Product', quantity: int) -> float:
         """
         Apply a "buy 2, get 1 free" promotion to the product purchase.
@@ -127,3 +199,38 @@ class ThirdOneFree(Promotion):
         paid_items = quantity - free_items
         
         return paid_items * product.price
+
+    def apply_promotion_batch(self, products: Sequence['Product'], quantities: Sequence[int]) -> List[float]:
+        """
+        Apply a "buy 2, get 1 free" promotion to many product purchases at once.
+        
+        Args:
+            products: The products being purchased.
+            quantities: The quantity being purchased of each product.
+            
+        Returns:
+            The discounted total price of each purchase.
+        """
+        if numpy is None:
+            return [
+                (quantity - quantity // 3) * product.price if quantity > 0 else 0.0
+                for product, quantity in zip(products, quantities)
+            ]
+        
+        prices, counts = _as_arrays(products, quantities)
+        return numpy.where(counts > 0, (counts - counts // 3) * prices, 0.0).tolist()
+
+
+def _as_arrays(products: Sequence['Product'], quantities: Sequence[int]):
+    """
+    Gather product prices and quantities into NumPy arrays.
+    
+    Args:
+        products: The products being purchased.
+        quantities: The quantity being purchased of each product.
+        
+    Returns:
+        A (prices, quantities) pair of float64 and int64 arrays.
+    """
+    prices = numpy.fromiter((product.price for product in products), dtype=numpy.float64, count=len(products))
+    return prices, numpy.asarray(quantities, dtype=numpy.int64)
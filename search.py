@@ -0,0 +1,160 @@
+import math
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Get the case-insensitive three-letter pieces of a text.
+    
+    The text is padded with '$' so its first and last letters weigh as
+    much as the ones in the middle.
+    
+    Args:
+        text: The text to split.
+        
+    Returns:
+        The distinct trigrams.
+    """
+    padded = f"${text.casefold()}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Search index over product names, for prefix and typo-tolerant lookups.
+    
+    Prefix search bisects a sorted array of case-folded names. Fuzzy search
+    uses an inverted index from trigram to the names containing it, stored
+    as compact arrays of name ids. Removed names leave dead ids behind in
+    the trigram arrays; the arrays are rebuilt once half the ids are dead.
+    """
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        Create an index.
+        
+        Args:
+            names: The initial names.
+        """
+        self._keys: List[Tuple[str, str]] = []  # Sorted (case-folded name, name) pairs
+        self._ids: Dict[str, int] = {}  # Map from name to name id
+        self._names: List[Optional[str]] = []  # Map from name id to name, None once removed
+        self._postings: Dict[str, array] = {}  # Map from trigram to the ids of names containing it
+        
+        for name in names:
+            if name not in self._ids:
+                self._keys.append((name.casefold(), name))
+                self._add_postings(name)
+        self._keys.sort()
+
+    def __contains__(self, name: str) -> bool:
+        """Check if a name is in the index."""
+        return name in self._ids
+
+    def __len__(self) -> int:
+        """Get the number of names in the index."""
+        return len(self._ids)
+
+    def add(self, name: str) -> None:
+        """
+        Add a name; adding a name already in the index does nothing.
+        
+        Args:
+            name: The name to add.
+        """
+        if name not in self._ids:
+            insort(self._keys, (name.casefold(), name))
+            self._add_postings(name)
+
+    def discard(self, name: str) -> None:
+        """
+        Remove a name if it is in the index.
+        
+        Args:
+            name: The name to remove.
+        """
+        name_id = self._ids.pop(name, None)
+        if name_id is None:
+            return
+        
+        del self._keys[bisect_left(self._keys, (name.casefold(), name))]
+        self._names[name_id] = None
+        if len(self._names) > 2 * len(self._ids):
+            self._rebuild_postings()
+
+    def prefix(self, prefix: str) -> Iterator[str]:
+        """
+        Get the names starting with a prefix, ignoring case, in alphabetical order.
+        
+        Args:
+            prefix: The start of the names to find.
+            
+        Yields:
+            The matching names.
+        """
+        folded = prefix.casefold()
+        keys = self._keys
+        for position in range(bisect_left(keys, (folded,)), len(keys)):
+            key, name = keys[position]
+            if not key.startswith(folded):
+                return
+            yield name
+
+    def fuzzy(self, query: str, min_similarity: float = 0.5) -> List[Tuple[float, str]]:
+        """
+        Find names resembling a query despite typos, best match first.
+        
+        A name's similarity is the share of the query's trigrams it
+        contains; ties are broken by how little else the name contains.
+        Only the query's rarest trigrams are used to find candidates: a
+        name missing all of them cannot reach min_similarity anyway. The
+        common trigrams are then looked up in each candidate directly.
+        
+        Args:
+            query: The text to look for.
+            min_similarity: The lowest similarity to report, between 0 and 1.
+            
+        Returns:
+            (similarity, name) pairs.
+        """
+        wanted = trigrams(query)
+        needed = max(1, math.ceil(min_similarity * len(wanted)))
+        by_rarity = sorted(wanted, key=lambda trigram: len(self._postings.get(trigram, ())))
+        rare, common = by_rarity[:len(wanted) - needed + 1], by_rarity[len(wanted) - needed + 1:]
+        
+        # Count the rare trigrams through their postings, then look for the common ones in each candidate
+        counts = Counter(chain.from_iterable(self._postings.get(trigram, ()) for trigram in rare))
+        scored = []
+        for name_id, hits in counts.items():
+            name = self._names[name_id]
+            if name is None or hits + len(common) < needed:
+                continue
+            
+            padded = f"${name.casefold()}$"
+            hits += sum(1 for trigram in common if trigram in padded)
+            if hits >= needed:
+                scored.append((hits / len(wanted), hits / (len(wanted) + len(padded) - 2 - hits), name))
+        
+        scored.sort(key=lambda match: (-match[0], -match[1], match[2]))
+        return [(similarity, name) for similarity, _, name in scored]
+
+    def _add_postings(self, name: str) -> None:
+        """Give a name an id and list it under each of its trigrams."""
+        name_id = self._ids[name] = len(self._names)
+        self._names.append(name)
+        postings = self._postings
+        for trigram in trigrams(name):
+            posting = postings.get(trigram)
+            if posting is None:
+                posting = postings[trigram] = array('i')
+            posting.append(name_id)
+
+    def _rebuild_postings(self) -> None:
+        """Renumber the live names and rebuild the trigram arrays without dead ids."""
+        names = [name for name in self._names if name is not None]
+        self._ids, self._names, self._postings = {}, [], {}
+        for name in names:
+            self._add_postings(name)
@@ -0,0 +1,343 @@
+import math
+import threading
+import zlib
+from contextlib import ExitStack
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import ForkingPickler
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from product import Product
+from store import Store
+
+# Prepared stock is held until phase two decides; expiring it could commit an order on some shards only
+PREPARE_TTL = math.inf
+
+
+class ProductRef(NamedTuple):
+    """
+    Stand-in for a product in a shopping list sent to a shard; orders only
+    need the name.
+    """
+    name: str
+
+
+class ShardedStore:
+    """
+    Store whose catalog is split across worker processes by product name.
+    
+    Each worker holds an ordinary Store with its share of the products, so
+    orders on different shards use different cores. An order whose products
+    all live on one shard is simply placed there. An order spanning shards
+    uses two-phase commit: every shard first reserves its lines with
+    Store.reserve(), and the reservations are committed only if all shards
+    succeeded, so the order is still all-or-nothing.
+    
+    Products returned by the store are copies; change products through the
+    store's own methods.
+    """
+    def __init__(self, products: Optional[List[Product]] = None, shards: int = 2):
+        """
+        Start the shard processes and distribute the products.
+        
+        Args:
+            products: List of products to initialize the store with.
+            shards: Number of worker processes.
+        """
+        self._connections: List[Connection] = []
+        self._processes: List[Process] = []
+        self._locks: List[threading.Lock] = []
+        
+        for _ in range(shards):
+            connection, worker_connection = Pipe()
+            process = Process(target=_serve, args=(worker_connection,), daemon=True)
+            process.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+            self._locks.append(threading.Lock())
+        
+        if products:
+            self.add_products(products)
+
+    def add_product(self, product: Product) -> None:
+        """
+        Add a product to the shard it belongs to.
+        
+        Args:
+            product: The product to add.
+            
+        Raises:
+            Exception: If a product with the same name is already in the store.
+        """
+        self.add_products([product])
+
+    def add_products(self, products: Iterable[Product]) -> None:
+        """
+        Add many products, each to the shard it belongs to.
+        
+        Args:
+            products: The products to add.
+            
+        Raises:
+            Exception: If a product with the same name is already in the store.
+                Shards that accepted their share keep it.
+        """
+        by_shard: Dict[int, List[Product]] = {}
+        for product in products:
+            by_shard.setdefault(self._shard_of(product.name), []).append(product)
+        self._call_all({shard: ("add", shard_products) for shard, shard_products in by_shard.items()})
+
+    def remove_product(self, product_name: str) -> None:
+        """
+        Remove a product from the store by name.
+        
+        Args:
+            product_name: The name of the product to remove.
+        """
+        self._call(self._shard_of(product_name), ("remove", product_name))
+
+    def get_product(self, product_name: str) -> Optional[Product]:
+        """
+        Look up a product in the store by name.
+        
+        Args:
+            product_name: The name of the product to look up.
+            
+        Returns:
+            A copy of the product, or None if there is none.
+        """
+        return self._call(self._shard_of(product_name), ("get", product_name))
+
+    def get_total_quantity(self) -> int:
+        """
+        Get the total quantity of all products in the store.
+        
+        Returns:
+            The sum of all product quantities.
+        """
+        return sum(self._call_all({shard: ("total",) for shard in range(self.shards)}).values())
+
+    def get_all_products(self) -> List[Product]:
+        """
+        Get all active products in the store, shard by shard.
+        
+        Returns:
+            List of copies of the active products.
+        """
+        results = self._call_all({shard: ("active",) for shard in range(self.shards)})
+        return [product for shard in range(self.shards) for product in results[shard]]
+
+    def order(self, shopping_list: List[Tuple[Product, int]]) -> float:
+        """
+        Process an order for products.
+        
+        Args:
+            shopping_list: List of tuples containing (product, quantity).
+            
+        Returns:
+            The total price of the order.
+            
+        Raises:
+            Exception: If there's an issue with purchasing any product.
+        """
+        by_shard: Dict[int, List[Tuple[ProductRef, int]]] = {}
+        for product, quantity in shopping_list:
+            by_shard.setdefault(self._shard_of(product.name), []).append((ProductRef(product.name), quantity))
+        
+        if len(by_shard) == 1:
+            (shard, lines), = by_shard.items()
+            return self._call(shard, ("order", lines))
+        
+        # Phase one: every shard reserves its lines or reports why it cannot
+        with self._holding(by_shard):
+            self._send_all({shard: ("prepare", lines) for shard, lines in by_shard.items()})
+            replies = {shard: self._connections[shard].recv() for shard in by_shard}
+            
+            failures = [result for status, result in replies.values() if status == "error"]
+            decision = "abort" if failures else "commit"
+            
+            # Phase two: commit everywhere, or release whatever was reserved
+            prepared = {shard: handle for shard, (status, handle) in replies.items() if status == "ok"}
+            self._send_all({shard: (decision, handle) for shard, handle in prepared.items()})
+            outcomes = [self._connections[shard].recv() for shard in prepared]
+        
+        if failures:
+            raise failures[0]
+        for status, result in outcomes:
+            if status == "error":
+                raise result
+        return sum(total for _, total in outcomes)
+
+    def __contains__(self, product: Product) -> bool:
+        """
+        Check if a product exists in the store.
+        
+        Args:
+            product: The product to check.
+            
+        Returns:
+            True if product exists in store, False otherwise.
+        """
+        return self._call(self._shard_of(product.name), ("contains", product.name))
+
+    def __iter__(self) -> Iterator[Product]:
+        """
+        Create an iterator over copies of all products, shard by shard.
+        
+        Returns:
+            An iterator over the products in the store.
+        """
+        results = self._call_all({shard: ("all",) for shard in range(self.shards)})
+        return (product for shard in range(self.shards) for product in results[shard])
+
+    @property
+    def shards(self) -> int:
+        """Get the number of shards."""
+        return len(self._connections)
+
+    def close(self) -> None:
+        """Stop the shard processes."""
+        for shard, connection in enumerate(self._connections):
+            with self._locks[shard]:
+                connection.send(("close",))
+                connection.close()
+        for process in self._processes:
+            process.join()
+
+    def __enter__(self) -> 'ShardedStore':
+        """Use the store as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop the shard processes when leaving the with block."""
+        self.close()
+
+    def _shard_of(self, product_name: str) -> int:
+        """
+        Get the shard a product belongs to.
+        
+        Args:
+            product_name: The name of the product.
+            
+        Returns:
+            The shard index.
+        """
+        return zlib.crc32(product_name.encode("utf-8")) % len(self._connections)
+
+    def _holding(self, shards: Iterable[int]) -> ExitStack:
+        """
+        Hold the connections of several shards, locked in shard order.
+        
+        Args:
+            shards: The shards to hold.
+            
+        Returns:
+            A context manager holding the locks.
+        """
+        stack = ExitStack()
+        for shard in sorted(shards):
+            stack.enter_context(self._locks[shard])
+        return stack
+
+    def _call(self, shard: int, message: tuple):
+        """
+        Send a request to one shard and wait for its answer.
+        
+        Args:
+            shard: The shard to ask.
+            message: The request.
+            
+        Returns:
+            The shard's result.
+            
+        Raises:
+            Exception: The exception raised in the shard, if any.
+        """
+        return self._call_all({shard: message})[shard]
+
+    def _call_all(self, messages: Dict[int, tuple]) -> Dict[int, object]:
+        """
+        Send requests to several shards at once and wait for all answers.
+        
+        Args:
+            messages: Map from shard to its request.
+            
+        Returns:
+            Map from shard to its result.
+            
+        Raises:
+            Exception: The first exception raised in a shard, if any.
+        """
+        with self._holding(messages):
+            self._send_all(messages)
+            replies = {shard: self._connections[shard].recv() for shard in messages}
+        
+        for status, result in replies.values():
+            if status == "error":
+                raise result
+        return {shard: result for shard, (_, result) in replies.items()}
+
+
+    def _send_all(self, messages: Dict[int, tuple]) -> None:
+        """
+        Send requests to several shards; the caller holds their locks.
+        
+        Every request is pickled before any is sent, so a request that
+        cannot be pickled fails the call without leaving other shards with
+        answers nobody reads.
+        
+        Args:
+            messages: Map from shard to its request.
+        """
+        payloads = {shard: ForkingPickler.dumps(message) for shard, message in messages.items()}
+        for shard, payload in payloads.items():
+            self._connections[shard].send_bytes(payload)
+
+
+def _serve(connection: Connection) -> None:
+    """
+    Run one shard: answer requests on a connection until told to close.
+    
+    Args:
+        connection: The worker's end of the pipe to the ShardedStore.
+    """
+    store = Store()
+    
+    while True:
+        message = connection.recv()
+        command = message[0]
+        if command == "close":
+            connection.close()
+            return
+        
+        try:
+            if command == "add":
+                store.add_products(message[1])
+                result = None
+            elif command == "remove":
+                store.remove_product(message[1])
+                result = None
+            elif command == "get":
+                result = store.get_product(message[1])
+            elif command == "contains":
+                result = ProductRef(message[1]) in store
+            elif command == "total":
+                result = store.get_total_quantity()
+            elif command == "active":
+                result = store.get_all_products()
+            elif command == "all":
+                result = list(store)
+            elif command == "order":
+                result = store.order(message[1])
+            elif command == "prepare":
+                result = store.reserve(message[1], ttl=PREPARE_TTL)
+            elif command == "commit":
+                result = store.commit(message[1])
+            elif command == "abort":
+                result = store.release(message[1])
+            else:
+                raise Exception(f"Unknown shard command '{command}'")
+        except Exception as error:
+            connection.send(("error", error))
+        else:
+            connection.send(("ok", result))
@@ -0,0 +1,272 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, Iterator, List, Optional, Union
+from columnar_store import ColumnarStore, KIND_PRODUCT, KIND_NON_STOCKED, KIND_LIMITED, NO_PROMOTION
+from product import NonStockedProduct, LimitedProduct
+from promotions import Promotion
+import promotions as promotion_types
+from store import Store
+
+MAGIC = b"BBSNAP01"
+
+# magic, generation, product count, total quantity, promotion table bytes, name table bytes
+HEADER = struct.Struct("<8sQQqQQ")
+
+
+class StringTable:
+    """
+    List-like table of product names read lazily from a snapshot.
+    
+    Names stay encoded in the snapshot until they are read. Removing a row
+    (setting it to None) and appending names are kept in memory on the side.
+    """
+    __slots__ = ('_offsets', '_blob', '_count', '_removed', '_appended')
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        """
+        Create a table over an offsets column and a UTF-8 blob.
+        
+        Args:
+            offsets: Start of each name in the blob, plus the end of the last one.
+            blob: The encoded names, back to back.
+        """
+        self._offsets = offsets
+        self._blob = blob
+        self._count = len(offsets) - 1
+        self._removed: set = set()
+        self._appended: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        """Get the number of rows, removed ones included."""
+        return self._count + len(self._appended)
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        """
+        Get the name of a row.
+        
+        Args:
+            row: The row to read.
+            
+        Returns:
+            The product name, or None if the row was removed.
+        """
+        if row >= self._count:
+            return self._appended[row - self._count]
+        if row in self._removed:
+            return None
+        return str(self._blob[self._offsets[row]:self._offsets[row + 1]], "utf-8")
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        """
+        Iterate over all names in row order, decoding the blob in one go.
+        
+        Returns:
+            An iterator over the names, None for removed rows.
+        """
+        raw, offsets, removed = bytes(self._blob), self._offsets.tolist(), self._removed
+        for row in range(self._count):
+            yield None if row in removed else raw[offsets[row]:offsets[row + 1]].decode("utf-8")
+        yield from self._appended
+
+    def __setitem__(self, row: int, value: Optional[str]) -> None:
+        """
+        Remove a row; names in the snapshot cannot be changed otherwise.
+        
+        Args:
+            row: The row to change.
+            value: Must be None.
+        """
+        if row >= self._count:
+            self._appended[row - self._count] = value
+        elif value is None:
+            self._removed.add(row)
+        else:
+            raise Exception("Product names in a snapshot cannot be changed")
+
+    def append(self, name: str) -> None:
+        """
+        Add a name for a new row.
+        
+        Args:
+            name: The product name.
+        """
+        self._appended.append(name)
+
+
+def save_snapshot(store: Store, path: str, generation: int = 0) -> None:
+    """
+    Write the inventory of a store to a snapshot file.
+    
+    Stock held by open reservations is saved as still in stock: committing
+    a reservation journals it, so only then is it taken out on recovery.
+    
+    The file holds a header, the promotion table as JSON, the name string
+    table and one fixed-width column per product attribute, each aligned
+    to 8 bytes.
+    
+    Args:
+        store: The store to save.
+        path: The file to write.
+        generation: Number identifying the snapshot, matched against the
+            order journal written after it.
+        
+    Raises:
+        Exception: If a promotion cannot be saved.
+    """
+    promotions: List[Promotion] = []
+    promotion_ids: Dict[int, int] = {}
+    
+    offsets, names = array('q', [0]), bytearray()
+    prices, quantities, maxima = array('d'), array('q'), array('q')
+    promotion_column, active_flags, kinds = array('i'), array('b'), array('b')
+    
+    reserved = store._reserved_quantities()
+    for product in store:
+        names += product.name.encode("utf-8")
+        offsets.append(len(names))
+        prices.append(product.price)
+        quantities.append(product.quantity + reserved.get(product.name, 0))
+        active_flags.append(bool(product.active) or product.name in reserved)
+        
+        if isinstance(product, NonStockedProduct):
+            kinds.append(KIND_NON_STOCKED)
+            maxima.append(0)
+        elif isinstance(product, LimitedProduct):
+            kinds.append(KIND_LIMITED)
+            maxima.append(product.maximum)
+        else:
+            kinds.append(KIND_PRODUCT)
+            maxima.append(0)
+        
+        promotion = product.promotion
+        if promotion is None:
+            promotion_column.append(NO_PROMOTION)
+        else:
+            if id(promotion) not in promotion_ids:
+                promotion_ids[id(promotion)] = len(promotions)
+                promotions.append(promotion)
+            promotion_column.append(promotion_ids[id(promotion)])
+    
+    promotion_table = json.dumps([_promotion_to_dict(promotion) for promotion in promotions]).encode("utf-8")
+    header = HEADER.pack(MAGIC, generation, len(prices), sum(quantities), len(promotion_table), len(names))
+    
+    with open(path, "wb") as file:
+        for block in (header, promotion_table, offsets, names, prices, quantities, maxima,
+                      promotion_column, active_flags, kinds):
+            file.write(block)
+            file.write(bytes(-len(memoryview(block).cast('B')) % 8))
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def snapshot_generation(path: str) -> int:
+    """
+    Read the generation a snapshot was saved with.
+    
+    Args:
+        path: The snapshot file.
+        
+    Returns:
+        The generation number.
+        
+    Raises:
+        Exception: If the file is not a snapshot.
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER.size)
+    if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+        raise Exception(f"'{path}' is not a store snapshot")
+    return HEADER.unpack(header)[1]
+
+
+def load_snapshot(path: str) -> ColumnarStore:
+    """
+    Open a snapshot file as a store, without reading the inventory up front.
+    
+    The file is memory-mapped copy-on-write: columns are used in place,
+    names are decoded when read, and orders change the mapped pages in
+    memory only, never the file.
+    
+    Args:
+        path: The snapshot file to open.
+        
+    Returns:
+        A columnar store over the snapshot.
+        
+    Raises:
+        Exception: If the file is not a snapshot.
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    
+    data = memoryview(mapped)
+    magic, _, count, total_quantity, promotions_size, names_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise Exception(f"'{path}' is not a store snapshot")
+    
+    position = HEADER.size
+    
+    def block(size: int) -> memoryview:
+        nonlocal position
+        start, position = position, position + size + (-size % 8)
+        return data[start:start + size]
+    
+    promotion_table = json.loads(str(block(promotions_size), "utf-8"))
+    offsets = block((count + 1) * 8).cast('q')
+    names = StringTable(offsets, block(names_size))
+    
+    return ColumnarStore.from_columns(
+        names=names,
+        prices=block(count * 8).cast('d'),
+        quantities=block(count * 8).cast('q'),
+        maxima=block(count * 8).cast('q'),
+        promotion_ids=block(count * 4).cast('i'),
+        active_flags=block(count).cast('b'),
+        kinds=block(count).cast('b'),
+        promotions=[_promotion_from_dict(fields) for fields in promotion_table],
+        total_quantity=total_quantity
+    )
+
+
+def _promotion_to_dict(promotion: Promotion) -> Dict[str, Union[str, float]]:
+    """
+    Describe a promotion by its type and slot values.
+    
+    Args:
+        promotion: The promotion to describe.
+        
+    Returns:
+        A JSON-compatible dictionary.
+        
+    Raises:
+        Exception: If the promotion is not one of the built-in types.
+    """
+    promotion_type = type(promotion)
+    if getattr(promotion_types, promotion_type.__name__, None) is not promotion_type:
+        raise Exception(f"Cannot save promotion of type {promotion_type.__name__}")
+    
+    fields: Dict[str, Union[str, float]] = {"type": promotion_type.__name__}
+    for cls in promotion_type.__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            fields[slot] = getattr(promotion, slot)
+    return fields
+
+
+def _promotion_from_dict(fields: Dict[str, Union[str, float]]) -> Promotion:
+    """
+    Recreate a promotion described by _promotion_to_dict().
+    
+    Args:
+        fields: The promotion description.
+        
+    Returns:
+        The promotion.
+    """
+    promotion = object.__new__(getattr(promotion_types, fields["type"]))
+    for slot, value in fields.items():
+        if slot != "type":
+            setattr(promotion, slot, value)
+    return promotion
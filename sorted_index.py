@@ -0,0 +1,180 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+BLOCK_SIZE = 512  # Entries per block when the index is built; blocks split at twice this
+
+
+class SortedIndex:
+    """
+    Product names kept sorted by a numeric key, such as price or quantity.
+    
+    Entries are kept in a list of short sorted blocks, each with its largest
+    entry noted. Adding, moving or removing an entry bisects to its block
+    and only shifts the entries of that block, so updates stay cheap on
+    catalogs of millions of products. Range queries bisect to the first
+    block they need and take O(log n + k) for k results.
+    """
+    __slots__ = ('_blocks', '_key_blocks', '_maxes', '_key_of')
+
+    def __init__(self, entries: Iterable[Tuple[float, str]] = ()):
+        """
+        Create an index.
+        
+        Args:
+            entries: Initial (key, name) pairs, in any order.
+        """
+        ordered = sorted(entries)  # Ties are broken by name
+        self._blocks: List[List[Tuple[float, str]]] = [
+            ordered[start:start + BLOCK_SIZE] for start in range(0, len(ordered), BLOCK_SIZE)
+        ]
+        self._key_blocks: List[List[float]] = [[key for key, _ in block] for block in self._blocks]
+        self._maxes: List[Tuple[float, str]] = [block[-1] for block in self._blocks]
+        self._key_of: Dict[str, float] = {name: key for key, name in ordered}
+
+    def __contains__(self, name: str) -> bool:
+        """Check if a name is in the index."""
+        return name in self._key_of
+
+    def __len__(self) -> int:
+        """Get the number of names in the index."""
+        return len(self._key_of)
+
+    def add(self, name: str, key: float) -> None:
+        """
+        Add a name, or move it if it is already in the index.
+        
+        Args:
+            name: The name to add.
+            key: The key to sort it by.
+        """
+        if name in self._key_of:
+            self.discard(name)
+        self._key_of[name] = key
+        
+        entry = (key, name)
+        if not self._blocks:
+            self._blocks.append([entry])
+            self._key_blocks.append([key])
+            self._maxes.append(entry)
+            return
+        
+        number = min(bisect_left(self._maxes, entry), len(self._blocks) - 1)
+        block, keys = self._blocks[number], self._key_blocks[number]
+        position = bisect_left(block, entry)
+        block.insert(position, entry)
+        keys.insert(position, key)
+        self._maxes[number] = block[-1]
+        
+        if len(block) > 2 * BLOCK_SIZE:
+            self._blocks[number:number + 1] = [block[:BLOCK_SIZE], block[BLOCK_SIZE:]]
+            self._key_blocks[number:number + 1] = [keys[:BLOCK_SIZE], keys[BLOCK_SIZE:]]
+            self._maxes[number:number + 1] = [block[BLOCK_SIZE - 1], block[-1]]
+
+    def discard(self, name: str) -> None:
+        """
+        Remove a name if it is in the index.
+        
+        Args:
+            name: The name to remove.
+        """
+        key = self._key_of.pop(name, None)
+        if key is None:
+            return
+        
+        entry = (key, name)
+        number = bisect_left(self._maxes, entry)
+        block, keys = self._blocks[number], self._key_blocks[number]
+        position = bisect_left(block, entry)
+        del block[position]
+        del keys[position]
+        
+        if block:
+            self._maxes[number] = block[-1]
+        else:
+            del self._blocks[number]
+            del self._key_blocks[number]
+            del self._maxes[number]
+
+    def between(self, low: float, high: float) -> List[str]:
+        """
+        Get the names whose keys are in a range, lowest key first.
+        
+        Args:
+            low: The lowest key to include.
+            high: The highest key to include.
+        
+        Returns:
+            The names in key order.
+        """
+        names: List[str] = []
+        for block, keys in self._from_key(low):
+            start, stop = bisect_left(keys, low), bisect_right(keys, high)
+            names.extend(name for _, name in block[start:stop])
+            if stop < len(block):
+                break
+        return names
+
+    def below(self, limit: float) -> List[str]:
+        """
+        Get the names whose keys are less than a limit, lowest key first.
+        
+        Args:
+            limit: The smallest key to leave out.
+        
+        Returns:
+            The names in key order.
+        """
+        names: List[str] = []
+        for block, keys in zip(self._blocks, self._key_blocks):
+            stop = bisect_left(keys, limit)
+            names.extend(name for _, name in block[:stop])
+            if stop < len(block):
+                break
+        return names
+
+    def first(self, count: int) -> List[str]:
+        """
+        Get the names with the lowest keys, lowest first.
+        
+        Args:
+            count: The most names to return.
+        
+        Returns:
+            The names in key order.
+        """
+        names: List[str] = []
+        for block in self._blocks:
+            if len(names) >= count:
+                break
+            names.extend(name for _, name in block[:count - len(names)])
+        return names
+
+    def last(self, count: int) -> List[str]:
+        """
+        Get the names with the highest keys, highest first.
+        
+        Args:
+            count: The most names to return.
+        
+        Returns:
+            The names in descending key order.
+        """
+        names: List[str] = []
+        for block in reversed(self._blocks):
+            if len(names) >= count:
+                break
+            names.extend(name for _, name in reversed(block[-(count - len(names)):]))
+        return names
+
+    def _from_key(self, key: float) -> Iterator[Tuple[List[Tuple[float, str]], List[float]]]:
+        """
+        Walk the blocks from the first one that can hold a key.
+        
+        Args:
+            key: The key to start from.
+        
+        Returns:
+            An iterator over (entries, keys) pairs of blocks, in key order.
+        """
+        for number in range(bisect_left(self._maxes, (key,)), len(self._blocks)):
+            yield self._blocks[number], self._key_blocks[number]
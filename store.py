@@ -1,19 +1,81 @@
-from typing import List, Tuple, Optional, Iterator
+import copy
+import heapq
+import itertools
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import ExitStack, nullcontext
+from typing import TYPE_CHECKING, Callable, ContextManager, Dict, Iterable, List, NamedTuple, Sequence, TextIO, Tuple, Optional, Iterator
 from product import Product, NonStockedProduct, LimitedProduct
+from promotions import Promotion
+from search import NameIndex
+from sorted_index import SortedIndex
+from events import EventBus, OrderPlaced, PriceChanged, ProductDeactivated, StockChanged, Event
+
+# Avoid circular imports
+if TYPE_CHECKING:
+    from journal import OrderJournal
+
+# (store product, tracks stock, per-order maximum or None)
+OrderEntry = Tuple[Product, bool, Optional[int]]
+
+# What merge() does when both stores have a product with the same name
+MERGE_POLICIES = ("keep_left", "keep_right", "sum_quantities", "min_price")
+
+QUOTE_CACHE_SIZE = 16  # Line totals remembered per product; the least recently quoted go first
+
+
+class QuoteLine(NamedTuple):
+    """
+    One line of a price quote.
+    """
+    name: str
+    quantity: int
+    unit_price: float
+    promotion: Optional[str]  # Name of the promotion applied, if any
+    total: float
 
 
 class Store:
     """
     Store class for managing products and processing orders.
     """
-    def __init__(self, products: Optional[List[Product]] = None):
+    def __init__(self, products: Optional[List[Product]] = None, thread_safe: bool = False):
         """
         Initialize the store with a list of products.
         
         Args:
             products: List of products to initialize the store with.
+            thread_safe: Whether orders may be placed from several threads at once.
+                Each product then gets its own lock, so orders on different
+                products still run side by side.
         """
-        self._products: List[Product] = [] if products is None else products
+        self._thread_safe = thread_safe
+        self._locks: Dict[str, threading.Lock] = {}  # Per-product locks in thread-safe mode
+        # Guards the catalog and the running aggregates in thread-safe mode
+        self._state_lock: ContextManager = threading.Lock() if thread_safe else nullcontext()
+        self._slots: List[Optional[Product]] = []  # Products in catalog order, None where one was removed
+        self._positions: Dict[str, int] = {}  # Map from product name to its slot
+        self._slot_numbers = array('q')  # Ever-increasing number of each slot, kept through compaction
+        self._slots_appended = 0
+        self._tombstones = 0  # Number of None slots
+        self._index: Dict[str, Product] = {}  # Map from product name to store product
+        self._total_quantity = 0  # Running sum of all product quantities
+        self._active_products: Optional[Dict[str, Product]] = {}  # By name, in catalog order; None when it must be rebuilt
+        self._quote_cache: Dict[str, Dict[int, float]] = {}  # Map from product name to {quantity: line total}
+        self._journal: Optional['OrderJournal'] = None
+        self._events: Optional[EventBus] = None  # Created by the first subscribe()
+        # Active products by price, and active stocked products by quantity; built on first query
+        self._price_index: Optional[SortedIndex] = None
+        self._quantity_index: Optional[SortedIndex] = None
+        self._name_index: Optional[NameIndex] = None  # Search index over all names; built on first search
+        self._reservations: Dict[int, Tuple[float, List[Tuple[str, int]], List[Tuple[Product, int]]]] = {}
+        self._expiry_heap: List[Tuple[float, int]] = []  # (expiry time, reservation handle)
+        self._reservation_handles = itertools.count(1)
+        
+        self.add_products(products or [])
 
     def add_product(self, product: Product) -> None:
         """
@@ -21,8 +83,73 @@ class Store:
         
         Args:
             product: The product to add.
+            
+        Raises:
+            Exception: If a product with the same name is already in the store.
+        """
+        self.add_products([product])
+
+    def add_products(self, products: Iterable[Product]) -> None:
+        """
+        Add many products to the store at once.
+        
+        Either all products are added or, if any name is already taken or
+        appears twice, none are. Views of a columnar store's rows are added
+        as standalone copies.
+        
+        Args:
+            products: The products to add.
+            
+        Raises:
+            Exception: If a product with the same name is already in the store.
         """
-        self._products.append(product)
+        products = [self._holdable(product) for product in products]
+        with self._state_lock:
+            new_names = set()
+            for product in products:
+                if product.name in new_names or product in self:
+                    raise Exception(f"Product '{product.name}' already exists in store inventory")
+                new_names.add(product.name)
+            
+            for product in products:
+                self._insert(product)
+
+    def _holdable(self, product: Product) -> Product:
+        """
+        Get the product to hold in place of one about to be added.
+        
+        Args:
+            product: The product about to be added.
+            
+        Returns:
+            The product itself, or a standalone copy if it is a view of a
+            columnar store's row, which only that store can hold.
+        """
+        return copy.copy(product) if product._is_view else product
+
+    def _insert(self, product: Product) -> None:
+        """
+        Add a product whose name is known to be new; the caller holds the state lock.
+        
+        Args:
+            product: The product to add.
+        """
+        self._positions[product.name] = len(self._slots)
+        self._slots.append(product)
+        self._slot_numbers.append(self._slots_appended)
+        self._slots_appended += 1
+        self._index[product.name] = product
+        if self._thread_safe:
+            self._locks[product.name] = threading.Lock()
+        
+        self._total_quantity += product.quantity
+        if product.active and self._active_products is not None:
+            self._active_products[product.name] = product
+        self._index_product(product)
+        if self._name_index is not None:
+            self._name_index.add(product.name)
+        
+        product._attach(self)
 
     def remove_product(self, product_name: str) -> None:
         """
@@ -31,7 +158,292 @@ class Store:
         Args:
             product_name: The name of the product to remove.
         """
-        self._products = [product for product in self._products if product.name != product_name]
+        self.remove_products([product_name])
+
+    def remove_products(self, product_names: Iterable[str]) -> None:
+        """
+        Remove many products from the store at once.
+        
+        Each removal leaves a tombstone in the catalog instead of shifting
+        the products after it; the catalog is compacted once tombstones make
+        up half of it. Names not in the store are ignored.
+        
+        Args:
+            product_names: The names of the products to remove.
+        """
+        removed = []
+        with self._state_lock:
+            for product_name in product_names:
+                product = self._index.pop(product_name, None)
+                if product is None:
+                    continue
+                
+                self._slots[self._positions.pop(product_name)] = None
+                self._locks.pop(product_name, None)
+                self._total_quantity -= product.quantity
+                if self._active_products is not None:
+                    self._active_products.pop(product_name, None)
+                self._quote_cache.pop(product_name, None)
+                self._unindex_product(product_name)
+                if self._name_index is not None:
+                    self._name_index.discard(product_name)
+                removed.append(product)
+            
+            self._tombstones += len(removed)
+            if self._tombstones > len(self._slots) // 2:
+                self._compact()
+        
+        for product in removed:
+            product._detach(self)
+
+    @property
+    def _products(self) -> List[Product]:
+        """Get the products in catalog order, compacting away tombstones first."""
+        if self._tombstones:
+            with self._state_lock:
+                self._compact()
+        return self._slots
+
+    def _compact(self) -> None:
+        """Drop the tombstones from the catalog; the caller holds the state lock."""
+        # Fresh lists, so iterators over the old ones are not disturbed
+        live = [slot for slot, product in enumerate(self._slots) if product is not None]
+        self._slot_numbers = array('q', [self._slot_numbers[slot] for slot in live])
+        self._slots = [self._slots[slot] for slot in live]
+        self._positions = {product.name: slot for slot, product in enumerate(self._slots)}
+        self._tombstones = 0
+
+    def merge(self, other: 'Store', policy: str = "keep_left") -> None:
+        """
+        Add another store's products to this store in place.
+        
+        Products whose names are new are appended in the other store's
+        order. For names both stores have, the policy decides:
+        
+        - "keep_left": keep this store's product.
+        - "keep_right": put the other store's product in its place.
+        - "sum_quantities": add the other product's quantity to ours
+          (non-stocked products are left alone).
+        - "min_price": lower our price to the other product's if it is cheaper.
+        
+        Our products are updated in place, so any other store holding them
+        sees the change too. The merge takes time linear in the size of the
+        other store.
+        
+        Args:
+            other: The store whose products to merge in.
+            policy: One of MERGE_POLICIES.
+            
+        Raises:
+            Exception: If the policy is unknown.
+        """
+        self._check_merge_policy(policy)
+        
+        added, replaced = [], []
+        for product in other:
+            current = self.get_product(product.name)
+            if current is None:
+                added.append(product)
+            elif current is product or policy == "keep_left":
+                continue
+            elif policy == "keep_right":
+                replaced.append((current, self._holdable(product)))
+            else:
+                self._combine(current, product, policy)
+        
+        if replaced:
+            self._replace_products(replaced)
+        self.add_products(added)
+
+    @classmethod
+    def merge_all(cls, stores: Iterable['Store'], policy: str = "keep_left") -> 'Store':
+        """
+        Merge any number of stores into a new store in a single pass.
+        
+        The result is what merging each store in turn into an empty store
+        would give, with "keep_left" meaning the earliest store wins and
+        "keep_right" the latest. Products are shared with the input stores,
+        except where "sum_quantities" or "min_price" changed one: those are
+        copies, so the input stores are never modified.
+        
+        Args:
+            stores: The stores to merge, in order.
+            policy: One of MERGE_POLICIES.
+            
+        Returns:
+            A new store with the products of all the stores.
+            
+        Raises:
+            Exception: If the policy is unknown.
+        """
+        cls._check_merge_policy(policy)
+        
+        chosen: Dict[str, Product] = {}
+        copied = set()  # Names whose chosen product is our own copy
+        for store in stores:
+            for product in store:
+                name = product.name
+                current = chosen.get(name)
+                if current is None:
+                    chosen[name] = product
+                elif policy == "keep_right":
+                    chosen[name] = product
+                    copied.discard(name)
+                elif policy != "keep_left" and current is not product:
+                    if name not in copied:
+                        current = chosen[name] = copy.copy(current)
+                        copied.add(name)
+                    cls._combine(current, product, policy)
+        
+        return cls(list(chosen.values()))
+
+    @staticmethod
+    def _check_merge_policy(policy: str) -> None:
+        """
+        Reject unknown merge policies.
+        
+        Args:
+            policy: The policy to check.
+            
+        Raises:
+            Exception: If the policy is not one of MERGE_POLICIES.
+        """
+        if policy not in MERGE_POLICIES:
+            raise Exception(f"Unknown merge policy '{policy}', expected one of {', '.join(MERGE_POLICIES)}")
+
+    @staticmethod
+    def _combine(current: Product, product: Product, policy: str) -> None:
+        """
+        Fold a same-named product into the one being kept.
+        
+        Args:
+            current: The product being kept; updated in place.
+            product: The product being merged into it.
+            policy: "sum_quantities" or "min_price".
+        """
+        if policy == "sum_quantities":
+            if not isinstance(current, NonStockedProduct) and not isinstance(product, NonStockedProduct):
+                current.quantity = current.quantity + product.quantity
+        elif product.price < current.price:
+            current.price = product.price
+
+    def _replace_products(self, replacements: List[Tuple[Product, Product]]) -> None:
+        """
+        Put products in the place of the same-named products we hold.
+        
+        Args:
+            replacements: (our product, its replacement) pairs.
+        """
+        with self._state_lock:
+            for old, new in replacements:
+                self._slots[self._positions[new.name]] = new
+                self._index[new.name] = new
+                self._total_quantity += new.quantity - old.quantity
+                self._quote_cache.pop(new.name, None)
+                self._unindex_product(old.name)
+                self._index_product(new)
+            self._active_products = None  # Rebuilt in catalog order on next use
+        
+        for old, new in replacements:
+            old._detach(self)
+            new._attach(self)
+
+    def set_journal(self, journal: Optional['OrderJournal']) -> None:
+        """
+        Record every committed order in a journal before stock is taken.
+        
+        Args:
+            journal: The journal to write to, or None to stop journaling.
+        """
+        self._journal = journal
+
+    @property
+    def events(self) -> Optional[EventBus]:
+        """Get the event bus, or None if nobody ever subscribed."""
+        return self._events
+
+    def subscribe(self, callback: Callable[[List[Event]], None]) -> None:
+        """
+        Receive the store's events (orders, stock, price and activation changes).
+        
+        Events are delivered in batches on a background thread, so a slow
+        subscriber never holds up an order. Until the first subscriber
+        arrives no events are created at all.
+        
+        Args:
+            callback: Function called with each batch of events.
+            
+        Raises:
+            Exception: If the store's event bus was closed.
+        """
+        with self._state_lock:
+            if self._events is None:
+                self._events = EventBus()
+        self._events.subscribe(callback)
+
+    def close(self) -> None:
+        """
+        Deliver the events published so far and stop the event thread.
+        
+        The store keeps working, but its event bus discards later events
+        and refuses new subscribers. A journal set with set_journal()
+        belongs to the caller and is left open.
+        """
+        events = self._events
+        if events is not None:
+            events.close()
+
+    def get_product(self, product_name: str) -> Optional[Product]:
+        """
+        Look up a product in the store by name.
+        
+        Args:
+            product_name: The name of the product to look up.
+            
+        Returns:
+            The store product with that name, or None if there is none.
+        """
+        return self._index.get(product_name)
+
+    def _product_changed(self, product: Product, attribute: str, old_value, new_value) -> None:
+        """
+        Keep the running aggregates in step with a change to one of our products.
+        
+        Called by the product's property setters.
+        
+        Args:
+            product: The product that changed.
+            attribute: The name of the property that changed.
+            old_value: The value before the change.
+            new_value: The value after the change.
+        """
+        with self._state_lock:
+            if attribute == "quantity":
+                self._total_quantity += new_value - old_value
+                if self._quantity_index is not None and product.name in self._quantity_index:
+                    self._quantity_index.add(product.name, new_value)
+            elif attribute in ("price", "promotion"):
+                self._quote_cache.pop(product.name, None)
+                if attribute == "price" and self._price_index is not None and product.name in self._price_index:
+                    self._price_index.add(product.name, new_value)
+            elif attribute == "active":
+                if new_value:
+                    # Reactivated products must go back in catalog order, so rebuild lazily
+                    self._active_products = None
+                    self._index_product(product)
+                else:
+                    if self._active_products is not None:
+                        self._active_products.pop(product.name, None)
+                    self._unindex_product(product.name)
+        
+        events = self._events
+        if events is not None:
+            if attribute == "quantity":
+                events.publish(StockChanged(product.name, old_value, new_value))
+            elif attribute == "price":
+                events.publish(PriceChanged(product.name, old_value, new_value))
+            elif attribute == "active" and not new_value:
+                events.publish(ProductDeactivated(product.name))
 
     def get_total_quantity(self) -> int:
         """
@@ -40,7 +452,7 @@ class Store:
         Returns:
             The sum of all product quantities.
         """
-        return sum(product.quantity for product in self._products)
+        return self._total_quantity
 
     def get_all_products(self) -> List[Product]:
         """
@@ -49,7 +461,220 @@ class Store:
         Returns:
             List of active products.
         """
-        return [product for product in self._products if product.active]
+        with self._state_lock:
+            if self._active_products is None:
+                self._active_products = {
+                    product.name: product for product in self._slots if product is not None and product.active
+                }
+            return list(self._active_products.values())
+
+    def iter_products(self, active_only: bool = True, page_size: int = 20,
+                      cursor: Optional[int] = None) -> Iterator[Tuple[List[Product], Optional[int]]]:
+        """
+        Page lazily through the products in catalog order.
+        
+        Each page is only gathered when asked for, so the first page costs
+        the same however large the catalog is. Every page comes with a
+        cursor: passing it back later starts a new listing right after that
+        page, even if products were added or removed in the meantime.
+        
+        Args:
+            active_only: Whether to leave out inactive products.
+            page_size: The most products per page.
+            cursor: A cursor from an earlier page, or None to start at the beginning.
+            
+        Yields:
+            (page, cursor) pairs; the cursor is None once the end of the catalog is reached.
+            
+        Raises:
+            Exception: If the page size is not positive.
+        """
+        if page_size <= 0:
+            raise Exception("Page size must be positive!")
+        
+        with self._state_lock:
+            # Later compactions replace these lists, leaving ours intact
+            slots, numbers = self._slots, self._slot_numbers
+            position = 0 if cursor is None else bisect_left(numbers, cursor)
+        
+        while position < len(slots):
+            page = []
+            while position < len(slots) and len(page) < page_size:
+                product = slots[position]
+                position += 1
+                if product is not None and (product.active or not active_only):
+                    page.append(product)
+            
+            next_cursor = numbers[position - 1] + 1 if position < len(slots) else None
+            if page:
+                yield page, next_cursor
+
+    def render_catalog(self, stream: TextIO, active_only: bool = True, chunk_size: int = 10_000) -> int:
+        """
+        Write one line per product to a text stream, in catalog order.
+        
+        Lines come from each product's cached rendering and are joined into
+        one write per chunk of products.
+        
+        Args:
+            stream: The stream to write to.
+            active_only: Whether to leave out inactive products.
+            chunk_size: The number of products per write.
+            
+        Returns:
+            The number of products written.
+        """
+        written = 0
+        for page, _ in self.iter_products(active_only=active_only, page_size=chunk_size):
+            stream.write("\n".join(map(str, page)) + "\n")
+            written += len(page)
+        return written
+
+    def products_in_price_range(self, low: float, high: float) -> List[Product]:
+        """
+        Get the active products priced between two bounds, cheapest first.
+        
+        Args:
+            low: The lowest price to include.
+            high: The highest price to include.
+            
+        Returns:
+            The matching products.
+        """
+        with self._state_lock:
+            return self._lookup(self._sorted_by_price().between(low, high))
+
+    def cheapest(self, count: int) -> List[Product]:
+        """
+        Get the cheapest active products, cheapest first.
+        
+        Args:
+            count: The most products to return.
+            
+        Returns:
+            The products.
+        """
+        with self._state_lock:
+            return self._lookup(self._sorted_by_price().first(count))
+
+    def most_expensive(self, count: int) -> List[Product]:
+        """
+        Get the most expensive active products, most expensive first.
+        
+        Args:
+            count: The most products to return.
+            
+        Returns:
+            The products.
+        """
+        with self._state_lock:
+            return self._lookup(self._sorted_by_price().last(count))
+
+    def low_stock(self, threshold: int) -> List[Product]:
+        """
+        Get the active products with fewer units than a threshold, fewest first.
+        
+        Non-stocked products never run low and are left out.
+        
+        Args:
+            threshold: The smallest quantity that is not low.
+            
+        Returns:
+            The products.
+        """
+        with self._state_lock:
+            if self._quantity_index is None:
+                self._quantity_index = SortedIndex(
+                    (product.quantity, product.name) for product in self
+                    if product.active and not isinstance(product, NonStockedProduct)
+                )
+            return self._lookup(self._quantity_index.below(threshold))
+
+    def search_prefix(self, prefix: str, limit: int = 10) -> List[Product]:
+        """
+        Find active products whose names start with a prefix, ignoring case.
+        
+        Args:
+            prefix: The start of the names to find.
+            limit: The most products to return.
+            
+        Returns:
+            The matching products in alphabetical order.
+        """
+        matches: List[Product] = []
+        if limit <= 0:
+            return matches
+        
+        with self._state_lock:
+            for name in self._searchable_names().prefix(prefix):
+                product = self.get_product(name)
+                if product.active:
+                    matches.append(product)
+                    if len(matches) == limit:
+                        break
+        return matches
+
+    def fuzzy_search(self, query: str, limit: int = 10, min_similarity: float = 0.5) -> List[Product]:
+        """
+        Find active products whose names resemble a query, tolerating typos.
+        
+        Args:
+            query: The text to look for.
+            limit: The most products to return.
+            min_similarity: The share of the query's letter trigrams a name must contain.
+            
+        Returns:
+            The matching products, best match first.
+        """
+        with self._state_lock:
+            matches = (self.get_product(name) for _, name in self._searchable_names().fuzzy(query, min_similarity))
+            return list(itertools.islice((product for product in matches if product.active), max(limit, 0)))
+
+    def _searchable_names(self) -> NameIndex:
+        """Get the search index, building it on first use; the caller holds the state lock."""
+        if self._name_index is None:
+            self._name_index = NameIndex(product.name for product in self)
+        return self._name_index
+
+    def _sorted_by_price(self) -> SortedIndex:
+        """Get the price index, building it on first use; the caller holds the state lock."""
+        if self._price_index is None:
+            self._price_index = SortedIndex((product.price, product.name) for product in self if product.active)
+        return self._price_index
+
+    def _lookup(self, names: List[str]) -> List[Product]:
+        """Get our products with the given names."""
+        return [self.get_product(name) for name in names]
+
+    def _index_product(self, product: Product) -> None:
+        """
+        Add a product to the price and quantity indexes that exist, if it is active.
+        
+        The caller holds the state lock.
+        
+        Args:
+            product: The product to add.
+        """
+        if not product.active:
+            return
+        if self._price_index is not None:
+            self._price_index.add(product.name, product.price)
+        if self._quantity_index is not None and not isinstance(product, NonStockedProduct):
+            self._quantity_index.add(product.name, product.quantity)
+
+    def _unindex_product(self, product_name: str) -> None:
+        """
+        Remove a product from the price and quantity indexes that exist.
+        
+        The caller holds the state lock.
+        
+        Args:
+            product_name: The name of the product to remove.
+        """
+        if self._price_index is not None:
+            self._price_index.discard(product_name)
+        if self._quantity_index is not None:
+            self._quantity_index.discard(product_name)
 
     def order(self, shopping_list: List[Tuple[Product, int]]) -> float:
         """
@@ -64,59 +689,499 @@ class Store:
         Raises:
             Exception: If there's an issue with purchasing any product.
         """
-        # Validate the entire order first
-        store_products = {}  # Map from product name to actual store product
-        order_quantities = {}  # Map to track quantity ordered for each product
+        self._expire_reservations()
         
-        # Find all products in the store's inventory
-        for product, quantity in shopping_list:
-            found = False
-            for store_product in self._products:
-                if product.name == store_product.name:
-                    store_products[product.name] = store_product
-                    order_quantities[product.name] = quantity
-                    found = True
-                    break
-            
-            if not found:
-                raise Exception(f"Product '{product.name}' not found in store inventory")
-        
-        # Verify all products can be purchased in the requested quantities
-        for name, store_product in store_products.items():
-            quantity = order_quantities[name]
-            
-            # Check if it's a LimitedProduct with quantity > maximum
-            if isinstance(store_product, LimitedProduct):
-                if quantity > store_product.maximum:
-                    raise Exception(f"Cannot buy more than {store_product.maximum} of {name} in a single order!")
-            
-            # Check if it's a regular product with insufficient quantity
-            if not isinstance(store_product, NonStockedProduct):
-                if store_product.quantity < quantity:
-                    raise Exception(f"Not enough {name} in stock! Only {store_product.quantity} left.")
-        
-        # Now process the actual purchase
-        total = 0.0
-        for name, store_product in store_products.items():
-            quantity = order_quantities[name]
+        # Validate the entire order first, then process the actual purchase
+        lines = self._resolve(shopping_list, self._order_entry)
+        with self._locked(lines):
+            self._validate(lines)
+            return self._commit(lines)
+
+    def quote(self, shopping_list: List[Tuple[Product, int]]) -> Tuple[float, List[QuoteLine]]:
+        """
+        Price an order without placing it.
+        
+        The shopping list is checked exactly as order() would check it, but
+        no stock is taken. Line totals are remembered per product and
+        quantity until the product's price or promotion is set again.
+        
+        Args:
+            shopping_list: List of tuples containing (product, quantity).
             
-            # For non-stocked products, don't reduce quantity
-            if isinstance(store_product, NonStockedProduct):
-                if store_product.promotion:
-                    total += store_product.promotion.apply_promotion(store_product, quantity)
-                else:
-                    total += store_product.price * quantity
+        Returns:
+            The total price of the order and one QuoteLine per product.
+            
+        Raises:
+            Exception: If the order could not be placed.
+        """
+        lines = self._resolve(shopping_list, self._order_entry)
+        quote_lines = []
+        with self._locked(lines):
+            self._validate(lines)
+            for name, ((store_product, _, _), quantity) in lines.items():
+                promotion = store_product.promotion
+                quote_lines.append(QuoteLine(
+                    name, quantity, store_product.price,
+                    promotion.name if promotion else None,
+                    self._quoted_total(store_product, quantity)
+                ))
+        
+        return sum((line.total for line in quote_lines), 0.0), quote_lines
+
+    def _quoted_total(self, product: Product, quantity: int) -> float:
+        """
+        Price a line, reusing the result of an earlier quote when possible.
+        
+        Each product remembers the totals of its QUOTE_CACHE_SIZE most
+        recently quoted quantities.
+        
+        Args:
+            product: The store product being quoted.
+            quantity: The quantity being quoted.
+            
+        Returns:
+            The total price for the line.
+        """
+        product_cache = self._quote_cache.get(product.name)
+        if product_cache is None:
+            product_cache = self._quote_cache[product.name] = {}
+        
+        total = product_cache.pop(quantity, None)
+        if total is None:
+            total = self._line_total(product, quantity)
+            if len(product_cache) >= QUOTE_CACHE_SIZE:
+                del product_cache[next(iter(product_cache))]
+        product_cache[quantity] = total  # Most recently quoted last
+        return total
+
+    def order_many(self, orders: List[List[Tuple[Product, int]]]
+                   ) -> Tuple[List[Optional[float]], List[Optional[Exception]]]:
+        """
+        Process a batch of independent orders.
+        
+        Every product is looked up and classified once for the whole batch,
+        and every product in the batch is locked once. Orders are validated
+        one after another against the stock the earlier orders left, each
+        all-or-nothing, so a failing order never affects the others. Stock
+        is then taken out once per product for the whole batch, so
+        subscribers see one StockChanged per product rather than per order.
+        
+        Args:
+            orders: List of shopping lists, each as accepted by order().
+            
+        Returns:
+            A (totals, errors) pair of lists parallel to orders. For each order
+            either the total is set and the error is None, or the total is None
+            and the error holds the exception order() would have raised.
+        """
+        self._expire_reservations()
+        
+        # Merge each order's lines by product, then look every product up once
+        # A malformed shopping list fails on its own, as its order() would
+        batch: List[object] = []
+        for shopping_list in orders:
+            quantities: Dict[str, int] = {}
+            try:
+                for product, quantity in shopping_list:
+                    quantities[product.name] = quantities.get(product.name, 0) + quantity
+            except Exception as error:
+                batch.append(error)
             else:
-                # For regular and limited products, reduce quantity and calculate price
-                if store_product.promotion:
-                    total += store_product.promotion.apply_promotion(store_product, quantity)
-                else:
-                    total += store_product.price * quantity
+                batch.append(quantities)
+        
+        entries: Dict[str, OrderEntry] = {}
+        missing: Dict[str, Exception] = {}
+        for quantities in batch:
+            if isinstance(quantities, Exception):
+                continue
+            for name in quantities:
+                if name not in entries and name not in missing:
+                    try:
+                        entries[name] = self._order_entry(name)
+                    except Exception as error:
+                        missing[name] = error
+        
+        totals: List[Optional[float]] = []
+        errors: List[Optional[Exception]] = []
+        placed: List[OrderPlaced] = []
+        with self._locked(entries):
+            # Stock left by the orders accepted so far, by product name
+            stock = {name: product.quantity for name, (product, stocked, _) in entries.items() if stocked}
+            line_totals: Dict[Tuple[str, int], float] = {}
+            
+            for quantities in batch:
+                if isinstance(quantities, Exception):
+                    totals.append(None)
+                    errors.append(quantities)
+                    continue
+                try:
+                    if missing:
+                        for name in quantities:
+                            if name in missing:
+                                raise missing[name]
+                    for name, quantity in quantities.items():
+                        _, stocked, maximum = entries[name]
+                        if maximum is not None and quantity > maximum:
+                            raise Exception(f"Cannot buy more than {maximum} of {name} in a single order!")
+                        if stocked and stock[name] < quantity:
+                            raise Exception(f"Not enough {name} in stock! Only {stock[name]} left.")
+                except Exception as error:
+                    totals.append(None)
+                    errors.append(error)
+                    continue
+                
+                if self._journal is not None:
+                    self._journal.append([(name, quantity) for name, quantity in quantities.items()
+                                          if entries[name][1]])
                 
-                # Reduce quantity after calculating price
+                total = 0.0
+                for name, quantity in quantities.items():
+                    line_total = line_totals.get((name, quantity))
+                    if line_total is None:
+                        line_total = line_totals[name, quantity] = self._line_total(entries[name][0], quantity)
+                    total += line_total
+                    if name in stock:
+                        stock[name] -= quantity
+                
+                totals.append(total)
+                errors.append(None)
+                if self._events is not None:
+                    placed.append(OrderPlaced(tuple(quantities.items()), total))
+            
+            # One sync makes the whole batch durable before any stock is taken
+            if self._journal is not None:
+                self._journal.sync()
+            
+            for name, quantity in stock.items():
+                store_product = entries[name][0]
+                if store_product.quantity != quantity:
+                    store_product.quantity = quantity
+        
+        for event in placed:
+            self._events.publish(event)
+        
+        return totals, errors
+
+    def _locked(self, names: Iterable[str]) -> ContextManager:
+        """
+        Hold the locks of the given products for the duration of a with block.
+        
+        Locks are always taken in name order, so two orders can never wait on
+        each other. Outside thread-safe mode nothing is locked.
+        
+        Args:
+            names: Names of the products to lock.
+            
+        Returns:
+            A context manager holding the locks.
+        """
+        if not self._thread_safe:
+            return nullcontext()
+        
+        stack = ExitStack()
+        for name in sorted(names):
+            lock = self._locks.get(name)
+            if lock is not None:
+                stack.enter_context(lock)
+        return stack
+
+    def quote_many(self, names: Sequence[str], quantities: Sequence[int]) -> List[float]:
+        """
+        Price many (product, quantity) pairs at once without touching stock.
+        
+        Lines are grouped by promotion and each group is priced with one
+        Promotion.apply_promotion_batch() call. Every result is exactly what
+        pricing the line on its own would give. Stock and order limits are
+        not checked.
+        
+        Args:
+            names: The names of the products to price.
+            quantities: The quantity to price for each product.
+            
+        Returns:
+            The total price of each line, in the order given.
+            
+        Raises:
+            Exception: If names and quantities differ in length, or a
+                product is not in the store.
+        """
+        if len(names) != len(quantities):
+            raise Exception(f"Got {len(names)} product names but {len(quantities)} quantities")
+        
+        totals = [0.0] * len(names)
+        groups: Dict[Optional[Promotion], Tuple[List[int], List[Product], List[int]]] = {}
+        
+        for position, (name, quantity) in enumerate(zip(names, quantities)):
+            product = self.get_product(name)
+            if product is None:
+                raise Exception(f"Product '{name}' not found in store inventory")
+            
+            positions, products, counts = groups.setdefault(product.promotion, ([], [], []))
+            positions.append(position)
+            products.append(product)
+            counts.append(quantity)
+        
+        for promotion, (positions, products, counts) in groups.items():
+            if promotion is None:
+                group_totals = [product.price * count for product, count in zip(products, counts)]
+            else:
+                group_totals = promotion.apply_promotion_batch(products, counts)
+            for position, total in zip(positions, group_totals):
+                totals[position] = total
+        
+        return totals
+
+    def reserve(self, shopping_list: List[Tuple[Product, int]], ttl: float) -> int:
+        """
+        Hold stock for an order without placing it yet.
+        
+        The shopping list is checked and priced as order() would, and the
+        stock is taken out of the available quantity right away. The order
+        is placed by commit(); release() or the ttl running out puts the
+        stock back.
+        
+        Args:
+            shopping_list: List of tuples containing (product, quantity).
+            ttl: Seconds the reservation is held before it expires; math.inf
+                holds it until it is committed or released.
+            
+        Returns:
+            The handle of the reservation.
+            
+        Raises:
+            Exception: If the order could not be placed.
+        """
+        self._expire_reservations()
+        lines = self._resolve(shopping_list, self._order_entry)
+        
+        with self._locked(lines):
+            self._validate(lines)
+            total = 0.0
+            held = []
+            for (store_product, stocked, _), quantity in lines.values():
+                total += self._line_total(store_product, quantity)
+                if stocked:
+                    store_product.quantity = store_product.quantity - quantity
+                    held.append((store_product, quantity))
+        
+        journal_lines = [(product.name, quantity) for product, quantity in held]
+        expires_at = time.monotonic() + ttl
+        with self._state_lock:
+            handle = next(self._reservation_handles)
+            self._reservations[handle] = (total, journal_lines, held)
+            if not math.isinf(expires_at):
+                heapq.heappush(self._expiry_heap, (expires_at, handle))
+        return handle
+
+    def commit(self, handle: int) -> float:
+        """
+        Place the order held by a reservation.
+        
+        Args:
+            handle: The handle returned by reserve().
+            
+        Returns:
+            The total price of the order, as priced when it was reserved.
+            
+        Raises:
+            Exception: If the reservation expired, was released or was already committed.
+        """
+        self._expire_reservations()
+        with self._state_lock:
+            reservation = self._reservations.pop(handle, None)
+            self._prune_expiry_heap()
+        if reservation is None:
+            raise Exception(f"Reservation {handle} has expired or does not exist")
+        
+        total, journal_lines, _ = reservation
+        if self._journal is not None:
+            self._journal.append(journal_lines)
+        if self._events is not None:
+            self._events.publish(OrderPlaced(tuple(journal_lines), total))
+        return total
+
+    def release(self, handle: int) -> None:
+        """
+        Cancel a reservation and put its stock back.
+        
+        Releasing a reservation that expired or no longer exists does nothing.
+        
+        Args:
+            handle: The handle returned by reserve().
+        """
+        with self._state_lock:
+            reservation = self._reservations.pop(handle, None)
+            self._prune_expiry_heap()
+        if reservation is not None:
+            self._restock(reservation[2])
+        self._expire_reservations()
+
+    def _expire_reservations(self) -> None:
+        """Release every reservation whose time is up."""
+        heap = self._expiry_heap
+        if not heap or heap[0][0] > time.monotonic():
+            return
+        
+        expired = []
+        with self._state_lock:
+            now = time.monotonic()
+            while heap and heap[0][0] <= now:
+                _, handle = heapq.heappop(heap)
+                # Committed and released reservations stay in the heap until here or _prune_expiry_heap()
+                reservation = self._reservations.pop(handle, None)
+                if reservation is not None:
+                    expired.append(reservation[2])
+        
+        for held in expired:
+            self._restock(held)
+
+    def _prune_expiry_heap(self) -> None:
+        """
+        Drop committed and released reservations from the expiry heap once they make up most of it.
+        
+        The caller holds the state lock.
+        """
+        heap = self._expiry_heap
+        if len(heap) > 2 * len(self._reservations) + 64:
+            heap[:] = [entry for entry in heap if entry[1] in self._reservations]
+            heapq.heapify(heap)
+
+    def _reserved_quantities(self) -> Dict[str, int]:
+        """
+        Get the stock held by open reservations.
+        
+        Reserved stock is already taken out of the products' quantities but
+        not yet journaled, so snapshots add it back: an order the snapshot
+        cannot see must not be counted in it.
+        
+        Returns:
+            Map from product name to the quantity reserved.
+        """
+        reserved: Dict[str, int] = {}
+        with self._state_lock:
+            for _, journal_lines, _ in self._reservations.values():
+                for name, quantity in journal_lines:
+                    reserved[name] = reserved.get(name, 0) + quantity
+        return reserved
+
+    def _restock(self, held: List[Tuple[Product, int]]) -> None:
+        """
+        Put reserved stock back.
+        
+        Args:
+            held: The (store product, quantity) pairs taken by a reservation.
+        """
+        with self._locked(product.name for product, _ in held):
+            for product, quantity in held:
+                product.quantity = product.quantity + quantity
+
+    def _order_entry(self, name: str) -> OrderEntry:
+        """
+        Look up a product and the rules that apply when ordering it.
+        
+        Args:
+            name: The name of the product being ordered.
+            
+        Returns:
+            A (store product, tracks stock, per-order maximum or None) tuple.
+            
+        Raises:
+            Exception: If the product is not in the store.
+        """
+        store_product = self.get_product(name)
+        if store_product is None:
+            raise Exception(f"Product '{name}' not found in store inventory")
+        
+        maximum = store_product.maximum if isinstance(store_product, LimitedProduct) else None
+        return store_product, not isinstance(store_product, NonStockedProduct), maximum
+
+    @staticmethod
+    def _resolve(shopping_list: List[Tuple[Product, int]],
+                 entry_for: Callable[[str], OrderEntry]) -> Dict[str, Tuple[OrderEntry, int]]:
+        """
+        Map every line of a shopping list to the store product it orders.
+        
+        Lines for the same product are merged into one with the summed
+        quantity, so limits, stock and promotions apply to the whole amount.
+        
+        Args:
+            shopping_list: List of tuples containing (product, quantity).
+            entry_for: Function returning the order entry for a product name.
+            
+        Returns:
+            Map from product name to (order entry, total quantity ordered).
+        """
+        lines: Dict[str, Tuple[OrderEntry, int]] = {}
+        for product, quantity in shopping_list:
+            line = lines.get(product.name)
+            if line is None:
+                lines[product.name] = (entry_for(product.name), quantity)
+            else:
+                lines[product.name] = (line[0], line[1] + quantity)
+        return lines
+
+    @staticmethod
+    def _validate(lines: Dict[str, Tuple[OrderEntry, int]]) -> None:
+        """
+        Verify all products can be purchased in the requested quantities.
+        
+        Args:
+            lines: Resolved order lines as returned by _resolve().
+            
+        Raises:
+            Exception: If a limit is exceeded or there is not enough stock.
+        """
+        for name, ((store_product, stocked, maximum), quantity) in lines.items():
+            if maximum is not None and quantity > maximum:
+                raise Exception(f"Cannot buy more than {maximum} of {name} in a single order!")
+            
+            if stocked and store_product.quantity < quantity:
+                raise Exception(f"Not enough {name} in stock! Only {store_product.quantity} left.")
+
+    def _commit(self, lines: Dict[str, Tuple[OrderEntry, int]]) -> float:
+        """
+        Charge and take out of stock every line of a validated order.
+        
+        Args:
+            lines: Resolved order lines that passed _validate().
+            
+        Returns:
+            The total price of the order.
+        """
+        if self._journal is not None:
+            self._journal.append([
+                (name, quantity) for name, ((_, stocked, _), quantity) in lines.items() if stocked
+            ])
+        
+        total = 0.0
+        for (store_product, stocked, _), quantity in lines.values():
+            total += self._line_total(store_product, quantity)
+            
+            # Non-stocked products never run out, so their quantity is left alone
+            if stocked:
                 store_product.quantity = store_product.quantity - quantity
         
+        if self._events is not None:
+            self._events.publish(OrderPlaced(
+                tuple((name, quantity) for name, (_, quantity) in lines.items()), total
+            ))
         return total
+
+    @staticmethod
+    def _line_total(product: Product, quantity: int) -> float:
+        """
+        Price a quantity of a product, applying its promotion if it has one.
+        
+        Args:
+            product: The product being purchased.
+            quantity: The quantity being purchased.
+            
+        Returns:
+            The total price for the line.
+        """
+        if product.promotion:
+            return product.promotion.apply_promotion(product, quantity)
+        return product.price * quantity
         
     def __contains__(self, product: Product) -> bool:
         """
@@ -128,42 +1193,30 @@ class Store:
         Returns:
             True if product exists in store, False otherwise.
         """
-        for store_product in self._products:
-            if store_product.name == product.name:
-                return True
-        return False
+        return product.name in self._index
         
     def __add__(self, other: 'Store') -> 'Store':
         """
         Combine two stores into a new store.
         
+        Where both stores have a product with the same name, this store's
+        product is kept.
+        
         Args:
             other: The other store to combine with.
             
         Returns:
             A new store containing products from both stores.
         """
-        # Create a new store with products from this store
-        new_products = list(self._products)
-        
-        # Add products from other store
-        for product in other._products:
-            found = False
-            for existing_product in new_products:
-                if existing_product.name == product.name:
-                    found = True
-                    break
-            
-            if not found:
-                new_products.append(product)
-                
-        return Store(new_products)
+        merged = type(self)(list(self))
+        merged.merge(other)
+        return merged
         
     def __iter__(self) -> Iterator[Product]:
         """
         Create an iterator for the store's products.
         
         Returns:
-            An iterator over the products in the store.
+            An iterator over the products in the store, in the order they were added.
         """
-        return iter(self._products)
+        return (product for product in self._slots if product is not None)
@@ -0,0 +1,71 @@
+"""
+Tests for the asyncio front end of the store.
+"""
+import asyncio
+import unittest
+from unittest import mock
+from product import Product, LimitedProduct
+from store import Store
+from async_store import AsyncStore
+
+
+class TestAsyncStore(unittest.TestCase):
+    """Test cases for the AsyncStore class."""
+    
+    def setUp(self):
+        """Set up test fixtures for each test method."""
+        self.macbook = Product("MacBook", price=1000, quantity=50)
+        self.shipping = LimitedProduct("Shipping", price=10, quantity=5, maximum=1)
+        self.async_store = AsyncStore(Store([self.macbook, self.shipping]), max_batch=7)
+    
+    def test_concurrent_orders(self):
+        """Test that many concurrent orders are all processed exactly once."""
+        async def run():
+            orders = [self.async_store.order([(self.macbook, 1)]) for _ in range(60)]
+            return await asyncio.gather(*orders, return_exceptions=True)
+        
+        results = asyncio.run(run())
+        
+        # 50 in stock: the first 50 orders go through, the rest fail
+        self.assertEqual(results[:50], [1000] * 50)
+        for error in results[50:]:
+            self.assertIn("Not enough MacBook in stock", str(error))
+        self.assertEqual(self.macbook.quantity, 0)
+    
+    def test_order_error(self):
+        """Test that a failing order raises in its own caller only."""
+        async def run():
+            with self.assertRaises(Exception) as context:
+                await self.async_store.order([(self.shipping, 2)])
+            self.assertIn("Cannot buy more than 1 of Shipping", str(context.exception))
+            
+            self.assertEqual(await self.async_store.order([(self.shipping, 1)]), 10)
+            self.assertEqual(await self.async_store.get_total_quantity(), 54)
+            self.assertEqual(await self.async_store.get_all_products(), [self.macbook, self.shipping])
+        
+        asyncio.run(run())
+
+    
+    def test_malformed_order_fails_alone(self):
+        """Test that a shopping list that cannot be read does not hold up its batch."""
+        async def run():
+            orders = [self.async_store.order([(self.macbook,)]), self.async_store.order([(self.macbook, 2)])]
+            return await asyncio.wait_for(asyncio.gather(*orders, return_exceptions=True), timeout=5)
+        
+        malformed, total = asyncio.run(run())
+        self.assertIsInstance(malformed, Exception)
+        self.assertEqual(total, 2000)
+        self.assertEqual(self.macbook.quantity, 48)
+    
+    def test_failed_batch_wakes_every_caller(self):
+        """Test that every caller gets the error if the whole batch fails."""
+        async def run():
+            orders = [self.async_store.order([(self.macbook, 1)]) for _ in range(3)]
+            return await asyncio.wait_for(asyncio.gather(*orders, return_exceptions=True), timeout=5)
+        
+        with mock.patch.object(self.async_store.store, "order_many", side_effect=Exception("store is down")):
+            results = asyncio.run(run())
+        self.assertEqual([str(error) for error in results], ["store is down"] * 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Tests for streaming catalog imports.
+"""
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from product import NonStockedProduct, LimitedProduct
+from promotions import SecondHalfPrice
+from catalog_import import import_catalog, _split
+from store import Store
+
+
+class TestCatalogImport(unittest.TestCase):
+    """Test cases for importing catalogs from CSV and JSON Lines feeds."""
+    
+    def setUp(self):
+        """Set up a temporary directory and a promotion catalog."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.promotions = {"Second Half price!": SecondHalfPrice("Second Half price!")}
+    
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.directory.cleanup()
+    
+    def write(self, filename, content):
+        """Write a feed file and return its path."""
+        path = os.path.join(self.directory.name, filename)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+    
+    def test_import_csv(self):
+        """Test importing every product type from CSV, in small chunks."""
+        path = self.write("catalog.csv", (
+            "type,name,price,quantity,maximum,promotion\n"
+            "product,MacBook Air M2,1450,100,,Second Half price!\n"
+            ",Google Pixel 7,500,250,,\n"
+            "non_stocked,Windows License,125,,,\n"
+            "limited,Shipping,10,250,1,\n"
+        ))
+        store = Store()
+        report = import_catalog(store, path, self.promotions, chunk_size=3)
+        
+        self.assertEqual(report.rows, 4)
+        self.assertGreater(report.rows_per_second, 0)
+        self.assertEqual([product.name for product in store],
+                         ["MacBook Air M2", "Google Pixel 7", "Windows License", "Shipping"])
+        self.assertIs(store.get_product("MacBook Air M2").promotion, self.promotions["Second Half price!"])
+        self.assertIsInstance(store.get_product("Windows License"), NonStockedProduct)
+        self.assertEqual(store.get_product("Shipping").maximum, 1)
+        self.assertEqual(store.get_total_quantity(), 600)
+    
+    def test_import_jsonl(self):
+        """Test importing from JSON Lines."""
+        rows = [
+            {"name": "MacBook Air M2", "price": 1450, "quantity": 100},
+            {"type": "limited", "name": "Shipping", "price": 10, "quantity": 250, "maximum": 1}
+        ]
+        path = self.write("catalog.jsonl", "\n".join(json.dumps(row) for row in rows) + "\n\n")
+        store = Store()
+        import_catalog(store, path)
+        
+        self.assertIsInstance(store.get_product("Shipping"), LimitedProduct)
+        self.assertEqual(store.get_total_quantity(), 350)
+    
+    def test_invalid_rows(self):
+        """Test that rows breaking the product rules are rejected."""
+        invalid_rows = [
+            '{"name": "", "price": 10, "quantity": 1}',
+            '{"name": "MacBook", "price": -10, "quantity": 1}',
+            '{"name": "MacBook", "price": 10}',
+            '{"type": "gift card", "name": "MacBook", "price": 10, "quantity": 1}',
+            '{"name": "MacBook", "price": 10, "quantity": 1, "promotion": "Free!"}'
+        ]
+        for row in invalid_rows:
+            path = self.write("catalog.jsonl", row + "\n")
+            with self.assertRaises(Exception, msg=row) as context:
+                import_catalog(Store(), path, self.promotions)
+            self.assertIn("Invalid catalog row 1", str(context.exception))
+    
+    def test_import_with_workers(self):
+        """Test that a parallel import gives the same store as a serial one."""
+        lines = ["type,name,price,quantity,maximum,promotion"]
+        for i in range(500):
+            if i % 10 == 0:
+                lines.append(f"limited,Product {i},{i}.5,{i},2,Second Half price!")
+            elif i % 10 == 1:
+                lines.append(f"non_stocked,Product {i},{i},,,")
+            else:
+                lines.append(f"product,Product {i},{i},{i},,")
+        path = self.write("catalog.csv", "\n".join(lines) + "\n")
+        
+        serial, parallel = Store(), Store()
+        import_catalog(serial, path, self.promotions)
+        report = import_catalog(parallel, path, self.promotions, workers=2)
+        
+        self.assertEqual(report.rows, 500)
+        self.assertEqual([str(product) for product in parallel], [str(product) for product in serial])
+        self.assertIs(parallel.get_product("Product 10").promotion, self.promotions["Second Half price!"])
+        self.assertIsInstance(parallel.get_product("Product 20"), LimitedProduct)
+        
+        # Names must still be unique across shards
+        with self.assertRaises(Exception):
+            import_catalog(parallel, path, self.promotions, workers=2)
+    
+    def test_big_feeds_get_small_shards(self):
+        """Test that shards stay under the byte cap however few workers there are."""
+        lines = ["type,name,price,quantity,maximum,promotion"]
+        lines += [f"product,Product {i},{i},{i},," for i in range(300)]
+        path = self.write("catalog.csv", "\n".join(lines) + "\n")
+        
+        _, shards = _split(path, 2, max_shard_bytes=500)
+        self.assertGreater(len(shards), 2)
+        for begin, end in shards:
+            self.assertLessEqual(end - begin, 500 + len(lines[-1]) + 1)
+        
+        serial, parallel = Store(), Store()
+        import_catalog(serial, path)
+        with mock.patch("catalog_import.MAX_SHARD_BYTES", 500):
+            report = import_catalog(parallel, path, workers=2)
+        self.assertEqual(report.rows, 300)
+        self.assertEqual([str(product) for product in parallel], [str(product) for product in serial])
+    
+    def test_invalid_row_with_workers(self):
+        """Test that workers reject invalid rows."""
+        path = self.write("catalog.jsonl", '{"name": "MacBook", "price": 10, "quantity": 1}\n'
+                                           '{"name": "iPhone", "price": -1, "quantity": 1}\n')
+        with self.assertRaises(Exception) as context:
+            import_catalog(Store(), path, workers=2)
+        self.assertIn("Invalid catalog row", str(context.exception))
+    
+    def test_duplicate_names_are_rejected(self):
+        """Test that a chunk with a name already in the store is not added."""
+        path = self.write("catalog.csv", "name,price,quantity\nMacBook,1000,5\niPhone,800,10\nMacBook,900,1\n")
+        store = Store()
+        with self.assertRaises(Exception):
+            import_catalog(store, path)
+        self.assertEqual(list(store), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Tests for the column-based ColumnarStore backend.
+"""
+import unittest
+from product import Product, NonStockedProduct, LimitedProduct
+from promotions import SecondHalfPrice
+from columnar_store import ColumnarStore
+from store import Store
+
+
+class TestColumnarStore(unittest.TestCase):
+    """Test cases for the ColumnarStore class."""
+    
+    def setUp(self):
+        """Set up test fixtures for each test method."""
+        self.store = ColumnarStore([
+            Product("MacBook", price=1000, quantity=5),
+            Product("iPhone", price=800, quantity=10),
+            LimitedProduct("Shipping", price=10, quantity=5, maximum=1),
+            NonStockedProduct("Windows License", price=125)
+        ])
+    
+    def test_views_keep_product_types(self):
+        """Test that views behave like the product types they were created from."""
+        self.assertIsInstance(self.store.get_product("MacBook"), Product)
+        self.assertIsInstance(self.store.get_product("Shipping"), LimitedProduct)
+        self.assertIsInstance(self.store.get_product("Windows License"), NonStockedProduct)
+        
+        self.assertEqual(self.store.get_product("Shipping").maximum, 1)
+        self.assertIn("Limited to 1", self.store.get_product("Shipping").show())
+        self.assertIn("Unlimited", self.store.get_product("Windows License").show())
+        self.assertIsNone(self.store.get_product("iPad"))
+    
+    def test_views_write_through(self):
+        """Test that changes made through a view are seen by the store."""
+        macbook = self.store.get_product("MacBook")
+        macbook.promotion = SecondHalfPrice("Second Half price!")
+        self.assertEqual(macbook.buy(2), 1500)
+        self.assertEqual(self.store.get_product("MacBook").quantity, 3)
+        self.assertEqual(self.store.get_total_quantity(), 18)
+        
+        with self.assertRaises(Exception):
+            macbook.price = -1
+        
+        # Selling out deactivates the product
+        macbook.quantity = 0
+        self.assertNotIn(macbook, self.store.get_all_products())
+        self.assertEqual(len(self.store.get_all_products()), 3)
+    
+    def test_order(self):
+        """Test that orders are all-or-nothing, as with the object store."""
+        macbook = self.store.get_product("MacBook")
+        shipping = self.store.get_product("Shipping")
+        windows = self.store.get_product("Windows License")
+        
+        with self.assertRaises(Exception):
+            self.store.order([(macbook, 2), (shipping, 2)])
+        self.assertEqual(macbook.quantity, 5)
+        
+        self.assertEqual(self.store.order([(macbook, 2), (shipping, 1), (windows, 3)]), 2385)
+        self.assertEqual(macbook.quantity, 3)
+        self.assertEqual(shipping.quantity, 4)
+        self.assertEqual(windows.quantity, 0)
+    
+    def test_add_and_remove(self):
+        """Test adding, removing and combining columnar stores."""
+        ipad = Product("iPad", price=500, quantity=3)
+        self.store.add_product(ipad)
+        self.assertIn(ipad, self.store)
+        with self.assertRaises(Exception):
+            self.store.add_product(ipad)
+        
+        self.store.remove_product("MacBook")
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(self.store.get_total_quantity(), 18)
+        self.assertEqual(
+            [product.name for product in self.store],
+            ["iPhone", "Shipping", "Windows License", "iPad"]
+        )
+        
+        combined = self.store + ColumnarStore([Product("MacBook", price=900, quantity=1)])
+        self.assertIsInstance(combined, ColumnarStore)
+        self.assertEqual(combined.get_total_quantity(), 19)
+    
+    def test_views_are_copied_into_other_stores(self):
+        """Test that a plain store holds standalone copies of views."""
+        store = Store([self.store.get_product("MacBook")])
+        macbook = store.get_product("MacBook")
+        self.assertIsInstance(macbook, Product)
+        self.assertFalse(macbook._is_view)
+        
+        # The copy and the row no longer affect each other
+        store.order([(macbook, 2)])
+        self.assertEqual((macbook.quantity, self.store.get_product("MacBook").quantity), (3, 5))
+        
+        combined = Store([Product("iPad", price=500, quantity=3)]) + self.store
+        self.assertEqual(type(combined), Store)
+        self.assertEqual(combined.get_total_quantity(), self.store.get_total_quantity() + 3)
+        self.assertIsInstance(combined.get_product("Shipping"), LimitedProduct)
+        self.assertFalse(any(product._is_view for product in combined))
+        
+        merged = Store.merge_all([Store(), self.store])
+        self.assertEqual([str(product) for product in merged], [str(product) for product in self.store])
+        self.assertFalse(any(product._is_view for product in merged))
+        
+        store.merge(self.store, policy="keep_right")
+        self.assertIsNot(store.get_product("MacBook"), macbook)
+        self.assertEqual(store.get_product("MacBook").quantity, 5)
+
+
+    def test_merge(self):
+        """Test merging into and out of a columnar store."""
+        self.store.merge(Store([LimitedProduct("MacBook", price=900, quantity=1, maximum=1)]), policy="keep_right")
+        macbook = self.store.get_product("MacBook")
+        self.assertIsInstance(macbook, LimitedProduct)
+        self.assertEqual((macbook.price, macbook.quantity), (900, 1))
+        self.assertEqual([product.name for product in self.store][0], "MacBook")
+        
+        total = self.store.get_total_quantity()
+        merged = Store.merge_all([self.store, self.store], policy="sum_quantities")
+        self.assertEqual(merged.get_total_quantity(), 2 * total)
+        self.assertEqual(self.store.get_total_quantity(), total)
+
+
+    def test_range_queries(self):
+        """Test that the price and stock queries work over column views."""
+        cheapest = self.store.cheapest(1)[0]
+        self.assertEqual(self.store.products_in_price_range(0, cheapest.price), [cheapest])
+        
+        cheapest.price = 1_000_000
+        self.assertEqual(self.store.most_expensive(1), [cheapest])
+        
+        low = self.store.low_stock(1_000_000)
+        self.assertEqual([product.quantity for product in low], sorted(product.quantity for product in low))
+        self.assertFalse(any(isinstance(product, NonStockedProduct) for product in low))
+
+
+    def test_iter_products(self):
+        """Test paging through views with cursors."""
+        first_page, cursor = next(self.store.iter_products(page_size=2))
+        rest = [product for page, _ in self.store.iter_products(page_size=2, cursor=cursor) for product in page]
+        
+        self.assertEqual(first_page + rest, self.store.get_all_products())
+
+
+if __name__ == '__main__':
+    unittest.main()
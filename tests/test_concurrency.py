@@ -0,0 +1,121 @@
+"""
+Stress tests for placing orders on a thread-safe store from many threads.
+"""
+import random
+import sys
+import threading
+import time
+import unittest
+from product import Product, LimitedProduct, NonStockedProduct
+from promotions import PercentDiscount
+from store import Store
+
+
+class YieldingDiscount(PercentDiscount):
+    """A discount that lets other threads run between an order's stock check and its stock update."""
+    
+    def apply_promotion(self, product, quantity):
+        """Yield to other threads, then apply the discount."""
+        time.sleep(0)
+        return super().apply_promotion(product, quantity)
+
+
+class TestConcurrentOrders(unittest.TestCase):
+    """Test cases for the thread-safe ordering mode."""
+    
+    THREADS = 8
+    ORDERS_PER_THREAD = 500
+    
+    def setUp(self):
+        """Set up a small, heavily contended catalog."""
+        self.products = [Product(f"Product {i}", price=10 + i, quantity=200) for i in range(5)]
+        for product in self.products:
+            product.promotion = YieldingDiscount("10% off", percent=10)
+        self.products.append(LimitedProduct("Shipping", price=10, quantity=300, maximum=2))
+        self.products.append(NonStockedProduct("Windows License", price=125))
+        self.store = Store(self.products, thread_safe=True)
+        self.initial_quantity = self.store.get_total_quantity()
+        
+        # Switch threads as often as possible so unlocked races would show up
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)
+    
+    def _place_orders(self, seed, sold):
+        """Place random multi-line orders, recording the units actually sold."""
+        rng = random.Random(seed)
+        for _ in range(self.ORDERS_PER_THREAD):
+            shopping_list = [
+                (product, rng.randint(1, 3))
+                for product in rng.sample(self.products, rng.randint(1, 3))
+            ]
+            try:
+                self.store.order(shopping_list)
+            except Exception:
+                continue
+            sold.append(sum(
+                quantity for product, quantity in shopping_list
+                if not isinstance(product, NonStockedProduct)
+            ))
+    
+    def test_no_oversell(self):
+        """Test that concurrent orders never sell more than is in stock."""
+        sold = []
+        threads = [
+            threading.Thread(target=self._place_orders, args=(seed, sold))
+            for seed in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Stock ran out, but never below zero
+        for product in self.products:
+            self.assertGreaterEqual(product.quantity, 0)
+        self.assertLess(self.store.get_total_quantity(), self.initial_quantity)
+        
+        # Every unit taken out of stock belongs to exactly one successful order
+        remaining = sum(product.quantity for product in self.products)
+        self.assertEqual(self.initial_quantity - remaining, sum(sold))
+        self.assertEqual(self.store.get_total_quantity(), remaining)
+    
+    def test_single_product_is_never_oversold(self):
+        """Test that many threads buying one product sell exactly its stock."""
+        macbook = Product("MacBook", price=1000, quantity=500)
+        macbook.promotion = YieldingDiscount("10% off", percent=10)
+        store = Store([macbook], thread_safe=True)
+        sold = []
+        
+        def buy():
+            while True:
+                try:
+                    store.order([(macbook, 1)])
+                except Exception:
+                    return
+                sold.append(1)
+        
+        threads = [threading.Thread(target=buy) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(sold), 500)
+        self.assertEqual(macbook.quantity, 0)
+        self.assertEqual(store.get_total_quantity(), 0)
+    
+    def test_thread_safe_store_behaves_like_plain_store(self):
+        """Test that thread-safe mode does not change single-threaded results."""
+        plain = Store([Product("MacBook", price=1000, quantity=5)])
+        safe = Store([Product("MacBook", price=1000, quantity=5)], thread_safe=True)
+        
+        for store in (plain, safe):
+            macbook = store.get_product("MacBook")
+            self.assertEqual(store.order([(macbook, 2)]), 2000)
+            with self.assertRaises(Exception):
+                store.order([(macbook, 4)])
+            self.assertEqual(store.get_total_quantity(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
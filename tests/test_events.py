@@ -0,0 +1,114 @@
+"""
+Tests for the store event stream.
+"""
+import threading
+import unittest
+from events import EventBus, OrderPlaced, PriceChanged, ProductDeactivated, StockChanged
+from product import Product, NonStockedProduct
+from store import Store
+
+
+class TestEvents(unittest.TestCase):
+    """Test cases for Store.subscribe and the EventBus."""
+    
+    def setUp(self):
+        """Set up test fixtures with one recording subscriber."""
+        self.macbook = Product("MacBook", price=1000, quantity=5)
+        self.windows = NonStockedProduct("Windows License", price=125)
+        self.store = Store([self.macbook, self.windows])
+        self.received = []
+        self.store.subscribe(self.received.extend)
+        self.addCleanup(self.store.events.close)
+    
+    def test_no_bus_without_subscribers(self):
+        """Test that a store nobody subscribed to publishes nothing."""
+        self.assertIsNone(Store([Product("Pixel", price=500, quantity=1)]).events)
+    
+    def test_order_events(self):
+        """Test that an order publishes its stock changes and the order itself."""
+        total = self.store.order([(self.macbook, 5), (self.windows, 1)])
+        self.assertTrue(self.store.events.flush(timeout=5))
+        
+        self.assertEqual(self.received, [
+            StockChanged("MacBook", 5, 0),
+            ProductDeactivated("MacBook"),
+            OrderPlaced((("MacBook", 5), ("Windows License", 1)), total),
+        ])
+    
+    def test_order_many_events(self):
+        """Test that a batch takes stock out once per product and publishes every placed order."""
+        totals, _ = self.store.order_many([[(self.macbook, 2)], [(self.macbook, 9)],
+                                           [(self.macbook, 3), (self.windows, 1)]])
+        self.assertTrue(self.store.events.flush(timeout=5))
+        
+        self.assertEqual(self.received, [
+            StockChanged("MacBook", 5, 0),
+            ProductDeactivated("MacBook"),
+            OrderPlaced((("MacBook", 2),), totals[0]),
+            OrderPlaced((("MacBook", 3), ("Windows License", 1)), totals[2]),
+        ])
+    
+    def test_price_change_event(self):
+        """Test that setting a price publishes the old and new price."""
+        self.macbook.price = 900
+        self.assertTrue(self.store.events.flush(timeout=5))
+        
+        self.assertEqual(self.received, [PriceChanged("MacBook", 1000, 900)])
+    
+    def test_failed_order_publishes_nothing(self):
+        """Test that a rejected order leaves no events behind."""
+        with self.assertRaises(Exception):
+            self.store.order([(self.macbook, 6)])
+        self.assertTrue(self.store.events.flush(timeout=5))
+        
+        self.assertEqual(self.received, [])
+    
+    def test_slow_subscriber_does_not_block_orders(self):
+        """Test that orders complete while a subscriber is stuck."""
+        release = threading.Event()
+        self.store.subscribe(lambda batch: release.wait())
+        
+        for _ in range(5):
+            self.store.order([(self.windows, 1)])
+        self.assertFalse(self.store.events.flush(timeout=0.05))
+        
+        release.set()
+        self.assertTrue(self.store.events.flush(timeout=5))
+        self.assertEqual(len(self.received), 5)
+    
+    def test_closed_store_publishes_nothing(self):
+        """Test that closing delivers pending events and later ones are discarded."""
+        self.store.order([(self.windows, 1)])
+        self.store.close()
+        self.assertEqual(len(self.received), 1)
+        
+        self.store.order([(self.macbook, 1)])
+        self.assertTrue(self.store.events.flush())
+        self.assertEqual(len(self.received), 1)
+        with self.assertRaises(Exception):
+            self.store.subscribe(self.received.extend)
+    
+    def test_full_buffer_drops_oldest(self):
+        """Test that a full buffer drops the oldest events and counts them."""
+        bus = EventBus(capacity=2)
+        for i in range(5):
+            bus.publish(ProductDeactivated(str(i)))
+        
+        self.assertEqual(bus.dropped, 3)
+        self.assertEqual([event.name for event in bus._buffer], ["3", "4"])
+    
+    def test_failing_subscriber_is_isolated(self):
+        """Test that one subscriber raising does not starve the others."""
+        def fail(batch):
+            raise ValueError("boom")
+        self.store.events.unsubscribe(self.received.extend)
+        self.store.subscribe(fail)
+        self.store.subscribe(self.received.extend)
+        
+        self.macbook.price = 900
+        self.assertTrue(self.store.events.flush(timeout=5))
+        self.assertEqual(self.received, [PriceChanged("MacBook", 1000, 900)])
+
+
+if __name__ == "__main__":
+    unittest.main()
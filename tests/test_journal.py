@@ -0,0 +1,143 @@
+"""
+Tests for the write-ahead order journal and crash recovery.
+"""
+import os
+import tempfile
+import time
+import unittest
+from product import Product, NonStockedProduct, LimitedProduct
+from journal import OrderJournal, read_journal, recover, checkpoint
+from snapshot import save_snapshot
+from store import Store
+
+
+class TestOrderJournal(unittest.TestCase):
+    """Test cases for journaling orders and recovering from them."""
+    
+    def setUp(self):
+        """Set up a store with a snapshot and a journal in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.directory.name, "store.snapshot")
+        self.journal_path = os.path.join(self.directory.name, "store.journal")
+        
+        self.macbook = Product("MacBook", price=1000, quantity=5)
+        self.shipping = LimitedProduct("Shipping", price=10, quantity=5, maximum=1)
+        self.windows = NonStockedProduct("Windows License", price=125)
+        self.store = Store([self.macbook, self.shipping, self.windows])
+        
+        save_snapshot(self.store, self.snapshot_path)
+        self.journal = OrderJournal(self.journal_path, group_size=4)
+        self.store.set_journal(self.journal)
+    
+    def tearDown(self):
+        """Close the journal and remove the temporary files."""
+        self.journal.close()
+        self.directory.cleanup()
+    
+    def quantities(self, store):
+        """Get the quantity of every product in a store by name."""
+        return {product.name: product.quantity for product in store}
+    
+    def test_journal_records_committed_orders_only(self):
+        """Test that only successful orders are journaled, without non-stocked lines."""
+        self.store.order([(self.macbook, 2), (self.windows, 3)])
+        with self.assertRaises(Exception):
+            self.store.order([(self.shipping, 2)])
+        self.store.order([(self.shipping, 1)])
+        self.journal.sync()
+        
+        self.assertEqual(list(read_journal(self.journal_path)), [[("MacBook", 2)], [("Shipping", 1)]])
+    
+    def test_recover_after_crash(self):
+        """Test that recovery rebuilds the stock from snapshot and journal."""
+        self.store.order([(self.macbook, 2), (self.shipping, 1)])
+        self.store.order_many([[(self.macbook, 1)], [(self.macbook, 9)], [(self.shipping, 1)]])
+        
+        recovered = recover(self.snapshot_path, self.journal_path)
+        self.assertEqual(self.quantities(recovered), self.quantities(self.store))
+        self.assertEqual(recovered.get_total_quantity(), 5)
+    
+    def test_torn_record_is_ignored(self):
+        """Test that a half-written record at the end of the journal is skipped."""
+        self.store.order([(self.macbook, 2)])
+        self.journal.sync()
+        with open(self.journal_path, "ab") as file:
+            file.write(b"\x01\x02\x03\x04\x05")
+        
+        recovered = recover(self.snapshot_path, self.journal_path)
+        self.assertEqual(recovered.get_product("MacBook").quantity, 3)
+    
+    def test_orders_after_torn_record_survive(self):
+        """Test that reopening a journal with a torn tail keeps later orders readable."""
+        self.store.order([(self.macbook, 1)])
+        self.journal.close()
+        with open(self.journal_path, "ab") as file:
+            file.write(b"\x01\x02\x03")
+        
+        recovered = recover(self.snapshot_path, self.journal_path)
+        self.journal = OrderJournal(self.journal_path, group_size=4)
+        recovered.set_journal(self.journal)
+        recovered.order([(recovered.get_product("MacBook"), 2)])
+        recovered.order([(recovered.get_product("Shipping"), 1)])
+        self.journal.sync()
+        
+        recovered_again = recover(self.snapshot_path, self.journal_path)
+        self.assertEqual(self.quantities(recovered_again), self.quantities(recovered))
+        self.assertEqual(recovered_again.get_total_quantity(), 6)
+    
+    def test_quiet_store_syncs_within_window(self):
+        """Test that an order is synced after sync_window even if no more orders arrive."""
+        self.journal.close()
+        self.journal = OrderJournal(self.journal_path, group_size=1000, sync_window=0.05)
+        self.store.set_journal(self.journal)
+        self.store.order([(self.macbook, 1)])
+        
+        deadline = time.monotonic() + 5
+        while self.journal._unsynced and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.journal._unsynced, 0)
+    
+    def test_checkpoint(self):
+        """Test that a checkpoint replaces the snapshot and empties the journal."""
+        self.store.order([(self.macbook, 2)])
+        checkpoint(self.store, self.snapshot_path, self.journal)
+        self.assertEqual(list(read_journal(self.journal_path)), [])
+        
+        self.store.order([(self.macbook, 1)])
+        self.journal.sync()
+        recovered = recover(self.snapshot_path, self.journal_path)
+        self.assertEqual(recovered.get_product("MacBook").quantity, 2)
+    
+    def test_checkpoint_with_open_reservation(self):
+        """Test that a reservation committed after a checkpoint is taken out once."""
+        handle = self.store.reserve([(self.macbook, 5)], ttl=60)
+        checkpoint(self.store, self.snapshot_path, self.journal)
+        self.store.commit(handle)
+        self.journal.sync()
+        
+        recovered = recover(self.snapshot_path, self.journal_path)
+        self.assertEqual(recovered.get_product("MacBook").quantity, 0)
+        self.assertFalse(recovered.get_product("MacBook").active)
+    
+    def test_checkpoint_with_released_reservation(self):
+        """Test that a reservation released after a checkpoint leaves the stock whole."""
+        handle = self.store.reserve([(self.macbook, 2)], ttl=60)
+        checkpoint(self.store, self.snapshot_path, self.journal)
+        self.store.release(handle)
+        
+        recovered = recover(self.snapshot_path, self.journal_path)
+        self.assertEqual(recovered.get_product("MacBook").quantity, 5)
+        self.assertEqual(self.store.get_product("MacBook").quantity, 5)
+    
+    def test_stale_journal_is_not_replayed(self):
+        """Test a crash after a new snapshot was saved but before the journal was reset."""
+        self.store.order([(self.macbook, 2)])
+        self.journal.sync()
+        save_snapshot(self.store, self.snapshot_path, generation=self.journal.generation + 1)
+        
+        recovered = recover(self.snapshot_path, self.journal_path)
+        self.assertEqual(recovered.get_product("MacBook").quantity, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for opt-in hot-path instrumentation.
+"""
+import json
+import unittest
+import metrics
+from metrics import Histogram, instrument, uninstrument
+from product import Product, LimitedProduct
+from promotions import PercentDiscount
+from store import Store
+
+
+class TestHistogram(unittest.TestCase):
+    """Test cases for the fixed-memory latency histogram."""
+    
+    def test_percentiles_within_bucket_error(self):
+        """Test that percentiles are accurate to the bucket width."""
+        histogram = Histogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+        
+        self.assertEqual(histogram.count, 10000)
+        self.assertEqual(histogram.max, 10000)
+        self.assertAlmostEqual(histogram.percentile(0.5), 5000, delta=5000 / 16)
+        self.assertAlmostEqual(histogram.percentile(0.99), 9900, delta=9900 / 16)
+        self.assertEqual(histogram.percentile(1.0), 10000)
+    
+    def test_memory_is_fixed(self):
+        """Test that recording huge values does not grow the histogram."""
+        histogram = Histogram()
+        histogram.record(2 ** 64 - 1)
+        self.assertEqual(len(histogram._counts), metrics.BUCKET_COUNT)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test cases for instrument() and uninstrument()."""
+    
+    def setUp(self):
+        """Set up a store with a promoted and a limited product."""
+        self.macbook = Product("MacBook", price=1000, quantity=5)
+        self.macbook.promotion = PercentDiscount("10% off", percent=10)
+        self.shipping = LimitedProduct("Shipping", price=10, quantity=5, maximum=1)
+        self.store = Store([self.macbook, self.shipping])
+        self.original_order = Store.order
+        self.metrics = instrument()
+        self.addCleanup(uninstrument)
+    
+    def test_records_phases(self):
+        """Test that an order is counted in every phase it passes through."""
+        self.store.order([(self.macbook, 2), (self.shipping, 1)])
+        self.macbook.buy(1)
+        
+        def count(name, cls):
+            return self.metrics.histogram(name, **{"class": cls}).count
+        self.assertEqual(count("store_order_seconds", "Store"), 1)
+        self.assertEqual(count("store_lookup_seconds", "Store"), 1)
+        self.assertEqual(count("store_validation_seconds", "Store"), 1)
+        self.assertEqual(count("store_commit_seconds", "Store"), 1)
+        self.assertEqual(count("store_pricing_seconds", "Store"), 2)
+        self.assertEqual(count("promotion_apply_seconds", "PercentDiscount"), 2)
+        self.assertEqual(count("product_buy_seconds", "Product"), 1)
+    
+    def test_counts_errors(self):
+        """Test that a rejected order is counted as an error."""
+        with self.assertRaises(Exception):
+            self.store.order([(self.shipping, 2)])
+        
+        self.assertEqual(self.metrics.counters[("store_order_errors_total", (("class", "Store"),))], 1)
+        self.assertEqual(self.metrics.counters[("store_validation_errors_total", (("class", "Store"),))], 1)
+    
+    def test_uninstrument_restores_methods(self):
+        """Test that uninstrument() puts the original methods back."""
+        self.assertIsNot(Store.order, self.original_order)
+        uninstrument()
+        self.assertIs(Store.order, self.original_order)
+        self.assertIsInstance(Store.__dict__["_line_total"], staticmethod)
+    
+    def test_instrument_twice_raises(self):
+        """Test that instrumentation cannot be stacked."""
+        with self.assertRaises(Exception):
+            instrument()
+    
+    def test_exports(self):
+        """Test the Prometheus and JSON exports."""
+        self.store.order([(self.macbook, 1)])
+        
+        text = self.metrics.to_prometheus()
+        self.assertIn("# TYPE store_order_seconds summary", text)
+        self.assertIn('store_order_seconds_count{class="Store"} 1', text)
+        self.assertIn('store_order_seconds{class="Store",quantile="0.99"}', text)
+        
+        exported = json.loads(self.metrics.to_json())
+        orders = [h for h in exported["histograms"] if h["name"] == "store_order_seconds"]
+        self.assertEqual(orders[0]["count"], 1)
+        self.assertGreater(orders[0]["p99"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@ even when an order failed due to exceeding limits on limited products.
 """
 import unittest
 from product import Product, LimitedProduct
+from promotions import SecondHalfPrice
 from store import Store
 
 
@@ -65,6 +66,30 @@ class TestOrderBugFix(unittest.TestCase):
         self.assertEqual(macbook.quantity, 3)  # 5 - 2 = 3
         self.assertEqual(shipping.quantity, 4)  # 5 - 1 = 4
 
+    
+    def test_duplicate_lines_are_merged(self):
+        """Test that several lines for one product are charged and checked as one."""
+        macbook = Product("MacBook", price=1000, quantity=5)
+        shipping = LimitedProduct("Shipping", price=10, quantity=5, maximum=1)
+        store = Store([macbook, shipping])
+        
+        # Each line is within stock, but together they are not
+        with self.assertRaises(Exception) as context:
+            store.order([(macbook, 3), (macbook, 3)])
+        self.assertIn("Not enough MacBook in stock", str(context.exception))
+        
+        # Each line is within the limit, but together they are not
+        with self.assertRaises(Exception) as context:
+            store.order([(shipping, 1), (macbook, 1), (shipping, 1)])
+        self.assertIn("Cannot buy more than 1 of Shipping", str(context.exception))
+        self.assertEqual(macbook.quantity, 5)
+        
+        # Every line is charged and taken from stock
+        macbook.promotion = SecondHalfPrice("Second Half price!")
+        self.assertEqual(store.order([(macbook, 1), (shipping, 1), (macbook, 1)]), 1510)
+        self.assertEqual(macbook.quantity, 3)
+        self.assertEqual(shipping.quantity, 4)
+
 
 if __name__ == '__main__':
     unittest.main()
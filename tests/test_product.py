@@ -67,5 +67,20 @@ class TestProduct(unittest.TestCase):
         self.assertEqual(p1.buy(10), p1.price * 10)
 
 
+    def test_rendering_is_cached_until_changed(self):
+        """Test that str() is reused until a property is set."""
+        product = Product("Playstation 5", price=450, quantity=100)
+        rendered = str(product)
+        self.assertIs(str(product), rendered)
+        
+        product.quantity = 99
+        self.assertEqual(str(product), "Playstation 5, Price: $450, Quantity: 99")
+        product.price = 400
+        self.assertEqual(str(product), "Playstation 5, Price: $400, Quantity: 99")
+        
+        product.buy(99)
+        self.assertEqual(str(product), "Playstation 5, Price: $400, Quantity: 0")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,8 @@
 Tests for the promotion system.
 """
 import unittest
+from unittest import mock
+import promotions
 from product import Product
 from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
 
@@ -56,6 +58,32 @@ class TestPromotions(unittest.TestCase):
         self.product.quantity = 100  # Reset quantity
         self.assertEqual(self.product.buy(7), 500)
 
+    
+    def assert_batch_matches_single_purchases(self):
+        """Assert that batch pricing gives exactly the per-purchase results."""
+        products = [
+            Product(f"Product {i}", price=price, quantity=100)
+            for i, price in enumerate([100, 0.1, 19.99, 1450, 0, 3.3333])
+        ]
+        quantities = [-1, 0, 1, 2, 3, 5, 7, 1000]
+        pairs = [(product, quantity) for product in products for quantity in quantities]
+        
+        for promotion in (self.percent_discount, self.second_half_price, self.third_one_free):
+            batch = promotion.apply_promotion_batch(
+                [product for product, _ in pairs], [quantity for _, quantity in pairs]
+            )
+            single = [promotion.apply_promotion(product, quantity) for product, quantity in pairs]
+            self.assertEqual(batch, single)
+    
+    def test_batch_matches_single_purchases(self):
+        """Test batch pricing without NumPy against per-purchase pricing."""
+        with mock.patch("promotions.numpy", None):
+            self.assert_batch_matches_single_purchases()
+    
+    @unittest.skipUnless(promotions.numpy, "NumPy is not installed")
+    def test_batch_matches_single_purchases_with_numpy(self):
+        """Test batch pricing with NumPy against per-purchase pricing."""
+        self.assert_batch_matches_single_purchases()
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,106 @@
+"""
+Tests for two-phase stock reservations.
+"""
+import unittest
+from unittest import mock
+from sharded_store import PREPARE_TTL
+from product import Product, NonStockedProduct, LimitedProduct
+from store import Store
+
+
+class TestReservations(unittest.TestCase):
+    """Test cases for Store.reserve, commit and release."""
+    
+    def setUp(self):
+        """Set up test fixtures with a controllable clock."""
+        self.macbook = Product("MacBook", price=1000, quantity=5)
+        self.shipping = LimitedProduct("Shipping", price=10, quantity=5, maximum=1)
+        self.windows = NonStockedProduct("Windows License", price=125)
+        self.store = Store([self.macbook, self.shipping, self.windows])
+        
+        self.now = 1000.0
+        patcher = mock.patch("store.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_reserved_stock_is_unavailable(self):
+        """Test that reserved units cannot be ordered by anyone else."""
+        self.store.reserve([(self.macbook, 4), (self.windows, 2)], ttl=60)
+        
+        self.assertEqual(self.macbook.quantity, 1)
+        self.assertEqual(self.store.get_total_quantity(), 6)
+        with self.assertRaises(Exception) as context:
+            self.store.order([(self.macbook, 2)])
+        self.assertIn("Only 1 left", str(context.exception))
+    
+    def test_commit(self):
+        """Test that committing places the order at the reserved price."""
+        handle = self.store.reserve([(self.macbook, 2), (self.shipping, 1)], ttl=60)
+        self.macbook.price = 2000
+        
+        self.assertEqual(self.store.commit(handle), 2010)
+        self.assertEqual(self.macbook.quantity, 3)
+        
+        # A reservation can only be committed once
+        with self.assertRaises(Exception):
+            self.store.commit(handle)
+    
+    def test_release(self):
+        """Test that releasing puts the stock back."""
+        handle = self.store.reserve([(self.macbook, 2), (self.shipping, 1)], ttl=60)
+        self.store.release(handle)
+        
+        self.assertEqual(self.macbook.quantity, 5)
+        self.assertEqual(self.shipping.quantity, 5)
+        with self.assertRaises(Exception):
+            self.store.commit(handle)
+        
+        # Releasing again does nothing
+        self.store.release(handle)
+        self.assertEqual(self.macbook.quantity, 5)
+    
+    def test_expiry(self):
+        """Test that reservations run out after their ttl."""
+        short = self.store.reserve([(self.macbook, 2)], ttl=10)
+        long = self.store.reserve([(self.macbook, 3)], ttl=100)
+        self.assertEqual(self.macbook.quantity, 0)
+        self.assertNotIn(self.macbook, self.store.get_all_products())
+        
+        self.now += 50
+        
+        # The expired stock is back before the order is checked
+        self.assertEqual(self.store.order([(self.macbook, 2)]), 2000)
+        with self.assertRaises(Exception):
+            self.store.commit(short)
+        self.assertEqual(self.store.commit(long), 3000)
+        self.assertEqual(self.macbook.quantity, 0)
+    
+    def test_prepared_reservations_never_expire(self):
+        """Test that the hold used for cross-shard orders survives any delay."""
+        handle = self.store.reserve([(self.macbook, 2)], ttl=PREPARE_TTL)
+        
+        self.now += 10 ** 9
+        self.store.order([(self.windows, 1)])
+        self.assertEqual(self.store.commit(handle), 2000)
+        self.assertEqual(self.macbook.quantity, 3)
+    
+    def test_finished_reservations_leave_the_expiry_heap(self):
+        """Test that committed and released reservations do not pile up in the expiry heap."""
+        for ttl in (PREPARE_TTL, 60):
+            for _ in range(1000):
+                self.store.commit(self.store.reserve([(self.windows, 1)], ttl=ttl))
+                self.store.release(self.store.reserve([(self.windows, 1)], ttl=ttl))
+            self.assertLessEqual(len(self.store._expiry_heap), 64)
+        
+        self.store.reserve([(self.macbook, 1)], ttl=60)
+        self.assertEqual(len(self.store._reservations), 1)
+    
+    def test_invalid_reservation(self):
+        """Test that reservations are validated like orders."""
+        with self.assertRaises(Exception):
+            self.store.reserve([(self.macbook, 2), (self.shipping, 2)], ttl=60)
+        self.assertEqual(self.macbook.quantity, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
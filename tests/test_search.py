@@ -0,0 +1,86 @@
+"""
+Tests for product name search.
+"""
+import unittest
+from product import Product, NonStockedProduct, LimitedProduct
+from columnar_store import ColumnarStore
+from search import NameIndex
+from store import Store
+
+
+class TestNameIndex(unittest.TestCase):
+    """Test cases for the NameIndex class."""
+    
+    def setUp(self):
+        """Set up an index over a few names."""
+        self.index = NameIndex(["MacBook Air M2", "MacBook Pro", "Bose QuietComfort Earbuds", "Google Pixel 7"])
+    
+    def test_prefix(self):
+        """Test that prefix search ignores case and returns names in order."""
+        self.assertEqual(list(self.index.prefix("macbook")), ["MacBook Air M2", "MacBook Pro"])
+        self.assertEqual(list(self.index.prefix("MacBook P")), ["MacBook Pro"])
+        self.assertEqual(list(self.index.prefix("iPhone")), [])
+    
+    def test_fuzzy(self):
+        """Test that misspelt queries still find the right names."""
+        self.assertEqual(self.index.fuzzy("gogle pixl")[0][1], "Google Pixel 7")
+        self.assertEqual([name for _, name in self.index.fuzzy("Macbok pro")][:1], ["MacBook Pro"])
+        self.assertEqual(self.index.fuzzy("xyz"), [])
+    
+    def test_incremental_updates(self):
+        """Test adding and removing names, including after the postings are rebuilt."""
+        for name in ["MacBook Air M2", "MacBook Pro", "Bose QuietComfort Earbuds"]:
+            self.index.discard(name)
+        self.index.add("MacBook Neo")
+        
+        self.assertEqual(len(self.index), 2)
+        self.assertNotIn("MacBook Pro", self.index)
+        self.assertEqual(list(self.index.prefix("mac")), ["MacBook Neo"])
+        self.assertEqual([name for _, name in self.index.fuzzy("macbok")], ["MacBook Neo"])
+
+
+class TestStoreSearch(unittest.TestCase):
+    """Test cases for Store.search_prefix and Store.fuzzy_search."""
+    
+    def setUp(self):
+        """Set up a store with one inactive product."""
+        self.products = [
+            Product("MacBook Air M2", price=1450, quantity=100),
+            Product("MacBook Pro", price=2500, quantity=0),
+            LimitedProduct("Shipping", price=10, quantity=250, maximum=1),
+            NonStockedProduct("Windows License", price=125),
+        ]
+        self.store = Store(self.products)
+    
+    def test_search_active_products(self):
+        """Test that searches return active products only."""
+        self.assertEqual(self.store.search_prefix("mac"), [self.products[0]])
+        self.assertEqual(self.store.fuzzy_search("windos licence"), [self.products[3]])
+        
+        self.products[1].quantity = 5
+        self.assertEqual(self.store.search_prefix("mac", limit=1), [self.products[0]])
+        self.assertEqual(self.store.search_prefix("mac"), self.products[:2])
+    
+    def test_search_follows_catalog(self):
+        """Test that the index follows additions and removals."""
+        self.store.search_prefix("")
+        self.store.remove_product("MacBook Air M2")
+        ipad = Product("iPad", price=500, quantity=3)
+        self.store.add_product(ipad)
+        
+        self.assertEqual(self.store.search_prefix("mac"), [])
+        self.assertEqual(self.store.search_prefix("IPA"), [ipad])
+        self.assertEqual(self.store.fuzzy_search("ipda"), [])  # Too few trigrams in common
+        self.assertEqual(self.store.fuzzy_search("ipda", min_similarity=0.2), [ipad])
+    
+    def test_columnar_store(self):
+        """Test that searches return views of a columnar store."""
+        store = ColumnarStore(self.products)
+        store.add_product(Product("Macintosh Classic", price=50, quantity=1))
+        
+        self.assertEqual([product.name for product in store.search_prefix("mac")], ["MacBook Air M2", "Macintosh Classic"])
+        self.assertEqual(store.fuzzy_search("shiping")[0].name, "Shipping")
+
+
+if __name__ == "__main__":
+    unittest.main()
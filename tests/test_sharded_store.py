@@ -0,0 +1,97 @@
+"""
+Tests for the multi-process ShardedStore.
+"""
+import unittest
+from product import Product, NonStockedProduct, LimitedProduct
+from promotions import PercentDiscount, SecondHalfPrice
+from sharded_store import ShardedStore
+
+
+class TestShardedStore(unittest.TestCase):
+    """Test cases for the ShardedStore class."""
+    
+    def setUp(self):
+        """Start a two-shard store with products spread over both shards."""
+        self.store = ShardedStore(shards=2)
+        
+        # Pick names so that each shard holds some of the products
+        names = {0: [], 1: []}
+        i = 0
+        while len(names[0]) < 2 or len(names[1]) < 2:
+            names[self.store._shard_of(f"Product {i}")].append(f"Product {i}")
+            i += 1
+        self.macbook = Product(names[0][0], price=1000, quantity=5)
+        self.macbook.promotion = SecondHalfPrice("Second Half price!")
+        self.shipping = LimitedProduct(names[1][0], price=10, quantity=5, maximum=1)
+        self.windows = NonStockedProduct(names[1][1], price=125)
+        self.iphone = Product(names[0][1], price=800, quantity=10)
+        self.store.add_products([self.macbook, self.shipping, self.windows, self.iphone])
+    
+    def tearDown(self):
+        """Stop the shard processes."""
+        self.store.close()
+    
+    def test_queries(self):
+        """Test totals, listing and membership across shards."""
+        self.assertEqual(self.store.get_total_quantity(), 20)
+        self.assertEqual(len(self.store.get_all_products()), 4)
+        self.assertIn(self.windows, self.store)
+        self.assertNotIn(Product("iPad", price=500, quantity=3), self.store)
+        
+        with self.assertRaises(Exception):
+            self.store.add_product(Product(self.macbook.name, price=1, quantity=1))
+        
+        self.store.remove_product(self.iphone.name)
+        self.assertEqual(self.store.get_total_quantity(), 10)
+    
+    def test_single_shard_order(self):
+        """Test an order whose products all live on one shard."""
+        self.assertEqual(self.store.order([(self.macbook, 2), (self.iphone, 1)]), 2300)
+        self.assertEqual(self.store.get_product(self.macbook.name).quantity, 3)
+    
+    def test_cross_shard_order(self):
+        """Test an order spanning both shards."""
+        total = self.store.order([(self.macbook, 2), (self.shipping, 1), (self.windows, 3)])
+        self.assertEqual(total, 1500 + 10 + 375)
+        self.assertEqual(self.store.get_product(self.macbook.name).quantity, 3)
+        self.assertEqual(self.store.get_product(self.shipping.name).quantity, 4)
+        self.assertEqual(self.store.get_total_quantity(), 17)
+    
+    def test_failed_cross_shard_order_changes_nothing(self):
+        """Test that a cross-shard order failing on one shard leaves every shard untouched."""
+        with self.assertRaises(Exception) as context:
+            self.store.order([(self.macbook, 2), (self.shipping, 2)])
+        self.assertIn(f"Cannot buy more than 1 of {self.shipping.name}", str(context.exception))
+        
+        with self.assertRaises(Exception):
+            self.store.order([(self.shipping, 1), (self.iphone, 11)])
+        
+        self.assertEqual(self.store.get_product(self.macbook.name).quantity, 5)
+        self.assertEqual(self.store.get_product(self.shipping.name).quantity, 5)
+        self.assertEqual(self.store.get_total_quantity(), 20)
+
+
+    def test_unpicklable_request_leaves_shards_in_step(self):
+        """Test that a request that cannot be sent does not desynchronize other shards."""
+        class LocalDiscount(PercentDiscount):
+            """A promotion class that cannot be pickled."""
+            __slots__ = ()
+        
+        # One new product per shard, the second of which cannot be sent
+        names = {}
+        i = 0
+        while len(names) < 2:
+            names.setdefault(self.store._shard_of(f"New {i}"), f"New {i}")
+            i += 1
+        good = Product(names[0], price=1, quantity=1)
+        bad = Product(names[1], price=1, quantity=1)
+        bad.promotion = LocalDiscount("Local", percent=10)
+        
+        with self.assertRaises(Exception):
+            self.store.add_products([good, bad])
+        self.assertEqual(self.store.get_total_quantity(), 20)
+        self.assertNotIn(good, self.store)
+
+
+if __name__ == '__main__':
+    unittest.main()
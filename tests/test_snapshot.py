@@ -0,0 +1,85 @@
+"""
+Tests for saving and loading store snapshots.
+"""
+import os
+import tempfile
+import unittest
+from product import Product, NonStockedProduct, LimitedProduct
+from promotions import PercentDiscount, SecondHalfPrice
+from snapshot import save_snapshot, load_snapshot
+from store import Store
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test cases for store snapshots."""
+    
+    def setUp(self):
+        """Save a small store to a temporary snapshot file."""
+        macbook = Product("MacBook", price=1000, quantity=5)
+        macbook.promotion = SecondHalfPrice("Second Half price!")
+        windows = NonStockedProduct("Windows License", price=125)
+        windows.promotion = PercentDiscount("30% off!", percent=30)
+        sold_out = Product("Sold Out", price=99.5, quantity=0)
+        
+        self.store = Store([macbook, sold_out, LimitedProduct("Shipping", price=10, quantity=5, maximum=1), windows])
+        self.store.remove_product("Sold Out")
+        self.store.add_product(sold_out)
+        
+        handle, self.path = tempfile.mkstemp(suffix=".snapshot")
+        os.close(handle)
+        save_snapshot(self.store, self.path)
+    
+    def tearDown(self):
+        """Remove the snapshot file."""
+        os.remove(self.path)
+    
+    def test_round_trip(self):
+        """Test that a loaded snapshot matches the saved store."""
+        loaded = load_snapshot(self.path)
+        
+        def summary(store):
+            return [(product.name, product.price, product.quantity, product.active) for product in store]
+        
+        self.assertEqual(summary(loaded), summary(self.store))
+        self.assertEqual(loaded.get_total_quantity(), self.store.get_total_quantity())
+        self.assertEqual(
+            [product.name for product in loaded.get_all_products()],
+            ["MacBook", "Shipping", "Windows License"]
+        )
+        self.assertIsInstance(loaded.get_product("Shipping"), LimitedProduct)
+        self.assertEqual(loaded.get_product("Windows License").promotion.percent, 30)
+    
+    def test_loaded_store_takes_orders(self):
+        """Test ordering from a loaded store without changing the file."""
+        loaded = load_snapshot(self.path)
+        macbook = loaded.get_product("MacBook")
+        
+        self.assertEqual(loaded.order([(macbook, 2), (loaded.get_product("Shipping"), 1)]), 1510)
+        self.assertEqual(macbook.quantity, 3)
+        self.assertEqual(loaded.get_total_quantity(), 7)
+        
+        # The file itself is untouched
+        self.assertEqual(load_snapshot(self.path).get_product("MacBook").quantity, 5)
+    
+    def test_loaded_store_can_change(self):
+        """Test adding and removing products after loading."""
+        loaded = load_snapshot(self.path)
+        loaded.remove_product("Shipping")
+        loaded.add_product(Product("iPad", price=500, quantity=3))
+        
+        self.assertEqual(
+            [product.name for product in loaded],
+            ["MacBook", "Windows License", "Sold Out", "iPad"]
+        )
+        self.assertEqual(loaded.get_total_quantity(), 8)
+    
+    def test_not_a_snapshot(self):
+        """Test that loading another kind of file fails."""
+        with open(self.path, "wb") as file:
+            file.write(b"not a snapshot" * 10)
+        with self.assertRaises(Exception):
+            load_snapshot(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
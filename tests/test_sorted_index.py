@@ -0,0 +1,45 @@
+"""
+Tests for the sorted secondary index.
+"""
+import random
+import unittest
+from sorted_index import SortedIndex, BLOCK_SIZE
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Test cases for SortedIndex across many blocks."""
+    
+    def test_matches_sorted_list(self):
+        """Test that queries agree with a plain sorted list through adds, moves and removals."""
+        generator = random.Random(0)
+        keys = {f"SKU-{i}": generator.randint(0, 50) for i in range(5 * BLOCK_SIZE)}
+        index = SortedIndex((key, name) for name, key in keys.items())
+        
+        for step in range(20 * BLOCK_SIZE):
+            name = f"SKU-{generator.randrange(8 * BLOCK_SIZE)}"
+            if step % 3 == 0:
+                keys.pop(name, None)
+                index.discard(name)
+            else:
+                keys[name] = generator.randint(0, 50)
+                index.add(name, keys[name])
+        
+        expected = [name for _, name in sorted((key, name) for name, key in keys.items())]
+        self.assertEqual(len(index), len(keys))
+        self.assertEqual(index.first(len(keys) + 1), expected)
+        self.assertEqual(index.last(10), expected[::-1][:10])
+        self.assertEqual(index.first(0), [])
+        self.assertEqual(index.last(0), [])
+        self.assertEqual(index.below(5), [name for name in expected if keys[name] < 5])
+        self.assertEqual(index.between(20, 30), [name for name in expected if 20 <= keys[name] <= 30])
+        self.assertEqual(index.between(60, 70), [])
+        
+        for name in list(keys):
+            index.discard(name)
+        self.assertEqual((len(index), index.first(5)), (0, []))
+        index.add("MacBook", 1000)
+        self.assertEqual(index.between(0, 2000), ["MacBook"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,11 @@
 """
 Tests for the Store class.
 """
+import io
 import unittest
 from product import Product, NonStockedProduct, LimitedProduct
-from store import Store
+from promotions import PercentDiscount, SecondHalfPrice
+from store import Store, QUOTE_CACHE_SIZE
 
 
 class TestStore(unittest.TestCase):
@@ -50,6 +52,28 @@ class TestStore(unittest.TestCase):
         for product in self.store._products:
             self.assertNotEqual(product.name, "MacBook", "Product should have been removed")
     
+    def test_get_product(self):
+        """Test looking up products by name."""
+        self.assertIs(self.store.get_product("MacBook"), self.product1)
+        self.assertIsNone(self.store.get_product("iPad"))
+        
+        # Lookups follow additions and removals
+        new_product = Product("iPad", price=500, quantity=3)
+        self.store.add_product(new_product)
+        self.assertIs(self.store.get_product("iPad"), new_product)
+        
+        self.store.remove_product("iPad")
+        self.assertIsNone(self.store.get_product("iPad"))
+        self.assertNotIn(new_product, self.store)
+    
+    def test_add_duplicate_product(self):
+        """Test that adding a second product with an existing name fails."""
+        with self.assertRaises(Exception):
+            self.store.add_product(Product("MacBook", price=900, quantity=1))
+        
+        # The original product is kept
+        self.assertIs(self.store.get_product("MacBook"), self.product1)
+    
     def test_get_total_quantity(self):
         """Test getting total quantity of products in store."""
         # Total should be 5 + 10 + 5 + 0 = 20
@@ -60,6 +84,32 @@ class TestStore(unittest.TestCase):
         self.store.add_product(new_product)
         self.assertEqual(self.store.get_total_quantity(), 23)
     
+    def test_aggregates_follow_product_changes(self):
+        """Test that totals and active listing track changes made on the products."""
+        self.product2.quantity = 4
+        self.assertEqual(self.store.get_total_quantity(), 14)
+        
+        # Selling out deactivates the product and drops it from the listing
+        self.product1.quantity = 0
+        self.assertEqual(self.store.get_total_quantity(), 9)
+        self.assertNotIn(self.product1, self.store.get_all_products())
+        
+        # Restocking brings it back in its original catalog position
+        self.product1.quantity = 2
+        self.assertEqual(self.store.get_all_products()[0], self.product1)
+        
+        self.limited_product.active = False
+        self.assertEqual(
+            self.store.get_all_products(),
+            [self.product1, self.product2, self.non_stocked_product]
+        )
+        
+        # Removed products no longer count towards the store
+        self.store.remove_product("iPhone")
+        self.product2.quantity = 100
+        self.assertEqual(self.store.get_total_quantity(), 7)
+        self.assertEqual(self.store.get_all_products(), [self.product1, self.non_stocked_product])
+    
     def test_order_success(self):
         """Test successful order processing."""
         shopping_list = [
@@ -123,6 +173,245 @@ class TestStore(unittest.TestCase):
         self.assertEqual(self.product1.quantity, initial_macbook_qty)
         self.assertEqual(self.limited_product.quantity, initial_shipping_qty)
 
+    
+    def test_order_many(self):
+        """Test that a batch of orders is processed order by order."""
+        orders = [
+            [(self.product1, 2), (self.non_stocked_product, 1)],  # Valid
+            [(self.limited_product, 2)],  # Exceeds maximum of 1
+            [(self.product1, 4)],  # Only 3 MacBooks left after the first order
+            [(Product("iPad", price=500, quantity=3), 1)],  # Not in store
+            [(self.product1, 3), (self.limited_product, 1)]  # Valid
+        ]
+        
+        totals, errors = self.store.order_many(orders)
+        
+        self.assertEqual(totals, [2125, None, None, None, 3010])
+        self.assertIsNone(errors[0])
+        self.assertIn("Cannot buy more than 1 of Shipping", str(errors[1]))
+        self.assertIn("Not enough MacBook in stock", str(errors[2]))
+        self.assertIn("not found", str(errors[3]))
+        self.assertIsNone(errors[4])
+        
+        # Only the successful orders changed stock
+        self.assertEqual(self.product1.quantity, 0)
+        self.assertEqual(self.limited_product.quantity, 4)
+
+    
+    def test_quote(self):
+        """Test that quoting itemizes an order without changing stock."""
+        self.product1.promotion = SecondHalfPrice("Second Half price!")
+        shopping_list = [(self.product1, 2), (self.limited_product, 1)]
+        
+        total, lines = self.store.quote(shopping_list)
+        self.assertEqual(total, 1510)
+        self.assertEqual(lines[0], ("MacBook", 2, 1000, "Second Half price!", 1500))
+        self.assertEqual(lines[1], ("Shipping", 1, 10, None, 10))
+        self.assertEqual(self.store.get_total_quantity(), 20)
+        
+        # Quotes follow price and promotion changes
+        self.product1.price = 800
+        self.assertEqual(self.store.quote(shopping_list)[0], 1210)
+        self.product1.promotion = None
+        self.assertEqual(self.store.quote(shopping_list)[0], 1610)
+        
+        # The order costs what was quoted
+        self.assertEqual(self.store.order(shopping_list), 1610)
+        
+        # Quotes are validated like orders
+        with self.assertRaises(Exception) as context:
+            self.store.quote([(self.limited_product, 2)])
+        self.assertIn("Cannot buy more than 1 of Shipping", str(context.exception))
+        with self.assertRaises(Exception):
+            self.store.quote([(self.product1, 4)])
+    
+    def test_quote_cache_is_bounded(self):
+        """Test that quoting many quantities keeps only the most recent line totals."""
+        for quantity in range(1, 1000):
+            self.store.quote([(self.product2, quantity % 10 + 1), (self.non_stocked_product, quantity)])
+        
+        self.assertLessEqual(len(self.store._quote_cache["Windows License"]), QUOTE_CACHE_SIZE)
+        self.assertEqual(self.store.quote([(self.non_stocked_product, 999)])[0], 125 * 999)
+        self.assertEqual(len(self.store._quote_cache["iPhone"]), 10)
+    
+    def test_quote_many(self):
+        """Test bulk pricing against single-line pricing, without stock changes."""
+        self.product1.promotion = SecondHalfPrice("Second Half price!")
+        self.non_stocked_product.promotion = PercentDiscount("30% off!", percent=30)
+        
+        names = ["MacBook", "iPhone", "Windows License", "MacBook", "Shipping"]
+        quantities = [3, 2, 4, 100, 1]
+        totals = self.store.quote_many(names, quantities)
+        
+        self.assertEqual(totals, [2500, 1600, 125 * 4 * 0.7, 75000, 10])
+        self.assertEqual(self.store.get_total_quantity(), 20)
+        
+        with self.assertRaises(Exception):
+            self.store.quote_many(["iPad"], [1])
+        with self.assertRaises(Exception):
+            self.store.quote_many(["MacBook", "iPhone"], [1])
+
+
+    def test_temporary_stores_do_not_pile_up(self):
+        """Test that products forget stores that no longer exist."""
+        other = Store([Product("iPad", price=500, quantity=3)])
+        for _ in range(100):
+            self.store + other
+        
+        self.assertLessEqual(len(self.product1._stores), 2)
+        self.product1.quantity = 4
+        self.assertEqual(self.store.get_total_quantity(), 19)
+    
+    def test_merge_policies(self):
+        """Test each policy for products both stores have."""
+        def regional():
+            return Store([Product("MacBook", price=900, quantity=2), Product("iPad", price=500, quantity=3)])
+        
+        self.store.merge(regional())
+        self.assertEqual(self.store.get_product("MacBook"), self.product1)
+        self.assertEqual([product.name for product in self.store][-1], "iPad")
+        self.assertEqual(self.store.get_total_quantity(), 23)
+        
+        other = regional()
+        self.store.merge(other, policy="keep_right")
+        self.assertIs(self.store.get_product("MacBook"), other.get_product("MacBook"))
+        self.assertEqual([product.name for product in self.store][0], "MacBook")
+        self.assertEqual(self.store.get_total_quantity(), 20)
+        
+        self.store.merge(regional(), policy="sum_quantities")
+        self.assertEqual(self.store.get_product("MacBook").quantity, 4)
+        self.assertEqual(self.store.get_total_quantity(), 25)
+        
+        self.store.merge(Store([Product("iPhone", price=700, quantity=1)]), policy="min_price")
+        self.assertEqual(self.product2.price, 700)
+        self.assertEqual(self.product2.quantity, 10)
+        
+        with self.assertRaises(Exception):
+            self.store.merge(regional(), policy="newest")
+    
+    def test_add_keeps_left_products(self):
+        """Test that + keeps this store's product for shared names."""
+        combined = self.store + Store([Product("MacBook", price=1, quantity=1), Product("iPad", price=500, quantity=3)])
+        
+        self.assertIs(combined.get_product("MacBook"), self.product1)
+        self.assertEqual(len(list(combined)), 5)
+        self.assertEqual(combined.get_total_quantity(), 23)
+    
+    def test_merge_all(self):
+        """Test merging many stores without modifying any of them."""
+        stores = [Store([Product("MacBook", price=1000 - i, quantity=1)]) for i in range(3)]
+        stores.append(Store([self.non_stocked_product]))
+        
+        summed = Store.merge_all(stores, policy="sum_quantities")
+        self.assertEqual(summed.get_product("MacBook").quantity, 3)
+        self.assertEqual(summed.get_total_quantity(), 3)
+        self.assertEqual([store.get_total_quantity() for store in stores], [1, 1, 1, 0])
+        
+        cheapest = Store.merge_all(stores, policy="min_price")
+        self.assertEqual(cheapest.get_product("MacBook").price, 998)
+        self.assertEqual(stores[0].get_product("MacBook").price, 1000)
+        
+        self.assertIs(Store.merge_all(stores, policy="keep_right").get_product("MacBook"),
+                      stores[2].get_product("MacBook"))
+        self.assertIs(Store.merge_all(stores).get_product("Windows License"), self.non_stocked_product)
+
+
+    def test_remove_products(self):
+        """Test bulk removal keeps catalog order and the aggregates right."""
+        self.store.remove_products(["iPhone", "Windows License", "No Such Product"])
+        
+        self.assertEqual([product.name for product in self.store], ["MacBook", "Shipping"])
+        self.assertEqual(self.store.get_all_products(), [self.product1, self.limited_product])
+        self.assertEqual(self.store.get_total_quantity(), 10)
+        self.assertIsNone(self.store.get_product("iPhone"))
+        
+        # Removed products no longer notify the store
+        self.product2.quantity = 100
+        self.assertEqual(self.store.get_total_quantity(), 10)
+    
+    def test_removal_tombstones_are_compacted(self):
+        """Test that tombstones are reclaimed once they make up half the catalog."""
+        store = Store([Product(f"SKU-{i}", price=1, quantity=1) for i in range(10)])
+        store.remove_products([f"SKU-{i}" for i in range(0, 10, 3)])
+        self.assertEqual(store._tombstones, 4)
+        
+        store.remove_product("SKU-1")
+        self.assertEqual(store._tombstones, 5)
+        store.remove_product("SKU-4")
+        store.add_product(Product("SKU-10", price=1, quantity=1))
+        store.merge(Store([Product("SKU-2", price=1, quantity=5)]), policy="keep_right")
+        self.assertEqual(store._tombstones, 0)
+        self.assertEqual(
+            [(product.name, product.quantity) for product in store],
+            [("SKU-2", 5), ("SKU-5", 1), ("SKU-7", 1), ("SKU-8", 1), ("SKU-10", 1)]
+        )
+        self.assertEqual(store.get_total_quantity(), 9)
+
+
+    def test_price_queries(self):
+        """Test price range queries over active products."""
+        self.assertEqual(self.store.products_in_price_range(100, 800), [self.non_stocked_product, self.product2])
+        self.assertEqual(self.store.cheapest(2), [self.limited_product, self.non_stocked_product])
+        self.assertEqual(self.store.most_expensive(1), [self.product1])
+        
+        # Queries follow price changes, deactivation and catalog changes
+        self.product1.price = 150
+        self.product2.active = False
+        self.store.add_product(Product("iPad", price=500, quantity=3))
+        self.store.remove_product("Windows License")
+        self.assertEqual(
+            [product.name for product in self.store.products_in_price_range(100, 800)],
+            ["MacBook", "iPad"]
+        )
+        self.assertEqual(self.store.most_expensive(10)[0].name, "iPad")
+    
+    def test_low_stock(self):
+        """Test that low stock queries follow orders and restocking."""
+        self.assertEqual(self.store.low_stock(6), [self.product1, self.limited_product])
+        
+        self.store.order([(self.product1, 5), (self.product2, 7)])
+        self.assertEqual(self.store.low_stock(6), [self.product2, self.limited_product])
+        
+        self.product1.quantity = 2
+        self.assertEqual(self.store.low_stock(6), [self.product1, self.product2, self.limited_product])
+        self.assertNotIn(self.non_stocked_product, self.store.low_stock(1000))
+
+
+    def test_iter_products(self):
+        """Test paging through the catalog with cursors."""
+        self.product2.active = False
+        pages = list(self.store.iter_products(page_size=2))
+        self.assertEqual(pages, [
+            ([self.product1, self.limited_product], pages[0][1]),
+            ([self.non_stocked_product], None),
+        ])
+        
+        # Resuming from a cursor survives removals, compaction and additions
+        cursor = pages[0][1]
+        ipad = Product("iPad", price=500, quantity=3)
+        self.store.remove_products(["MacBook", "iPhone", "Shipping"])
+        self.store.add_product(ipad)
+        self.assertEqual(list(self.store.iter_products(page_size=5, cursor=cursor)),
+                         [([self.non_stocked_product, ipad], None)])
+        
+        self.assertEqual(len(list(self.store.iter_products(active_only=False, page_size=1))), 2)
+        with self.assertRaises(Exception):
+            next(self.store.iter_products(page_size=0))
+
+
+    def test_render_catalog(self):
+        """Test that the catalog is written one product per line, in chunks."""
+        self.product1.promotion = PercentDiscount("30% off!", percent=30)
+        self.product2.active = False
+        stream = io.StringIO()
+        
+        self.assertEqual(self.store.render_catalog(stream, chunk_size=2), 3)
+        self.assertEqual(stream.getvalue().splitlines(), [
+            "MacBook, Price: $1000, Quantity: 5, Promotion: 30% off!",
+            "Shipping, Price: $10, Limited to 1 per order!",
+            "Windows License, Price: $125, Quantity: Unlimited",
+        ])
+
 
 if __name__ == '__main__':
     unittest.main()